@@ -0,0 +1,99 @@
+"""
+Checkpoint e retomada exata de um treinamento do Trainer.
+
+Roda um treinamento de referência do começo ao fim e outro que "morre" no meio
+(exceção no callback, sem checkpoint de saída) e é retomado do último checkpoint
+periódico. O fitness de cada geração, a população final e o histórico têm que ser
+idênticos (o mesmo roteiro, menor, é garantido por tests/test_checkpoint.py); também
+mostra o custo de cada checkpoint em relação ao tempo da geração.
+
+Uso: python -m benchmarks.bench_checkpoint [--generations 30] [--crash-at 17] [--racing]
+"""
+import argparse
+import os
+import tempfile
+import numpy as np
+
+from snake_ai.training.trainer import Trainer
+from snake_ai.utils.history import HistoryStore
+
+class Crash(Exception):
+    pass
+
+def read_history(path: str) -> dict:
+    """Todas as colunas de todas as tabelas do histórico, como arrays em memória."""
+    store = HistoryStore(path)
+    return {(table, name): np.array(store.column(table, name))
+            for table, columns in store.schema.items() for name in columns}
+
+def main():
+    parser = argparse.ArgumentParser(description="Checkpoint e retomada exata do treinamento.")
+    parser.add_argument("--population", type=int, default=150)
+    parser.add_argument("--generations", type=int, default=30)
+    parser.add_argument("--crash-at", type=int, default=17, help="Geração em que o segundo treinamento morre")
+    parser.add_argument("--interval", type=int, default=5)
+    parser.add_argument("--size", type=int, default=10)
+    parser.add_argument("--racing", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        def config(name: str) -> dict:
+            return {"width": args.size, "height": args.size, "population_size": args.population,
+                    "generations": args.generations, "seed": args.seed, "racing": args.racing,
+                    "checkpoint_interval": args.interval, "run_name": "run", "genome_archive": False,
+                    "models_dir": os.path.join(tmp, name), "logs_dir": os.path.join(tmp, name)}
+
+        # Referência, sem interrupção
+        reference = {}
+        eval_time = checkpoint_time = 0.0
+        checkpoints = 0
+
+        def record_reference(record, population, fitness):
+            nonlocal eval_time, checkpoint_time, checkpoints
+            reference[record["generation"]] = fitness.copy()
+            eval_time += record["eval_s"]
+            if "checkpoint_s" in record:
+                checkpoint_time += record["checkpoint_s"]
+                checkpoints += 1
+
+        with Trainer(config("a")) as trainer:
+            trainer.run(record_reference)
+            final_a = np.stack(trainer.ga.get_population())
+            history_path_a = trainer.history_path
+
+        # Treinamento que morre em --crash-at e é retomado do último checkpoint
+        def crash(record, population, fitness):
+            if record["generation"] == args.crash_at:
+                raise Crash()
+
+        with Trainer(config("b")) as trainer:
+            try:
+                trainer.run(crash)
+            except Crash:
+                pass
+            checkpoint_path = trainer.checkpoint_path
+
+        resumed = {}
+        with Trainer.resume(checkpoint_path) as trainer:
+            start_gen = trainer.generation
+            trainer.run(lambda record, population, fitness: resumed.__setitem__(record["generation"], fitness.copy()))
+            final_b = np.stack(trainer.ga.get_population())
+            history_path_b = trainer.history_path
+            size = os.path.getsize(checkpoint_path)
+        history_a, history_b = read_history(history_path_a), read_history(history_path_b)
+
+    same_history = history_a.keys() == history_b.keys() and all(
+        np.array_equal(history_a[key], history_b[key]) for key in history_a)
+    same_fitness = all(np.array_equal(reference[g], resumed[g]) for g in resumed)
+    print(f"retomado na geração {start_gen} (morreu na {args.crash_at}), {len(resumed)} gerações comparadas")
+    print(f"fitness idêntico: {same_fitness}  população final idêntica: {np.array_equal(final_a, final_b)}  "
+          f"histórico idêntico: {same_history}")
+    mean_gen = eval_time / args.generations
+    mean_ckpt = checkpoint_time / max(checkpoints, 1)
+    print(f"checkpoint: {size / 1024:.0f} KiB, {mean_ckpt * 1000:.2f} ms cada "
+          f"({mean_ckpt / mean_gen:.2%} de uma geração de {mean_gen * 1000:.0f} ms; "
+          f"{checkpoint_time / eval_time:.3%} do tempo total com intervalo {args.interval})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Passos e tempo da avaliação com e sem a detecção de ciclos, ao longo de um treino.
+
+O algoritmo genético evolui normalmente (com a detecção ligada); a cada geração a
+população também é avaliada sem a detecção, e o fitness tem que ser idêntico
+(garantido por tests/test_cycle_detection.py; aqui só acompanha o treino).
+
+Uso: python -m benchmarks.bench_cycles [--generations 30] [--backend vectorized]
+"""
+import argparse
+import time
+import numpy as np
+
+from snake_ai.agents.genetic_algorithm import GeneticAlgorithm
+from snake_ai.agents.neural_net import NeuralNetwork
+from snake_ai.training.evaluation import evaluate_population, EVAL_BACKENDS
+
+LAYER_SIZES = [8, 16, 12, 3]
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da detecção de ciclos.")
+    parser.add_argument("--population", type=int, default=150)
+    parser.add_argument("--episodes", type=int, default=3)
+    parser.add_argument("--generations", type=int, default=30)
+    parser.add_argument("--every", type=int, default=5, help="Imprimir a cada N gerações.")
+    parser.add_argument("--backend", type=str, default="vectorized", choices=EVAL_BACKENDS)
+    parser.add_argument("--size", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    np.random.seed(args.seed)
+    env_config = {"width": args.size, "height": args.size, "initial_energy": args.size * args.size, "grow_on_eat": True}
+    nn = NeuralNetwork(LAYER_SIZES)
+    ga = GeneticAlgorithm(args.population, len(nn.get_weights_flat()), elitism=max(2, int(args.population * 0.05)),
+                          mutation_rate=0.1, mutation_std=0.2)
+
+    print(f"{'geração':>8} {'passos sem':>11} {'passos com':>11} {'poupados':>9} {'tempo sem':>10} {'tempo com':>10}  iguais")
+    for gen in range(args.generations):
+        seeds = np.random.randint(0, 2**31 - 1, size=args.episodes).tolist()
+        population = ga.get_population()
+
+        start = time.perf_counter()
+        fitness, stats = evaluate_population(population, nn, env_config, args.episodes, backend=args.backend, seeds=seeds)
+        t_on = time.perf_counter() - start
+        start = time.perf_counter()
+        plain, plain_stats = evaluate_population(population, nn, env_config, args.episodes, backend=args.backend,
+                                                 seeds=seeds, detect_cycles=False)
+        t_off = time.perf_counter() - start
+
+        if gen % args.every == 0 or gen == args.generations - 1:
+            played, saved = int(stats["steps"].sum()), int(stats["steps_saved"].sum())
+            print(f"{gen:>8} {int(plain_stats['steps'].sum()):>11} {played:>11} {saved / (played + saved):9.0%} "
+                  f"{t_off:9.2f}s {t_on:9.2f}s  {np.array_equal(fitness, plain)}")
+        ga.evolve(fitness)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Vazão do treinamento com e sem o dashboard em processo separado.
+
+Roda o mesmo Trainer curto sem dashboard e com o dashboard aberto (alternados,
+vale o melhor tempo de cada), confere que o fitness é idêntico e mostra quantas
+gerações o dashboard descartou por estar atrasado. Sem display, usa o driver
+"dummy" do SDL (o dashboard desenha do mesmo jeito, só não aparece).
+
+Uso: python -m benchmarks.bench_dashboard [--population 150] [--generations 20]
+"""
+import argparse
+import os
+import tempfile
+import time
+import numpy as np
+
+from snake_ai.training.trainer import Trainer
+from snake_ai.visualization.dashboard_process import DashboardProcess
+
+def train(args, with_dashboard: bool) -> tuple[float, list[float], int]:
+    """(segundos, melhor fitness por geração, gerações descartadas pelo dashboard)."""
+    with tempfile.TemporaryDirectory() as tmp:
+        config = {"width": args.size, "height": args.size, "population_size": args.population,
+                  "generations": args.generations, "seed": args.seed, "checkpoint_interval": 0,
+                  "genome_archive": False, "models_dir": tmp, "logs_dir": tmp}
+        with Trainer(config) as trainer:
+            dashboard = DashboardProcess(trainer.env_config, trainer.config["layer_sizes"], speed=args.speed)
+            if with_dashboard:
+                dashboard.attach()
+                time.sleep(args.warmup)  # O processo do dashboard sobe antes de medir
+            best = []
+
+            def on_generation(record, population, fitness):
+                best.append(record["best_fitness"])
+                top = np.argsort(fitness)[::-1][:dashboard.num_games]
+                dashboard.submit(record["generation"], record["best_fitness"], record["mean_fitness"],
+                                 trainer.trajectories(top, replay=False), population[top[0]])
+
+            start = time.perf_counter()
+            trainer.run(on_generation)
+            elapsed = time.perf_counter() - start
+            dashboard.close()
+    return elapsed, best, dashboard.dropped
+
+def main():
+    parser = argparse.ArgumentParser(description="Vazão do treinamento com e sem dashboard.")
+    parser.add_argument("--population", type=int, default=150)
+    parser.add_argument("--generations", type=int, default=20)
+    parser.add_argument("--size", type=int, default=10)
+    parser.add_argument("--speed", type=int, default=30, help="FPS dos jogos no dashboard")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--warmup", type=float, default=2.0, help="Segundos para o dashboard abrir")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    if not os.environ.get("DISPLAY"):
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+    off = on = float("inf")
+    for _ in range(args.repeats):
+        elapsed, best_off, _ = train(args, False)
+        off = min(off, elapsed)
+        elapsed, best_on, dropped = train(args, True)
+        on = min(on, elapsed)
+
+    print(f"sem dashboard:  {off:.2f}s ({args.generations / off:.2f} gerações/s)")
+    print(f"com dashboard:  {on:.2f}s ({args.generations / on:.2f} gerações/s), "
+          f"{dropped} de {args.generations} gerações descartadas pelo dashboard")
+    print(f"diferença: {on / off - 1:+.1%}; fitness idêntico: {best_off == best_on}")
+
+if __name__ == "__main__":
+    main()
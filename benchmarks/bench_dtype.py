@@ -0,0 +1,129 @@
+"""
+float32 contra float64 no caminho numérico inteiro (genomas, população, pesos,
+ativações) e float16 no arquivo de genomas.
+
+1. Sem misturar precisões: o forward das duas redes devolve o tipo configurado
+   a partir do estado float32 do encode, e o fitness é idêntico nos três
+   backends da avaliação em cada tipo. Também mostra quantos genomas mudam de
+   fitness entre float32 e float64 (arredondamentos diferentes podem mudar uma
+   ação; os dois são válidos, só não são o mesmo jogo).
+2. Memória da população (os dois buffers do algoritmo genético e a matriz do
+   executor) por tamanho de população.
+3. Tempo do forward da população, da evolução e da avaliação vetorizada.
+4. Arquivo de genomas: tamanho por linha e erro do float16.
+
+Uso: python -m benchmarks.bench_dtype [--sizes 10000 100000] [--eval-population 2000]
+"""
+import argparse
+import os
+import tempfile
+import time
+import numpy as np
+
+from snake_ai.agents.genetic_algorithm import GeneticAlgorithm
+from snake_ai.agents.neural_net import NeuralNetwork, PopulationNetwork, DTYPES
+from snake_ai.env.snake_env import SnakeEnv
+from snake_ai.env.state_encoding import encode_state
+from snake_ai.training.evaluation import evaluate_population, EVAL_BACKENDS
+from snake_ai.training.executor import EvaluationExecutor
+from snake_ai.utils.genome_archive import GenomeArchive, GENOME_DTYPES
+
+LAYER_SIZES = [8, 16, 12, 3]
+
+def timed(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="float32 contra float64.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--eval-population", type=int, default=2000)
+    parser.add_argument("--parity-population", type=int, default=300)
+    parser.add_argument("--size", type=int, default=10, help="Lado do tabuleiro")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    np.random.seed(args.seed)
+    rng = np.random.default_rng(args.seed)
+    env_config = {"width": args.size, "height": args.size, "initial_energy": args.size * args.size, "grow_on_eat": True}
+    genome_size = len(NeuralNetwork(LAYER_SIZES).get_weights_flat())
+    seeds = rng.integers(2**31 - 1, size=3).tolist()
+
+    ok = True
+    population = rng.normal(0, 1, size=(args.parity_population, genome_size))
+    fitness_by_dtype = {}
+    for dtype in DTYPES:
+        nn = NeuralNetwork(LAYER_SIZES, dtype)
+        nn.set_weights_flat(population[0])
+        state = encode_state(SnakeEnv(**env_config, seed=0))
+        pop_net = PopulationNetwork(LAYER_SIZES, population, dtype=dtype)
+        out_dtypes = {nn.forward(state).dtype.name,
+                      pop_net.forward(np.repeat(state[None, None], len(population), axis=0)).dtype.name}
+        results = [evaluate_population(population, nn, env_config, 3, backend=backend, seeds=seeds)[0]
+                   for backend in EVAL_BACKENDS]
+        same = all(np.array_equal(results[0], r) for r in results[1:])
+        ok &= same and out_dtypes == {dtype}
+        fitness_by_dtype[dtype] = results[0]
+        print(f"{dtype}: saída do forward {'/'.join(sorted(out_dtypes))}, fitness idêntico nos backends: {same}")
+    changed = np.mean(fitness_by_dtype["float32"] != fitness_by_dtype["float64"])
+    print(f"genomas com fitness diferente entre float32 e float64: {changed:.1%}")
+
+    print(f"\n{'população':>9}  {'tipo':>7}  {'memória':>9}  {'forward ms':>10}  {'evolve ms':>9}")
+    for size in args.sizes:
+        for dtype in DTYPES:
+            ga = GeneticAlgorithm(size, genome_size, elitism=max(2, size // 20), mutation_rate=0.1,
+                                  mutation_std=0.2, dtype=dtype)
+            fitness = rng.gamma(2.0, 50.0, size=size)
+            ga.evolve(fitness)  # Aloca o segundo buffer
+            with EvaluationExecutor(env_config, LAYER_SIZES, size, dtype=dtype) as executor:
+                nbytes = ga.population.nbytes + ga._next.nbytes + executor.genomes.nbytes
+            evolve = timed(lambda: ga.evolve(fitness))
+            pop_net = PopulationNetwork(LAYER_SIZES, ga.population)
+            states = rng.random((size, 3, LAYER_SIZES[0]), dtype=np.float32)
+            forward = timed(lambda: pop_net.forward(states))
+            print(f"{size:>9}  {dtype:>7}  {nbytes / 2**20:>6.0f} MiB  {forward * 1000:>10.2f}  {evolve * 1000:>9.1f}")
+            del ga, pop_net
+
+    print(f"\navaliação vetorizada, população {args.eval_population}, 3 episódios:")
+    population = rng.normal(0, 1, size=(args.eval_population, genome_size))
+    for dtype in DTYPES:
+        nn = NeuralNetwork(LAYER_SIZES, dtype)
+        matrix = population.astype(dtype)
+        evaluate_population(matrix[:10], nn, env_config, 3, backend="vectorized", seeds=seeds)  # Compila o Numba
+        stats = {}
+        def run():
+            stats["fitness"], stats["stats"] = evaluate_population(matrix, nn, env_config, 3, backend="vectorized",
+                                                                   seeds=seeds)
+        elapsed = timed(run)
+        steps = int(stats["stats"]["steps"].sum())
+        print(f"  {dtype}: {elapsed:.2f} s ({steps / elapsed:,.0f} passos/s)")
+
+    print("\narquivo de genomas:")
+    nn = NeuralNetwork(LAYER_SIZES, "float32")
+    genomes = rng.normal(0, 1, size=(200, genome_size)).astype(np.float32)
+    with tempfile.TemporaryDirectory() as tmp:
+        stored = {}
+        for genome_dtype in GENOME_DTYPES:
+            path = os.path.join(tmp, f"{genome_dtype}.gar")
+            with GenomeArchive.create(path, genome_size, capacity=len(genomes), genome_dtype=genome_dtype) as archive:
+                for gen, genome in enumerate(genomes):
+                    archive.append(gen, genome)
+            with GenomeArchive(path) as archive:
+                stored[genome_dtype] = np.stack([archive.get(gen) for gen in range(len(genomes))])
+                row = archive.row_dtype.itemsize
+            print(f"  {genome_dtype}: {row} bytes por genoma")
+        exact = np.array_equal(stored["float32"], genomes)
+        error = np.max(np.abs(stored["float16"] - genomes) / np.maximum(np.abs(genomes), 1e-3))
+        original = evaluate_population(genomes, nn, env_config, 3, backend="vectorized", seeds=seeds)[0]
+        rounded = evaluate_population(stored["float16"], nn, env_config, 3, backend="vectorized", seeds=seeds)[0]
+        ok &= exact
+        print(f"  float32 exato: {exact}; float16: erro relativo máximo {error:.1e}, "
+              f"{np.mean(original != rounded):.1%} dos genomas com outro fitness")
+    print("OK" if ok else "FALHOU")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,89 @@
+"""
+Custo por passo de `encode_state` e da busca de caminho para a cauda:
+três buscas de Dijkstra (versão antiga) vs uma única BFS a partir da cauda.
+
+Uso: python -m benchmarks.bench_encode [--sizes 10 20 40] [--states 500]
+"""
+import argparse
+import copy
+import random
+import time
+
+from snake_ai.env.snake_env import SnakeEnv
+from snake_ai.env.state_encoding import encode_state, get_dijkstra_distance, get_tail_distances
+
+def collect_states(width: int, height: int, num_states: int, seed: int = 0) -> list[SnakeEnv]:
+    """
+    Joga com uma política simples (vai na direção da maçã evitando colisões imediatas)
+    e guarda cópias do ambiente em cada passo, cobrindo cobras curtas e longas.
+    """
+    rng = random.Random(seed)
+    env = SnakeEnv(width, height, initial_energy=width * height, seed=seed)
+    states = []
+
+    while len(states) < num_states:
+        states.append(copy.deepcopy(env))
+
+        danger = encode_state(env)[:3]
+        safe = [a for a, d in zip((1, 2, 0), danger) if d == 0.0] or [1]
+        # Preferir a ação que aproxima a cabeça da maçã
+        ax, ay = env.apple
+        best = min(safe, key=lambda a: _distance_after(env, a, ax, ay) + rng.random())
+        action = best if rng.random() < 0.9 else rng.choice(safe)
+
+        _, _, done, _ = env.step(action)
+        if done:
+            env.reset()
+
+    return states
+
+def _distance_after(env: SnakeEnv, action: int, ax: int, ay: int) -> int:
+    dx, dy = [(0, -1), (1, 0), (0, 1), (-1, 0)][(env.direction.value + (action == 2) - (action == 0)) % 4]
+    hx, hy = env.snake[0]
+    return abs(hx + dx - ax) + abs(hy + dy - ay)
+
+def _candidates(env: SnakeEnv) -> list[tuple]:
+    hx, hy = env.snake[0]
+    d = env.direction.value
+    moves = [(0, -1), (1, 0), (0, 1), (-1, 0)]
+    return [(hx + moves[k % 4][0], hy + moves[k % 4][1]) for k in (d, d + 1, d - 1)]
+
+def legacy_tail_paths(env: SnakeEnv) -> list[float]:
+    tail = env.snake[-1]
+    obstacles = set(list(env.snake)[:-1])
+    return [get_dijkstra_distance(pt, tail, obstacles, env.width, env.height) for pt in _candidates(env)]
+
+def bfs_tail_paths(env: SnakeEnv) -> list[float]:
+    return get_tail_distances(_candidates(env), env.snake[-1], env.occupancy, env.width, env.height)
+
+def time_per_call(fn, states: list[SnakeEnv], repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for env in states:
+            fn(env)
+        best = min(best, time.perf_counter() - start)
+    return best / len(states)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do encode_state por tamanho de tabuleiro.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 20, 40])
+    parser.add_argument("--states", type=int, default=500)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'board':>7} {'len médio':>9} {'dijkstra x3':>12} {'bfs única':>10} {'speedup':>8} {'encode_state':>13}  iguais")
+    for size in args.sizes:
+        states = collect_states(size, size, args.states)
+        same = all(legacy_tail_paths(env) == bfs_tail_paths(env) for env in states)
+        mean_len = sum(len(env.snake) for env in states) / len(states)
+
+        t_legacy = time_per_call(legacy_tail_paths, states, args.repeats)
+        t_bfs = time_per_call(bfs_tail_paths, states, args.repeats)
+        t_encode = time_per_call(encode_state, states, args.repeats)
+
+        print(f"{size:>3}x{size:<3} {mean_len:9.1f} {t_legacy * 1e6:10.1f}us {t_bfs * 1e6:8.1f}us "
+              f"{t_legacy / t_bfs:7.1f}x {t_encode * 1e6:11.1f}us  {same}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Custo de `SnakeEnv.step` em função do tamanho da cobra.
+
+A cobra percorre um ciclo hamiltoniano do tabuleiro (nunca morre), então o
+custo medido é só o do passo: checagem de colisão, movimento do corpo e
+maçã. Para comparação, mede também as operações da versão antiga baseada em
+lista (`new_head in snake[:-1]`, `snake.insert(0, ...)` e `snake.pop()`).
+
+Mede ainda o sorteio da maçã: índice de células livres (atual) vs a
+amostragem por rejeição antiga, que piora conforme a cobra enche o tabuleiro.
+
+Uso: python -m benchmarks.bench_env [--size 40] [--lengths 3 50 200 800 1500]
+"""
+import argparse
+import random
+import time
+from collections import deque
+
+from snake_ai.env.snake_env import SnakeEnv, Direction
+
+MOVES = {(0, -1): Direction.UP, (1, 0): Direction.RIGHT, (0, 1): Direction.DOWN, (-1, 0): Direction.LEFT}
+
+def hamiltonian_cycle(width: int, height: int) -> list[tuple[int, int]]:
+    """Ciclo que serpenteia pelas colunas 1..width-1 e volta pela coluna 0 (height par)."""
+    cycle = [(0, 0)]
+    for y in range(height):
+        xs = range(1, width) if y % 2 == 0 else range(width - 1, 0, -1)
+        cycle.extend((x, y) for x in xs)
+    cycle.extend((0, y) for y in range(height - 1, 0, -1))
+    return cycle
+
+def place_snake(env: SnakeEnv, cycle: list[tuple[int, int]], length: int) -> int:
+    """Coloca a cobra sobre o ciclo (cabeça no índice length-1) e retorna o índice da cabeça."""
+    head = length - 1
+    env.snake = deque(cycle[head - k] for k in range(length))
+    env.occupancy[:] = bytes(len(env.occupancy))
+    for x, y in env.snake:
+        env.occupancy[y * env.width + x] = 1
+    env.free_cells = [c for c in range(len(env.occupancy)) if not env.occupancy[c]]
+    env.free_pos = [-1] * len(env.occupancy)
+    for k, c in enumerate(env.free_cells):
+        env.free_pos[c] = k
+    (hx, hy), (px, py) = cycle[head], cycle[head - 1]
+    env.direction = MOVES[(hx - px, hy - py)]
+    # Maçã fora do caminho dos próximos passos
+    env.apple = cycle[-1] if length < len(cycle) - 1 else cycle[head + 1]
+    return head
+
+def cycle_actions(cycle: list[tuple[int, int]], head: int, num_steps: int) -> list[int]:
+    order = [Direction.UP, Direction.RIGHT, Direction.DOWN, Direction.LEFT]
+    actions = []
+    n = len(cycle)
+    d = order.index(MOVES[(cycle[head][0] - cycle[head - 1][0], cycle[head][1] - cycle[head - 1][1])])
+    for t in range(num_steps):
+        (x0, y0), (x1, y1) = cycle[(head + t) % n], cycle[(head + t + 1) % n]
+        nd = order.index(MOVES[(x1 - x0, y1 - y0)])
+        actions.append({0: 1, 1: 2, 3: 0}[(nd - d) % 4])
+        d = nd
+    return actions
+
+def time_step(size: int, length: int, num_steps: int) -> float:
+    # Sem crescimento: o tamanho fica fixo durante a medição
+    env = SnakeEnv(size, size, initial_energy=10**9, grow_on_eat=False, seed=0)
+    cycle = hamiltonian_cycle(size, size)
+    head = place_snake(env, cycle, length)
+    actions = cycle_actions(cycle, head, num_steps)
+
+    start = time.perf_counter()
+    for action in actions:
+        env.step(action)
+    elapsed = time.perf_counter() - start
+    assert not env.done
+    return elapsed / num_steps
+
+def time_legacy_ops(size: int, length: int, num_steps: int) -> float:
+    cycle = hamiltonian_cycle(size, size)
+    snake = [cycle[length - 1 - k] for k in range(length)]
+    n = len(cycle)
+
+    start = time.perf_counter()
+    for t in range(num_steps):
+        new_head = cycle[(length + t) % n]
+        _ = new_head in snake[:-1]
+        snake.insert(0, new_head)
+        snake.pop()
+    return (time.perf_counter() - start) / num_steps
+
+def time_place_apple(size: int, length: int, repeats: int) -> tuple[float, float]:
+    """Retorna (índice de livres, rejeição com busca na lista) por sorteio."""
+    env = SnakeEnv(size, size, seed=0)
+    cycle = hamiltonian_cycle(size, size)
+    place_snake(env, cycle, length)
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        env._place_apple()
+    t_index = (time.perf_counter() - start) / repeats
+
+    snake = list(env.snake)
+    rng = random.Random(0)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        while True:
+            x = rng.randint(0, size - 1)
+            y = rng.randint(0, size - 1)
+            if (x, y) not in snake:
+                break
+    t_legacy = (time.perf_counter() - start) / repeats
+    return t_index, t_legacy
+
+def main():
+    parser = argparse.ArgumentParser(description="Custo do step por tamanho da cobra.")
+    parser.add_argument("--size", type=int, default=40, help="Largura/altura do tabuleiro (par).")
+    parser.add_argument("--lengths", type=int, nargs="+", default=[3, 50, 200, 800, 1500])
+    parser.add_argument("--steps", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"{'tamanho':>8} {'step':>10} {'ops da lista antiga':>20} {'maçã (índice)':>14} {'maçã (rejeição)':>16}")
+    for length in args.lengths:
+        t_step = time_step(args.size, length, args.steps)
+        t_legacy = time_legacy_ops(args.size, length, args.steps)
+        t_apple, t_apple_legacy = time_place_apple(args.size, length, 200)
+        print(f"{length:>8} {t_step * 1e6:8.2f}us {t_legacy * 1e6:18.2f}us "
+              f"{t_apple * 1e6:12.2f}us {t_apple_legacy * 1e6:14.2f}us")
+
+if __name__ == "__main__":
+    main()
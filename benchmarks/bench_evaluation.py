@@ -0,0 +1,71 @@
+"""
+Throughput de uma geração completa em cada backend de avaliação (serial, lockstep, vectorized)
+e, com --workers, no EvaluationExecutor em modo "process" com 1..N workers. A
+paridade do fitness entre backends e modos é garantida por tests/test_evaluation_parity.py.
+
+Uso: python -m benchmarks.bench_evaluation [--population 150] [--episodes 3] [--size 10] [--workers 8]
+"""
+import argparse
+import time
+import numpy as np
+
+from snake_ai.agents.neural_net import NeuralNetwork
+from snake_ai.agents.genome import create_random_genome
+from snake_ai.training.evaluation import evaluate_population, EVAL_BACKENDS
+from snake_ai.training.executor import EvaluationExecutor
+
+LAYER_SIZES = [8, 16, 12, 3]
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de avaliação de uma geração.")
+    parser.add_argument("--population", type=int, default=150)
+    parser.add_argument("--episodes", type=int, default=3)
+    parser.add_argument("--size", type=int, default=10, help="Largura/altura do tabuleiro.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=0, help="Máximo de workers do executor em modo process (0 = pular).")
+    parser.add_argument("--backend", type=str, default="serial", choices=EVAL_BACKENDS, help="Backend usado dentro dos workers.")
+    args = parser.parse_args()
+
+    np.random.seed(args.seed)
+    env_config = {
+        "width": args.size,
+        "height": args.size,
+        "initial_energy": args.size * args.size,
+        "grow_on_eat": True
+    }
+    nn = NeuralNetwork(LAYER_SIZES)
+    genome_size = len(nn.get_weights_flat())
+    population = [create_random_genome(genome_size, scale=1.0) for _ in range(args.population)]
+    seeds = list(range(args.seed, args.seed + args.episodes))
+
+    reference = None
+    for backend in EVAL_BACKENDS:
+        start = time.perf_counter()
+        fitness, stats = evaluate_population(population, nn, env_config, args.episodes, backend=backend, seeds=seeds)
+        elapsed = time.perf_counter() - start
+        steps = int(stats["steps"].sum())
+
+        if reference is None:
+            reference = (elapsed, fitness)
+        match = np.array_equal(fitness, reference[1])
+        print(f"{backend:>10}: {elapsed:8.3f} s/geração  {steps / elapsed:10.0f} passos/s  "
+              f"speedup {reference[0] / elapsed:5.1f}x  fitness idêntico: {match}")
+
+    # Escalonamento com processos persistentes (a 1ª geração inclui o warm-up do pool)
+    workers = 1
+    while workers <= args.workers:
+        with EvaluationExecutor(env_config, LAYER_SIZES, args.population, args.episodes,
+                                mode="process", num_workers=workers, backend=args.backend) as executor:
+            executor.evaluate(population, seeds=seeds)
+            start = time.perf_counter()
+            fitness, stats = executor.evaluate(population, seeds=seeds)
+            elapsed = time.perf_counter() - start
+
+        steps = int(stats["steps"].sum())
+        match = np.array_equal(fitness, reference[1])
+        print(f"process x{workers:<2} ({args.backend}): {elapsed:8.3f} s/geração  {steps / elapsed:10.0f} passos/s  "
+              f"speedup {reference[0] / elapsed:5.1f}x  fitness idêntico: {match}")
+        workers *= 2
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+GeneticAlgorithm.evolve na matriz da população contra o laço por par de filhos
+(implementação anterior, reproduzida aqui como referência).
+
+1. Confere as distribuições, que são as mesmas da referência (os sorteios não
+   são os mesmos, então os resultados não são idênticos):
+   - elites: as `elitism` melhores linhas, na ordem do ranking;
+   - torneio de 3: frequência de cada posição do ranking entre os pais contra a
+     exata, C(P-1-r, 2) / C(P, 3);
+   - crossover sem mutação: cada filho vem gene a gene de dois pais e os dois
+     filhos de um par são complementares; fração de genes trocados ~0.5
+     (uniforme) ou ponto de corte entre 1 e G-2 (ponto único);
+   - mutação: fração de genes alterados ~mutation_rate e desvio do ruído ~mutation_std.
+2. Tempo de uma evolução para cada tamanho de população.
+
+Uso: python -m benchmarks.bench_evolve [--sizes 150 1000 10000 100000]
+"""
+import argparse
+import time
+import numpy as np
+
+from snake_ai.agents.genetic_algorithm import GeneticAlgorithm
+from snake_ai.agents.genome import mutate_genome, crossover_uniform, crossover_single_point
+from snake_ai.agents.neural_net import NeuralNetwork
+
+LAYER_SIZES = [8, 16, 12, 3]
+
+def reference_evolve(ga: GeneticAlgorithm, population: list, fitness_scores) -> list:
+    """O evolve de antes: listas de genomas e um laço Python por par de filhos."""
+    sorted_indices = np.argsort(fitness_scores)[::-1]
+    sorted_population = [population[i] for i in sorted_indices]
+    new_population = [sorted_population[i].copy() for i in range(min(ga.elitism, len(sorted_population)))]
+    while len(new_population) < ga.population_size:
+        parent1 = sorted_population[np.min(np.random.choice(len(sorted_population), 3, replace=False))]
+        parent2 = sorted_population[np.min(np.random.choice(len(sorted_population), 3, replace=False))]
+        if ga.crossover_type == "uniform":
+            child1, child2 = crossover_uniform(parent1, parent2)
+        else:
+            child1, child2 = crossover_single_point(parent1, parent2)
+        new_population.append(mutate_genome(child1, ga.mutation_rate, ga.mutation_std))
+        if len(new_population) < ga.population_size:
+            new_population.append(mutate_genome(child2, ga.mutation_rate, ga.mutation_std))
+    return new_population
+
+def check_selection(size: int, genome_size: int, samples: int) -> bool:
+    ga = GeneticAlgorithm(size, genome_size, elitism=2, mutation_rate=0.1, mutation_std=0.2)
+    ranks = np.concatenate([ga._tournament_selection(size) for _ in range(samples // size + 1)])
+    observed = np.bincount(ranks, minlength=size) / len(ranks)
+    r = np.arange(size)
+    expected = (size - 1 - r) * (size - 2 - r) / 2 / (size * (size - 1) * (size - 2) / 6)
+    error = np.abs(observed - expected).sum() / 2  # Distância de variação total
+    ok = error < 0.02
+    print(f"torneio (P={size}): distância da distribuição exata {error:.4f} {'OK' if ok else 'FALHOU'}")
+    return ok
+
+def check_offspring(crossover_type: str, size: int, genome_size: int) -> bool:
+    ga = GeneticAlgorithm(size, genome_size, elitism=4, mutation_rate=0.0, mutation_std=0.2,
+                          crossover_type=crossover_type)
+    # Genes identificáveis: o gene g do genoma i vale i * G + g
+    ga.population = np.arange(size * genome_size, dtype=np.float64).reshape(size, genome_size)
+    before = ga.population.copy()
+    fitness = np.random.permutation(size).astype(float)
+    ga.evolve(fitness)
+    after = ga.population
+    elites = np.array_equal(after[:4], before[np.argsort(fitness)[::-1][:4]])
+
+    children = after[4:]
+    source = (children // genome_size).astype(int)
+    genes_ok = np.array_equal(children % genome_size, np.broadcast_to(np.arange(genome_size), children.shape))
+    pairs = (size - 4 + 1) // 2
+    first, second = source[:pairs], source[pairs:]
+    # Par complementar: em cada gene, os dois filhos têm os dois pais (ou o mesmo, se pai 1 = pai 2)
+    complementary = True
+    for i in range(len(second)):
+        parents = set(first[i]) | set(second[i])
+        complementary &= len(parents) <= 2 and all({a, b} == parents for a, b in zip(first[i], second[i]))
+    if crossover_type == "uniform":
+        # Fração dos genes do primeiro filho que vêm do pai do gene 0
+        fraction = np.mean([np.mean(row == row[0]) for row in first if len(set(row)) == 2])
+        distribution = abs(fraction - 0.5) < 0.02
+        detail = f"fração do pai do gene 0 {fraction:.3f}"
+    else:
+        cuts = [np.argmax(row != row[0]) for row in first if len(set(row)) == 2]
+        distribution = all(1 <= c <= genome_size - 2 for c in cuts)
+        detail = f"cortes entre {min(cuts)} e {max(cuts)}"
+    ok = elites and genes_ok and complementary and distribution
+    print(f"crossover {crossover_type}: elites {elites}, genes dos pais {genes_ok}, "
+          f"filhos complementares {complementary}, {detail} {'OK' if ok else 'FALHOU'}")
+    return ok
+
+def check_mutation(size: int, genome_size: int, rate: float, std: float) -> bool:
+    ga = GeneticAlgorithm(size, genome_size, elitism=0, mutation_rate=rate, mutation_std=std)
+    ga.population[:] = 1.0  # Todos iguais: o crossover não muda nada
+    ga.evolve(np.zeros(size))
+    delta = ga.population - 1.0
+    changed = delta != 0
+    fraction = changed.mean()
+    noise = delta[changed].std()
+    ok = abs(fraction - rate) < 0.01 and abs(noise - std) < 0.05 * std
+    print(f"mutação: {fraction:.4f} dos genes (esperado {rate}), desvio {noise:.4f} (esperado {std}) "
+          f"{'OK' if ok else 'FALHOU'}")
+    return ok
+
+def main():
+    parser = argparse.ArgumentParser(description="Evolução vetorizada contra o laço por par.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[150, 1000, 10000, 100000])
+    parser.add_argument("--reference-max", type=int, default=100000, help="Maior população medida também na referência")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    np.random.seed(args.seed)
+    genome_size = len(NeuralNetwork(LAYER_SIZES).get_weights_flat())
+
+    ok = check_selection(200, genome_size, 400000)
+    for crossover_type in ("uniform", "single_point"):
+        ok &= check_offspring(crossover_type, 301, genome_size)
+    ok &= check_mutation(2000, genome_size, 0.1, 0.2)
+
+    print(f"\n{'população':>9}  {'antes':>9}  {'depois':>9}  {'ganho':>6}")
+    for size in args.sizes:
+        fitness = np.random.default_rng(args.seed).gamma(2.0, 50.0, size=size)
+        ga = GeneticAlgorithm(size, genome_size, elitism=max(2, size // 20), mutation_rate=0.1, mutation_std=0.2)
+        ga.evolve(fitness)  # Aloca o segundo buffer
+        new = []
+        for _ in range(args.repeats):
+            start = time.perf_counter()
+            ga.evolve(fitness)
+            new.append(time.perf_counter() - start)
+        new = min(new)
+        if size <= args.reference_max:
+            population = list(ga.population)
+            start = time.perf_counter()
+            reference_evolve(ga, population, fitness)
+            old = time.perf_counter() - start
+            print(f"{size:>9}  {old * 1000:>7.1f}ms  {new * 1000:>7.2f}ms  {old / new:>5.0f}x")
+        else:
+            print(f"{size:>9}  {'-':>9}  {new * 1000:>7.2f}ms")
+    print("OK" if ok else "FALHOU")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    raise SystemExit(main())
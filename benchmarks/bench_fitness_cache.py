@@ -0,0 +1,67 @@
+"""
+Gerações do algoritmo genético com e sem o FitnessCache do EvaluationExecutor.
+
+As duas execuções partem da mesma população e do mesmo estado do np.random, com
+as seeds dos episódios renovadas a cada --seed-interval gerações; o fitness de
+cada geração tem que ser idêntico, só os passos jogados mudam.
+
+Uso: python -m benchmarks.bench_fitness_cache [--generations 20] [--seed-interval 5]
+"""
+import argparse
+import time
+import numpy as np
+
+from snake_ai.agents.genetic_algorithm import GeneticAlgorithm
+from snake_ai.agents.neural_net import NeuralNetwork
+from snake_ai.training.executor import EvaluationExecutor
+
+LAYER_SIZES = [8, 16, 12, 3]
+
+def run(args, env_config: dict, cache_size: int) -> tuple[float, list[np.ndarray], int, int]:
+    """Retorna (tempo de avaliação, fitness por geração, passos jogados, acertos do cache)."""
+    np.random.seed(args.seed)
+    genome_size = len(NeuralNetwork(LAYER_SIZES).get_weights_flat())
+    ga = GeneticAlgorithm(args.population, genome_size, elitism=max(2, int(args.population * 0.05)),
+                          mutation_rate=args.mutation_rate, mutation_std=0.2)
+
+    history = []
+    total_steps = total_hits = 0
+    elapsed = 0.0
+    with EvaluationExecutor(env_config, LAYER_SIZES, args.population, args.episodes,
+                            backend="vectorized", cache_size=cache_size) as executor:
+        for gen in range(args.generations):
+            if gen % args.seed_interval == 0:
+                seeds = np.random.randint(0, 2**31 - 1, size=args.episodes).tolist()
+            start = time.perf_counter()
+            fitness, stats = executor.evaluate(ga.get_population(), seeds=seeds)
+            elapsed += time.perf_counter() - start
+            total_steps += int(stats["steps"].sum())
+            total_hits += stats.get("cache_hits", 0)
+            history.append(fitness)
+            ga.evolve(fitness)
+    return elapsed, history, total_steps, total_hits
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do cache de fitness.")
+    parser.add_argument("--population", type=int, default=150)
+    parser.add_argument("--episodes", type=int, default=3)
+    parser.add_argument("--generations", type=int, default=20)
+    parser.add_argument("--seed-interval", type=int, default=5)
+    parser.add_argument("--mutation-rate", type=float, default=0.1)
+    parser.add_argument("--size", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    env_config = {"width": args.size, "height": args.size, "initial_energy": args.size * args.size, "grow_on_eat": True}
+
+    t_plain, h_plain, s_plain, _ = run(args, env_config, cache_size=0)
+    t_cache, h_cache, s_cache, hits = run(args, env_config, cache_size=args.population * 4)
+
+    same = all(np.array_equal(a, b) for a, b in zip(h_plain, h_cache))
+    evaluated = args.population * args.generations
+    print(f"sem cache: {t_plain:7.2f} s  {s_plain:>10} passos")
+    print(f"com cache: {t_cache:7.2f} s  {s_cache:>10} passos  acertos {hits}/{evaluated} ({hits / evaluated:.0%})")
+    print(f"speedup {t_plain / t_cache:.2f}x  fitness idêntico: {same}")
+
+if __name__ == "__main__":
+    main()
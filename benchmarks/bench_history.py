@@ -0,0 +1,89 @@
+"""
+Histórico colunar vs. CSV linha a linha.
+
+Grava o histórico de um treinamento sintético (uma linha por geração e uma por
+indivíduo, ~1 milhão de linhas de indivíduos no padrão) e mede: o tempo de
+escrita por geração, a leitura das colunas de um gráfico (melhor/média por
+geração), os percentis do fitness por geração e um recorte de 100 gerações. A
+referência é o mesmo conteúdo em CSV lido com np.genfromtxt, como fazia o
+gráfico antes; os valores lidos dos dois lados têm que ser iguais.
+
+Uso: python -m benchmarks.bench_history [--generations 2000] [--population 500]
+"""
+import argparse
+import os
+import tempfile
+import time
+import numpy as np
+
+from snake_ai.training.trainer import HISTORY_SCHEMA
+from snake_ai.utils.history import HistoryStore
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Histórico colunar vs. CSV.")
+    parser.add_argument("--generations", type=int, default=2000)
+    parser.add_argument("--population", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    gens, pop = args.generations, args.population
+    fitness = rng.gamma(2.0, 50.0, size=(gens, pop))
+    score = rng.integers(0, 30, size=(gens, pop)).astype(np.float32)
+    steps = rng.integers(10, 500, size=(gens, pop)).astype(np.float32)
+    reason = rng.integers(1, 4, size=(gens, pop)).astype(np.int8)
+    generation_columns = HISTORY_SCHEMA["generations"]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Escrita: colunar com buffer vs. CSV aberto em append a cada geração
+        store_path, csv_path = os.path.join(tmp, "history"), os.path.join(tmp, "individuals.csv")
+        with open(csv_path, "w") as f:
+            f.write("generation,fitness,score,steps,reason,episodes\n")
+
+        def write_store():
+            with HistoryStore.create(store_path, HISTORY_SCHEMA) as store:
+                for g in range(gens):
+                    store.append("generations", **{name: 0 for name in generation_columns if name != "generation"},
+                                 generation=g)
+                    store.append("individuals", generation=np.full(pop, g), fitness=fitness[g], score=score[g],
+                                 steps=steps[g], reason=reason[g], episodes=np.full(pop, 3))
+
+        def write_csv():
+            for g in range(gens):
+                with open(csv_path, "a") as f:
+                    for i in range(pop):
+                        f.write(f"{g},{fitness[g, i]},{score[g, i]},{steps[g, i]},{reason[g, i]},3\n")
+
+        _, store_write = timed(write_store)
+        _, csv_write = timed(write_csv)
+
+        store = HistoryStore(store_path)
+        (_, band), store_pct = timed(lambda: store.percentiles("individuals", "fitness", [5, 50, 95]))
+        window, store_window = timed(lambda: store.percentiles("individuals", "fitness", [50], start=gens // 2,
+                                                               stop=gens // 2 + 100)[1])
+        best, store_best = timed(lambda: np.array(store.column("individuals", "fitness")).reshape(gens, pop).max(axis=1))
+
+        table, csv_read = timed(lambda: np.genfromtxt(csv_path, delimiter=",", names=True, ndmin=1))
+        csv_band, csv_pct = timed(lambda: np.percentile(table["fitness"].reshape(gens, pop), [5, 50, 95], axis=1).T)
+        store_size = sum(os.path.getsize(os.path.join(root, name))
+                         for root, _, names in os.walk(store_path) for name in names)
+        csv_size = os.path.getsize(csv_path)
+
+    expected_window = np.percentile(fitness[gens // 2:gens // 2 + 100], [50], axis=1).T
+    same = (np.array_equal(band, csv_band) and np.array_equal(best, fitness.max(axis=1))
+            and np.array_equal(window, expected_window))
+    rows = gens * pop
+    print(f"{gens} gerações x {pop} indivíduos = {rows} linhas")
+    print(f"      escrita: colunar {store_write / gens * 1000:.3f} ms/geração   csv {csv_write / gens * 1000:.3f} ms/geração")
+    print(f"      tamanho: colunar {store_size / 2**20:.1f} MiB   csv {csv_size / 2**20:.1f} MiB")
+    print(f"  percentis/g: colunar {store_pct:.3f} s   csv {csv_read + csv_pct:.3f} s (leitura {csv_read:.3f} s)")
+    print(f"    melhor/g: colunar {store_best:.3f} s   100 gerações (mediana): {store_window * 1000:.2f} ms")
+    print(f"valores idênticos: {same}")
+
+if __name__ == "__main__":
+    main()
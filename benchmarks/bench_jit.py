@@ -0,0 +1,53 @@
+"""
+Backend compilado (Numba) do VecSnakeEnv: throughput de step/encode contra o
+caminho NumPy. A paridade com o `SnakeEnv`/`encode_state` de referência fica em
+tests/test_vec_env_parity.py (python -m pytest).
+
+Uso: python -m benchmarks.bench_jit [--envs 4096] [--steps 200] [--size 10]
+"""
+import argparse
+import time
+import numpy as np
+
+from snake_ai.env.vec_env import VecSnakeEnv, HAS_NUMBA
+
+def throughput(use_jit: bool, num_envs: int, num_steps: int, width: int, height: int) -> tuple[float, float]:
+    """Retorna (passos/s só do step, passos/s de encode + step) com ações aleatórias e auto-reset."""
+    config = {"width": width, "height": height, "initial_energy": width * height, "grow_on_eat": True}
+    actions = np.random.default_rng(0).integers(0, 3, (num_steps, num_envs))
+
+    venv = VecSnakeEnv(num_envs, **config, seeds=list(range(num_envs)), use_jit=use_jit)
+    venv.step(actions[0])
+    start = time.perf_counter()
+    for t in range(num_steps):
+        venv.step(actions[t])
+    step_rate = num_envs * num_steps / (time.perf_counter() - start)
+
+    venv = VecSnakeEnv(num_envs, **config, seeds=list(range(num_envs)), use_jit=use_jit)
+    venv.encode()
+    start = time.perf_counter()
+    for t in range(num_steps):
+        venv.encode()
+        venv.step(actions[t])
+    full_rate = num_envs * num_steps / (time.perf_counter() - start)
+
+    return step_rate, full_rate
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput do backend Numba.")
+    parser.add_argument("--envs", type=int, default=4096)
+    parser.add_argument("--steps", type=int, default=200)
+    parser.add_argument("--size", type=int, default=10)
+    args = parser.parse_args()
+
+    backends = [False, True] if HAS_NUMBA else [False]
+    if not HAS_NUMBA:
+        print("Numba não instalado: medindo apenas o caminho NumPy.")
+
+    for use_jit in backends:
+        name = "numba" if use_jit else "numpy"
+        step_rate, full_rate = throughput(use_jit, args.envs, args.steps, args.size, args.size)
+        print(f"{name:>6}: step {step_rate / 1e6:7.2f} M passos/s   encode+step {full_rate / 1e6:7.2f} M passos/s")
+
+if __name__ == "__main__":
+    main()
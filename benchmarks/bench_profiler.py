@@ -0,0 +1,77 @@
+"""
+Custo dos cronômetros por fase e exemplo da divisão do tempo de uma geração.
+
+Para cada backend avalia a mesma população com o profiler desligado e ligado
+(fitness tem que ser idêntico) e mostra o custo relativo; depois roda um Trainer
+curto com `profile` ligado (no modo de execução escolhido) e imprime a divisão
+por fase da última geração.
+
+Uso: python -m benchmarks.bench_profiler [--population 150] [--mode process]
+"""
+import argparse
+import tempfile
+import time
+import numpy as np
+
+from snake_ai.agents.neural_net import NeuralNetwork
+from snake_ai.training.evaluation import evaluate_population, EVAL_BACKENDS
+from snake_ai.training.trainer import Trainer
+from snake_ai.utils import profiler
+
+def timed(fn, profile: bool) -> tuple[float, object]:
+    profiler.enable(profile)
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    profiler.enable(False)
+    return elapsed, result
+
+def main():
+    parser = argparse.ArgumentParser(description="Custo e saída do profiler por fase.")
+    parser.add_argument("--population", type=int, default=150)
+    parser.add_argument("--episodes", type=int, default=3)
+    parser.add_argument("--size", type=int, default=10)
+    parser.add_argument("--repeats", type=int, default=7)
+    parser.add_argument("--generations", type=int, default=5)
+    parser.add_argument("--mode", default="process", help="executor_mode do Trainer de exemplo")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    layer_sizes = [8, 16, 12, 3]
+    nn = NeuralNetwork(layer_sizes)
+    rng = np.random.default_rng(args.seed)
+    population = rng.normal(0, 1, size=(args.population, len(nn.get_weights_flat())))
+    env_config = {"width": args.size, "height": args.size, "initial_energy": args.size * args.size}
+    seeds = list(range(args.episodes))
+
+    print(f"{'backend':>10}  {'desligado':>10}  {'ligado':>10}  custo   fitness idêntico")
+    for backend in EVAL_BACKENDS:
+        def run():
+            return evaluate_population(population, nn, env_config, args.episodes, backend=backend, seeds=seeds)
+        # Desligado e ligado alternados, melhor tempo de cada (menos sensível a ruído da máquina)
+        off = on = float("inf")
+        for _ in range(args.repeats):
+            elapsed, (fitness_off, _) = timed(run, False)
+            off = min(off, elapsed)
+            elapsed, (fitness_on, _) = timed(run, True)
+            on = min(on, elapsed)
+        print(f"{backend:>10}  {off:>9.3f}s  {on:>9.3f}s  {on / off - 1:+6.1%}   {np.array_equal(fitness_off, fitness_on)}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config = {"width": args.size, "height": args.size, "population_size": args.population,
+                  "generations": args.generations, "seed": args.seed, "executor_mode": args.mode,
+                  "num_workers": 2, "profile": True, "checkpoint_interval": 2,
+                  "models_dir": tmp, "logs_dir": tmp}
+        records = []
+        with Trainer(config) as trainer:
+            trainer.run(lambda record, population, fitness: records.append(record))
+
+    last = records[-1]
+    print(f"\nTrainer ({args.mode}, 2 workers), geração {last['generation']} "
+          f"(avaliação {last['eval_s'] * 1000:.0f} ms; fases da avaliação somadas entre workers):")
+    for name, entry in last["profile"].items():
+        rate = f"{entry['steps_per_s']:>12.0f} passos/s" if "steps_per_s" in entry else ""
+        print(f"  {name:>16}  {entry['seconds'] * 1000:>9.2f} ms  {entry['calls']:>8} chamadas  {rate}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Qualidade da seleção vs passos jogados: avaliação uniforme (todos os episódios
+para todos) contra o racing do EvaluationExecutor.
+
+A população vem de algumas gerações de treino (mistura de genomas bons e ruins).
+A referência é o fitness médio em --truth-episodes episódios; para cada modo mede
+o fitness de referência dos elites e dos genomas acima do corte do torneio que ele
+escolheria, em relação à melhor escolha possível (100% = escolha ideal; empates
+não contam como erro), e quantos passos foram gastos.
+
+Uso: python -m benchmarks.bench_racing [--population 150] [--episodes 3] [--budget 0]
+"""
+import argparse
+import numpy as np
+
+from snake_ai.agents.genetic_algorithm import GeneticAlgorithm
+from snake_ai.agents.neural_net import NeuralNetwork
+from snake_ai.training.evaluation import evaluate_population
+from snake_ai.training.executor import EvaluationExecutor
+
+LAYER_SIZES = [8, 16, 12, 3]
+
+def selection_quality(fitness: np.ndarray, truth: np.ndarray, k: int) -> float:
+    """Fitness de referência dos k melhores segundo `fitness`, relativo aos k melhores de verdade."""
+    chosen = np.argsort(-fitness, kind="stable")[:k]
+    best = np.sort(truth)[::-1][:k]
+    return truth[chosen].sum() / max(best.sum(), 1e-12)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da avaliação adaptativa (racing).")
+    parser.add_argument("--population", type=int, default=150)
+    parser.add_argument("--episodes", type=int, default=3)
+    parser.add_argument("--train-generations", type=int, default=15)
+    parser.add_argument("--generations", type=int, default=5, help="Gerações medidas.")
+    parser.add_argument("--truth-episodes", type=int, default=20)
+    parser.add_argument("--budget", type=int, default=0, help="Orçamento de passos do racing (0 = livre).")
+    parser.add_argument("--size", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    np.random.seed(args.seed)
+    env_config = {"width": args.size, "height": args.size, "initial_energy": args.size * args.size, "grow_on_eat": True}
+    nn = NeuralNetwork(LAYER_SIZES)
+    genome_size = len(nn.get_weights_flat())
+    ga = GeneticAlgorithm(args.population, genome_size, elitism=max(2, int(args.population * 0.05)),
+                          mutation_rate=0.1, mutation_std=0.2)
+    cutoffs = ga.selection_cutoffs()
+
+    uniform = EvaluationExecutor(env_config, LAYER_SIZES, args.population, args.episodes, backend="vectorized")
+    racing = EvaluationExecutor(env_config, LAYER_SIZES, args.population, args.episodes, backend="vectorized",
+                                racing=True, step_budget=args.budget or None)
+
+    totals = {"uniforme": np.zeros(3), "racing": np.zeros(3)}
+    episode_counts = []
+    with uniform, racing:
+        for gen in range(args.train_generations + args.generations):
+            seeds = np.random.randint(0, 2**31 - 1, size=args.episodes).tolist()
+            population = ga.get_population()
+            fitness, _ = uniform.evaluate(population, seeds=seeds)
+            if gen >= args.train_generations:
+                truth_seeds = np.random.randint(0, 2**31 - 1, size=args.truth_episodes).tolist()
+                truth, _ = evaluate_population(population, nn, env_config, args.truth_episodes,
+                                               backend="vectorized", seeds=truth_seeds)
+                race_fitness, race_stats = racing.evaluate(population, seeds=seeds, cutoff_ranks=cutoffs)
+                _, uniform_stats = uniform.evaluate(population, seeds=seeds)
+                episode_counts.append(race_stats["episodes"])
+                for name, fit, stats in (("uniforme", fitness, uniform_stats), ("racing", race_fitness, race_stats)):
+                    totals[name] += (stats["steps"].sum(), selection_quality(fit, truth, cutoffs[0]), selection_quality(fit, truth, cutoffs[-1]))
+            ga.evolve(fitness)
+
+    print(f"cortes de seleção (posições): {cutoffs}")
+    print(f"{'modo':>9} {'passos/geração':>15} {'elites':>8} {'acima do corte':>15}")
+    for name, (steps, elite, tournament) in totals.items():
+        n = args.generations
+        print(f"{name:>9} {steps / n:15.0f} {elite / n:8.0%} {tournament / n:15.0%}")
+    counts = np.bincount(np.concatenate(episode_counts), minlength=args.episodes + 1)[1:]
+    print("genomas por nº de episódios no racing: " + ", ".join(f"{e + 1}: {c / args.generations:.0f}" for e, c in enumerate(counts)))
+
+if __name__ == "__main__":
+    main()
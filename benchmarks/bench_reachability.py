@@ -0,0 +1,77 @@
+"""
+Custo por passo do encode_state com o estado incremental de alcançabilidade
+(`SnakeEnv(track_reachability=True)`) vs a BFS completa a partir da cauda.
+
+Uma política simples (vai na direção da maçã, preferindo ações com caminho até a
+cauda) joga um episódio longo; a mesma sequência de ações é repetida nos dois
+modos, medindo só o encode e conferindo que os vetores são idênticos (a
+paridade passo a passo é garantida por tests/test_reachability.py).
+
+Uso: python -m benchmarks.bench_reachability [--sizes 10 20 40] [--steps 3000]
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from snake_ai.env.snake_env import SnakeEnv
+from snake_ai.env.state_encoding import encode_state
+
+def play_actions(size: int, num_steps: int, seed: int = 0) -> list[int]:
+    """Ações de uma política gulosa segura (reinicia o jogo se morrer)."""
+    rng = random.Random(seed)
+    env = SnakeEnv(size, size, seed=seed, track_reachability=True)
+    moves = [(0, -1), (1, 0), (0, 1), (-1, 0)]
+    actions = []
+    for _ in range(num_steps):
+        state = encode_state(env)
+        hx, hy = env.snake[0]
+        ax, ay = env.apple
+        best, best_key = 1, None
+        for j, action in enumerate((1, 2, 0)):
+            dx, dy = moves[(env.direction.value + (action == 2) - (action == 0)) % 4]
+            # Sem caminho para a cauda pesa mais que qualquer distância
+            key = (state[5 + j] == 0.0, abs(hx + dx - ax) + abs(hy + dy - ay) + rng.random() * 2)
+            if best_key is None or key < best_key:
+                best, best_key = action, key
+        actions.append(best)
+        _, _, done, _ = env.step(best)
+        if done:
+            env.reset()
+    return actions
+
+def replay(size: int, actions: list[int], track: bool, seed: int = 0) -> tuple[float, np.ndarray, float, int]:
+    """Retorna (tempo médio do encode, estados, tamanho médio, reconstruções)."""
+    env = SnakeEnv(size, size, seed=seed, track_reachability=track)
+    states = np.empty((len(actions), 8), dtype=np.float32)
+    lengths = 0
+    elapsed = 0.0
+    for t, action in enumerate(actions):
+        start = time.perf_counter()
+        states[t] = encode_state(env)
+        elapsed += time.perf_counter() - start
+        lengths += len(env.snake)
+        _, _, done, _ = env.step(action)
+        if done:
+            env.reset()
+    rebuilds = env.reachability.rebuilds if track else 0
+    return elapsed / len(actions), states, lengths / len(actions), rebuilds
+
+def main():
+    parser = argparse.ArgumentParser(description="Encode incremental vs BFS completa.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 20, 40])
+    parser.add_argument("--steps", type=int, default=3000)
+    args = parser.parse_args()
+
+    print(f"{'board':>7} {'len médio':>9} {'bfs':>9} {'incremental':>12} {'speedup':>8} {'reconstr.':>10}  iguais")
+    for size in args.sizes:
+        actions = play_actions(size, args.steps)
+        t_bfs, s_bfs, mean_len, _ = replay(size, actions, track=False)
+        t_inc, s_inc, _, rebuilds = replay(size, actions, track=True)
+        same = np.array_equal(s_bfs, s_inc)
+        print(f"{size:>3}x{size:<3} {mean_len:9.1f} {t_bfs * 1e6:7.1f}us {t_inc * 1e6:10.1f}us "
+              f"{t_bfs / t_inc:7.1f}x {rebuilds:>10}  {same}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Custo por quadro do DashboardRenderer.
+
+Mostra gerações de genomas aleatórios (sempre as mesmas seeds) sem limite de FPS
+até juntar `--frames` quadros e mede o tempo de parede e o tempo de CPU por
+quadro, para cada tamanho de tabuleiro e de janela. Sem display, usa o driver
+"dummy" do SDL (desenha igual, só não aparece; o custo de mandar os quadros para a
+tela real não entra na conta).
+
+Uso: python -m benchmarks.bench_render [--frames 600] [--sizes 10 30]
+"""
+import argparse
+import os
+import random
+import time
+import numpy as np
+
+from snake_ai.agents.neural_net import NeuralNetwork
+
+def measure(size: int, window: tuple[int, int], num_games: int, frames: int, seed: int) -> tuple[float, float]:
+    """(ms de parede por quadro, ms de CPU por quadro)."""
+    import pygame
+    from snake_ai.visualization.dashboard import DashboardRenderer
+
+    layer_sizes = [8, 16, 12, 3]
+    env_config = {"width": size, "height": size, "initial_energy": size * size, "grow_on_eat": True}
+    renderer = DashboardRenderer(env_config, layer_sizes, num_games=num_games)
+    if window != (renderer.total_w, renderer.total_h):
+        pygame.event.post(pygame.event.Event(pygame.VIDEORESIZE, w=window[0], h=window[1]))
+    for gen in range(200):
+        renderer.update_graph_data(gen, gen * 1.5, gen * 0.5)
+
+    nn = NeuralNetwork(layer_sizes)
+    genome_size = len(nn.get_weights_flat())
+    rng = np.random.default_rng(seed)
+    random.seed(seed)
+    np.random.seed(seed)
+    count = [0]
+
+    def on_frame() -> bool:
+        count[0] += 1
+        return count[0] >= frames
+
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    generation = 200
+    while count[0] < frames:
+        genomes = [rng.normal(0, 1, genome_size) for _ in range(num_games)]
+        renderer.render_generation(genomes, nn, speed=0, on_frame=on_frame)
+        renderer.update_graph_data(generation, generation * 1.5, generation * 0.5)
+        generation += 1
+    wall = time.perf_counter() - wall
+    cpu = time.process_time() - cpu
+    renderer.close()
+    return wall / count[0] * 1000, cpu / count[0] * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description="Custo por quadro do dashboard.")
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 30])
+    parser.add_argument("--windows", nargs="+", default=["1200x800", "1920x1080"])
+    parser.add_argument("--games", type=int, default=9)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    if not os.environ.get("DISPLAY"):
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+    print(f"{'tabuleiro':>9}  {'janela':>10}  {'ms/quadro':>9}  {'ms CPU':>7}  {'quadros/s':>9}")
+    for size in args.sizes:
+        for window in args.windows:
+            w, h = (int(v) for v in window.split("x"))
+            wall_ms, cpu_ms = measure(size, (w, h), args.games, args.frames, args.seed)
+            print(f"{size:>6}x{size:<2}  {window:>10}  {wall_ms:>9.2f}  {cpu_ms:>7.2f}  {1000 / wall_ms:>9.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Curva de fitness ao vivo em memória limitada (`DownsampledSeries`).
+
+1. Confere a redução contra a força bruta: cada balde devolvido por `view` tem o
+   mínimo e o máximo exatos dos pontos crus que cobre, os baldes cobrem a janela
+   pedida sem buracos, cabem em `max_points` e terminam no último ponto.
+2. Custo do append e da consulta, e memória, para treinamentos cada vez mais longos.
+3. Custo de desenhar o gráfico do dashboard (pygame, driver "dummy" sem display)
+   e de atualizar o LivePlotter (matplotlib Agg): listas completas (como antes)
+   contra a série reduzida.
+
+Uso: python -m benchmarks.bench_series [--sizes 1000 100000 1000000]
+"""
+import argparse
+import os
+import time
+import numpy as np
+
+from snake_ai.utils.series import DownsampledSeries, envelope
+
+def check(values: np.ndarray, series: DownsampledSeries, max_points: int, window: int | None) -> bool:
+    """Os baldes de `view` batem com os pontos crus (gerações 0..N-1)."""
+    x, lo, hi = series.view(max_points, window)
+    total = len(values)
+    start = 0 if window is None else max(0, total - window)
+    k, first = series._level_for(max_points, start)
+    size = series._size[k]
+    edges = np.arange(first, first + len(x) + 1) * size
+    edges[-1] = min(edges[-1], total)
+    if len(x) > max_points or edges[-1] != total:
+        return False
+    # Sem perder a janela: o primeiro balde começa nela ou antes (a menos que nada caiba)
+    covered = edges[0] <= start or len(x) == max_points
+    for c in range(values.shape[1]):
+        if not (np.array_equal(lo[:, c], np.minimum.reduceat(values[edges[0]:, c], edges[:-1] - edges[0]))
+                and np.array_equal(hi[:, c], np.maximum.reduceat(values[edges[0]:, c], edges[:-1] - edges[0]))):
+            return False
+    return covered and np.array_equal(x, (edges[:-1] + edges[1:] - 1) / 2)
+
+def timed(fn, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def draw_full(renderer, gens: list, best: list, mean: list) -> None:
+    """O desenho de antes: todos os pontos das listas a cada atualização."""
+    import pygame
+    area_x, area_y, area_w, area_h = renderer._graph_area()
+    renderer.screen.blit(renderer.background, renderer.graph_rect, renderer.graph_rect)
+    g = np.asarray(gens, dtype=float)
+    b = np.asarray(best, dtype=float)
+    m = np.asarray(mean, dtype=float)
+    max_gen = max(g[-1], 1)
+    max_fit = max(b.max(), 1)
+    px = area_x + (g / max_gen) * area_w
+    for fit, color, width in ((b, (0, 255, 0), 2), (m, (0, 100, 255), 1)):
+        pygame.draw.lines(renderer.screen, color, False,
+                          np.column_stack((px, (area_y + area_h) - (fit / max_fit) * area_h)).tolist(), width)
+
+def main():
+    parser = argparse.ArgumentParser(description="Série reduzida para os gráficos ao vivo.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000, 1000000])
+    parser.add_argument("--draw-sizes", type=int, nargs="+", default=[1000, 100000])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    if not os.environ.get("DISPLAY"):
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    rng = np.random.default_rng(args.seed)
+
+    ok = True
+    for total in (1, 7, 2048, 2049, 50000, 300001):
+        values = np.cumsum(rng.normal(0, 1, size=(total, 2)), axis=0)
+        series = DownsampledSeries(("best", "mean"), capacity=512)
+        series.extend(zip(range(total), values[:, 0], values[:, 1]))
+        for max_points in (1, 100, 400, 5000):
+            for window in (None, 10, 1000, 100000):
+                ok &= check(values, series, max_points, window)
+    print(f"baldes = mínimo/máximo dos pontos crus, janela coberta: {ok}")
+
+    print(f"\n{'gerações':>9}  {'append µs':>9}  {'view ms':>7}  {'memória':>8}")
+    for total in args.sizes:
+        values = rng.normal(0, 1, size=(total, 2))
+        series = DownsampledSeries(("best", "mean"))
+        start = time.perf_counter()
+        series.extend(zip(range(total), values[:, 0].tolist(), values[:, 1].tolist()))
+        append = (time.perf_counter() - start) / total
+        view = timed(lambda: series.view(400))
+        nbytes = series._lo.nbytes + series._hi.nbytes + series._first.nbytes + series._last.nbytes
+        print(f"{total:>9}  {append * 1e6:>9.2f}  {view * 1000:>7.3f}  {nbytes / 2**20:>6.1f} MiB")
+
+    import pygame
+    import matplotlib
+    matplotlib.use("Agg")
+    from snake_ai.visualization.dashboard import DashboardRenderer
+    from snake_ai.visualization.plots import LivePlotter
+    env_config = {"width": 10, "height": 10, "initial_energy": 100, "grow_on_eat": True}
+    print(f"\n{'gerações':>9}  {'dashboard antes':>15}  {'depois':>7}  {'LivePlotter antes':>17}  {'depois':>7}  (ms por atualização)")
+    for total in args.draw_sizes:
+        values = np.cumsum(rng.normal(0, 1, size=(total, 2)), axis=0)
+        gens, best, mean = list(range(total)), values[:, 0].tolist(), values[:, 1].tolist()
+        renderer = DashboardRenderer(env_config, [8, 16, 12, 3])
+        renderer.history.extend(zip(gens, best, mean))
+        full_draw = timed(lambda: draw_full(renderer, gens, best, mean))
+        series_draw = timed(renderer._draw_graph)
+        renderer.close()
+
+        plotter = LivePlotter()
+        plotter.history.extend(zip(gens[:-1], best[:-1], mean[:-1]))
+        series_plot = timed(lambda: plotter.update(gens[-1], best[-1], mean[-1]), 3)
+        # Antes: set_data com as listas completas
+        def full_plot():
+            plotter.line_best.set_data(gens, best)
+            plotter.line_mean.set_data(gens, mean)
+            plotter.ax.relim()
+            plotter.ax.autoscale_view()
+            plotter.fig.canvas.draw()
+        full_plot_time = timed(full_plot, 3)
+        plotter.close()
+        print(f"{total:>9}  {full_draw * 1000:>15.2f}  {series_draw * 1000:>7.2f}  "
+              f"{full_plot_time * 1000:>17.1f}  {series_plot * 1000:>7.1f}")
+
+    print("OK" if ok else "FALHOU")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,165 @@
+"""
+Snapshots do tabuleiro: matplotlib (implementação anterior) contra o rasterizador
+NumPy + PNG, e o custo que fica no loop de treinamento com o `SnapshotWriter`.
+
+1. Confere o PNG escrito: decodificado (zlib, filtro 0), a imagem é a montagem
+   rasterizada, e cada quadro tem a cor certa em cada célula da trajetória.
+2. Confere o APNG (número de quadros, tamanho) com o Pillow, se instalado.
+3. Tempo por snapshot: matplotlib, rasterizar + PNG, APNG do episódio inteiro e
+   o enfileiramento no `SnapshotWriter`.
+
+Uso: python -m benchmarks.bench_snapshots [--size 10] [--repeat 5]
+"""
+import argparse
+import os
+import struct
+import tempfile
+import time
+import zlib
+import numpy as np
+
+from snake_ai.agents.neural_net import NeuralNetwork
+from snake_ai.env.trajectory import replay
+from snake_ai.training.evaluation import record_episode
+from snake_ai.visualization.board_snapshots import (
+    PALETTE, SnapshotWriter, rasterize, montage, save_trajectory_snapshot, save_trajectory_animation,
+)
+
+def matplotlib_snapshot(trajectory, output_path: str, frames: int = 16) -> None:
+    """O snapshot de antes: grid float por quadro e subplots com imshow."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from matplotlib.colors import ListedColormap
+    states = []
+    for env in replay(trajectory):
+        if env.done or len(states) >= frames:
+            break
+        grid = np.zeros((env.height, env.width))
+        for (x, y) in env.snake:
+            grid[y, x] = 1
+        hx, hy = env.snake[0]
+        grid[hy, hx] = 2
+        ax, ay = env.apple
+        grid[ay, ax] = 3
+        states.append(grid)
+    side = int(np.ceil(np.sqrt(len(states))))
+    fig, axes = plt.subplots(side, side, figsize=(10, 10), squeeze=False)
+    cmap = ListedColormap(["black", "green", "#00FF00", "red"])
+    for i, ax in enumerate(axes.flat):
+        if i < len(states):
+            ax.imshow(states[i], cmap=cmap, vmin=0, vmax=3)
+        ax.axis("off")
+    plt.tight_layout()
+    plt.savefig(output_path)
+    plt.close()
+
+def decode_png(path: str) -> np.ndarray:
+    """Decodifica os PNGs RGB de 8 bits com filtro 0 que `snake_ai.utils.png` escreve."""
+    with open(path, "rb") as f:
+        data = f.read()
+    pos, idat, size = 8, b"", None
+    while pos < len(data):
+        length, kind = struct.unpack(">I4s", data[pos:pos + 8])
+        body = data[pos + 8:pos + 8 + length]
+        if struct.unpack(">I", data[pos + 8 + length:pos + 12 + length])[0] != zlib.crc32(kind + body):
+            raise ValueError(f"CRC errado no chunk {kind}")
+        if kind == b"IHDR":
+            size = struct.unpack(">II", body[:8])
+        elif kind == b"IDAT":
+            idat += body
+        pos += 12 + length
+    width, height = size
+    raw = np.frombuffer(zlib.decompress(idat), dtype=np.uint8).reshape(height, width * 3 + 1)
+    assert not raw[:, 0].any()
+    return raw[:, 1:].reshape(height, width, 3)
+
+def frames_match(trajectory, codes) -> bool:
+    """Cada quadro rasterizado bate com o estado reproduzido célula a célula."""
+    for codes_frame, env in zip(codes, replay(trajectory)):
+        expected = np.zeros((env.height, env.width), dtype=np.uint8)
+        for (x, y) in env.snake:
+            expected[y, x] = 1
+        expected[env.snake[0][1], env.snake[0][0]] = 2
+        expected[env.apple[1], env.apple[0]] = 3
+        if not np.array_equal(codes_frame, expected):
+            return False
+    return True
+
+def timed(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="Snapshots: matplotlib contra NumPy + PNG.")
+    parser.add_argument("--size", type=int, default=10)
+    parser.add_argument("--candidates", type=int, default=200, help="Genomas sorteados para achar um episódio longo")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    layer_sizes = [8, 16, 12, 3]
+    nn = NeuralNetwork(layer_sizes)
+    rng = np.random.default_rng(args.seed)
+    env_config = {"width": args.size, "height": args.size, "initial_energy": args.size * args.size, "grow_on_eat": True}
+    trajectories = [record_episode(rng.normal(0, 1, size=len(nn.get_weights_flat())), nn, env_config, seed=args.seed)
+                    for _ in range(args.candidates)]
+    trajectory = max(trajectories, key=len)
+    print(f"episódio: {len(trajectory)} passos, ciclo {trajectory.cycle}")
+
+    ok = True
+    with tempfile.TemporaryDirectory() as tmp:
+        png_path = os.path.join(tmp, "snap.png")
+        apng_path = os.path.join(tmp, "episode.png")
+        mpl_path = os.path.join(tmp, "mpl.png")
+
+        save_trajectory_snapshot(trajectory, png_path)
+        codes = rasterize(trajectory, 16)
+        same_image = np.array_equal(decode_png(png_path), montage(codes))
+        same_frames = frames_match(trajectory, codes)
+        ok &= same_image and same_frames
+        print(f"PNG decodificado = montagem: {same_image}; quadros = estados reproduzidos: {same_frames}")
+
+        save_trajectory_animation(trajectory, apng_path)
+        try:
+            from PIL import Image
+        except ImportError:
+            print("Pillow não instalado: APNG não conferido")
+        else:
+            with Image.open(apng_path) as image:
+                expected = len(rasterize(trajectory, stride=max(1, -(-len(trajectory) // 600))))
+                count = getattr(image, "n_frames", 1)
+                image.seek(count - 1)
+                last = np.asarray(image.convert("RGB"))
+                colors = {tuple(c) for c in last.reshape(-1, 3)} <= {tuple(c) for c in PALETTE}
+                ok &= count == expected and colors
+                print(f"APNG: {count} quadros (esperado {expected}), {image.size[0]}x{image.size[1]}, "
+                      f"cores da paleta: {colors}, {os.path.getsize(apng_path) / 1024:.1f} KiB")
+
+        mpl_time = timed(lambda: matplotlib_snapshot(trajectory, mpl_path), args.repeat)
+        png_time = timed(lambda: save_trajectory_snapshot(trajectory, png_path), args.repeat)
+        apng_time = timed(lambda: save_trajectory_animation(trajectory, apng_path), args.repeat)
+        writer = SnapshotWriter()
+        enqueue = []
+        for i in range(args.repeat):
+            start = time.perf_counter()
+            writer.submit(trajectory, os.path.join(tmp, f"bg_{i}.png"))
+            writer.submit_animation(trajectory, os.path.join(tmp, f"bg_{i}_episode.png"))
+            enqueue.append(time.perf_counter() - start)
+            time.sleep(apng_time + png_time)
+        writer.close()
+
+        print(f"\nmatplotlib:        {mpl_time * 1000:8.1f} ms ({os.path.getsize(mpl_path) / 1024:.1f} KiB)")
+        print(f"NumPy + PNG:       {png_time * 1000:8.1f} ms ({os.path.getsize(png_path) / 1024:.1f} KiB)  "
+              f"{mpl_time / png_time:.0f}x")
+        print(f"APNG do episódio:  {apng_time * 1000:8.1f} ms")
+        print(f"no loop (enfileirar PNG + APNG): {min(enqueue) * 1e6:.0f} µs")
+    print("OK" if ok else "FALHOU")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    raise SystemExit(main())
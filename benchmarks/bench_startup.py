@@ -0,0 +1,96 @@
+"""
+Tempo de importação dos pontos de entrada e módulos carregados por eles.
+
+Cada módulo é importado em um interpretador novo, medindo o tempo do import e
+listando as bibliotecas pesadas/gráficas (pygame, matplotlib, pandas, tkinter,
+tqdm, numba) carregadas só por importar. Também sobe um EvaluationExecutor em
+modo de processos e lista os módulos do snake_ai que um worker carregou.
+
+Os módulos permitidos são verificados em tests/test_startup.py (python -m pytest).
+O orçamento de tempo depende da máquina e fica só aqui: vale a menor de
+`--repeat` medições, e o código de saída é 1 se algum import passar de
+`--budget-ms` (ou carregar uma biblioteca pesada).
+
+Uso: python -m benchmarks.bench_startup [--budget-ms 400] [--repeat 3]
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+ENTRY_POINTS = [
+    "main_train",
+    "play_best",
+    "snake_ai.train",
+    "snake_ai.training.trainer",
+    "snake_ai.training.executor",
+]
+
+FORBIDDEN = ("pygame", "matplotlib", "pandas", "tkinter", "tqdm", "numba")
+
+_IMPORT_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"elapsed": elapsed, "modules": sorted(sys.modules)}}))
+"""
+
+def measure_import(module: str) -> tuple[float, list[str]]:
+    """(segundos do import, módulos carregados) em um interpretador novo."""
+    out = subprocess.run([sys.executable, "-c", _IMPORT_PROBE.format(module=module)],
+                         capture_output=True, text=True, check=True).stdout
+    result = json.loads(out.strip().splitlines()[-1])
+    return result["elapsed"], result["modules"]
+
+def heavy_modules(modules: list[str]) -> list[str]:
+    return sorted({m.split(".")[0] for m in modules if m.split(".")[0] in FORBIDDEN})
+
+def worker_modules() -> list[str]:
+    """Módulos carregados por um worker do EvaluationExecutor (modo de processos, backend serial)."""
+    import numpy as np
+    from snake_ai.agents.neural_net import NeuralNetwork
+    from snake_ai.training.executor import EvaluationExecutor
+
+    layer_sizes = [8, 16, 12, 3]
+    genome_size = len(NeuralNetwork(layer_sizes).get_weights_flat())
+    population = [np.zeros(genome_size) for _ in range(4)]
+    env_config = {"width": 6, "height": 6, "initial_energy": 36, "grow_on_eat": True}
+    with EvaluationExecutor(env_config, layer_sizes, len(population), num_episodes=1,
+                            mode="process", num_workers=1, backend="serial", detect_cycles=False) as executor:
+        executor.evaluate(population, seeds=[0])
+        return executor._pool.apply(_loaded_modules)
+
+def _loaded_modules() -> list[str]:
+    return sorted(sys.modules)
+
+def main():
+    parser = argparse.ArgumentParser(description="Tempo de importação dos pontos de entrada.")
+    parser.add_argument("--budget-ms", type=float, default=400.0, help="Marca os imports acima deste tempo")
+    parser.add_argument("--repeat", type=int, default=3, help="Medições por módulo (vale a menor)")
+    args = parser.parse_args()
+
+    ok = True
+    print(f"{'módulo':<28} {'import':>9}  pesados")
+    for module in ENTRY_POINTS:
+        timings = []
+        for _ in range(args.repeat):
+            elapsed, modules = measure_import(module)
+            timings.append(elapsed)
+        best = min(timings) * 1000
+        heavy = heavy_modules(modules)
+        over = best > args.budget_ms
+        ok &= not over and not heavy
+        print(f"{module:<28} {best:7.1f}ms  {', '.join(heavy) or '-'}{'  (acima do orçamento)' if over else ''}")
+
+    modules = worker_modules()
+    ours = [m for m in modules if m.startswith("snake_ai")]
+    print(f"\nworker (backend serial): {len(ours)} módulos do snake_ai")
+    for module in ours:
+        print(f"  {module}")
+    print(f"  pesados: {', '.join(heavy_modules(modules)) or '-'}")
+    print("OK" if ok else "FALHOU")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,119 @@
+"""
+Trajetórias gravadas pela avaliação: fidelidade da reprodução, custo de gravar e
+de reproduzir.
+
+1. `evaluate_population(..., record=True)` grava o episódio 0 de cada genoma em
+   cada backend, com e sem detecção de ciclos. A reprodução (sem a rede, maçãs
+   gravadas) tem que chegar ao mesmo score, duração, tamanho e motivo de término
+   que o episódio jogado com a rede (`record_episode` sem detecção de ciclos), ao
+   motivo do episódio 0 dos stats da avaliação, e as maçãs gravadas têm que ser
+   as que um `SnakeEnv` com a mesma seed sortearia.
+2. Custo de gravar: a avaliação com e sem `record`.
+3. Custo por quadro de reproduzir contra simular de novo (encode + forward + step),
+   e o tamanho das trajetórias.
+
+Uso: python -m benchmarks.bench_trajectory [--population 150] [--size 10]
+"""
+import argparse
+import time
+import numpy as np
+
+from snake_ai.agents.neural_net import NeuralNetwork
+from snake_ai.env.snake_env import SnakeEnv, REASON_CODES
+from snake_ai.env.state_encoding import encode_state
+from snake_ai.env.trajectory import ReplayEnv, replay
+from snake_ai.training.evaluation import evaluate_population, record_episode, EVAL_BACKENDS
+
+def replay_result(trajectory) -> tuple[int, int, int, int]:
+    """(score, passos, tamanho final, motivo) reproduzindo a trajetória."""
+    env = ReplayEnv(trajectory)
+    reason = None
+    for action in trajectory.iter_actions():
+        _, _, done, info = env.step(action)
+        if done:
+            reason = info.get("reason")
+    return env.score, env.steps, len(env.snake), REASON_CODES[reason]
+
+def seeded_apples_match(trajectory) -> bool:
+    """As maçãs gravadas são as que o SnakeEnv com a mesma seed sorteia com as mesmas ações."""
+    env = SnakeEnv(**trajectory.env_config, seed=trajectory.seed)
+    apples = [env.apple[1] * env.width + env.apple[0]]
+    for action in trajectory.iter_actions():
+        score = env.score
+        env.step(action)
+        if env.score != score and not env.done:
+            apples.append(env.apple[1] * env.width + env.apple[0])
+    return apples == trajectory.apples.tolist()
+
+def timed(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="Gravação e reprodução de trajetórias.")
+    parser.add_argument("--population", type=int, default=150)
+    parser.add_argument("--size", type=int, default=10)
+    parser.add_argument("--episodes", type=int, default=3)
+    parser.add_argument("--max-steps", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    layer_sizes = [8, 16, 12, 3]
+    nn = NeuralNetwork(layer_sizes)
+    rng = np.random.default_rng(args.seed)
+    population = rng.normal(0, 1, size=(args.population, len(nn.get_weights_flat())))
+    env_config = {"width": args.size, "height": args.size, "initial_energy": args.size * args.size, "grow_on_eat": True}
+    seeds = rng.integers(2**31 - 1, size=args.episodes).tolist()
+
+    # Referência: o episódio 0 jogado até o fim com a rede
+    reference = np.array([replay_result(record_episode(genome, nn, env_config, seeds[0], args.max_steps,
+                                                       detect_cycles=False)) for genome in population])
+
+    ok = True
+    print(f"{'backend':>10}  {'ciclos':>6}  {'reprodução = jogo':>17}  {'maçãs da seed':>13}  "
+          f"{'sem gravar':>10}  {'gravando':>8}  custo")
+    for backend in EVAL_BACKENDS:
+        for detect_cycles in (False, True):
+            def run(record):
+                return evaluate_population(population, nn, env_config, args.episodes, backend=backend, seeds=seeds,
+                                           max_steps=args.max_steps, detect_cycles=detect_cycles, record=record)
+            fitness, stats = run(False)
+            recorded_fitness, recorded = run(True)
+            trajectories = recorded["trajectory"]
+            results = np.array([replay_result(t) for t in trajectories])
+            same = (np.array_equal(results, reference) and np.array_equal(results[:, 3], recorded["reason"])
+                    and np.array_equal(fitness, recorded_fitness))
+            apples = all(seeded_apples_match(t) for t in trajectories)
+            plain, recording = timed(lambda: run(False)), timed(lambda: run(True))
+            ok &= same and apples
+            print(f"{backend:>10}  {str(detect_cycles):>6}  {str(same):>17}  {str(apples):>13}  "
+                  f"{plain * 1000:>8.1f}ms  {recording * 1000:>6.1f}ms  {recording / plain - 1:+.1%}")
+
+    frames = int(sum(len(t) for t in trajectories))
+    start = time.perf_counter()
+    for t in trajectories:
+        for _ in replay(t):
+            pass
+    replay_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for genome in population:
+        nn.set_weights_flat(genome)
+        env = SnakeEnv(**env_config, seed=seeds[0])
+        done = False
+        while not done and env.steps < args.max_steps:
+            _, _, done, _ = env.step(int(np.argmax(nn.forward(encode_state(env)))))
+    simulate_time = time.perf_counter() - start
+    print(f"\npor quadro: reproduzir {replay_time / frames * 1e6:.1f} µs, simular {simulate_time / frames * 1e6:.1f} µs "
+          f"({frames} quadros)")
+
+    nbytes = np.mean([t.nbytes for t in trajectories])
+    print(f"tamanho médio: {nbytes:.0f} bytes por trajetória (genoma: {population[0].nbytes} bytes)")
+    print("OK" if ok else "FALHOU")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    raise SystemExit(main())
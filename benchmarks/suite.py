@@ -0,0 +1,345 @@
+"""
+Suíte de benchmarks com baselines em JSON.
+
+Micro-benchmarks (custo por operação): step do SnakeEnv e do VecSnakeEnv,
+encode_state e VecSnakeEnv.encode, forward da NeuralNetwork e da
+PopulationNetwork, mutação, crossovers e GeneticAlgorithm.evolve. Macro-
+benchmarks: uma geração completa do Trainer (avaliação, registro e evolução) com
+população 150/1000/10000 em tabuleiros 10x10 e 30x30.
+
+Tudo roda com seeds fixas: cada repetição refaz o mesmo trabalho. Cada benchmark
+descarta uma repetição de aquecimento (compilação do Numba, caches) e guarda a
+mediana e o mínimo do tempo por operação das seguintes.
+
+    python -m benchmarks.suite list
+    python -m benchmarks.suite run --save benchmarks/baselines/baseline.json
+    python -m benchmarks.suite run --only "generation_150_*" --quick
+    python -m benchmarks.suite compare benchmarks/baselines/baseline.json
+    python -m benchmarks.suite compare antes.json depois.json --tolerance 0.15
+
+`compare` mede de novo os benchmarks do baseline (ou lê um segundo JSON) e sai
+com código 1 se algum ficou mais lento que baseline * (1 + tolerância). Por
+padrão compara o mínimo das repetições, menos sensível a outros processos da
+máquina que a mediana (`--stat median`).
+"""
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+
+from snake_ai.agents.genetic_algorithm import GeneticAlgorithm
+from snake_ai.agents.genome import mutate_genome, crossover_uniform, crossover_single_point
+from snake_ai.agents.neural_net import NeuralNetwork, PopulationNetwork
+from snake_ai.env.snake_env import SnakeEnv
+from snake_ai.env.state_encoding import encode_state
+from snake_ai.env.vec_env import VecSnakeEnv, HAS_NUMBA
+from snake_ai.training.trainer import Trainer
+from .bench_encode import collect_states
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+LAYER_SIZES = [8, 16, 12, 3]
+SEED = 0
+
+# nome -> (função(repetições) -> lista de segundos por operação, unidade, macro?)
+BENCHMARKS = {}
+
+def benchmark(name: str, unit: str, macro: bool = False):
+    def register(fn):
+        BENCHMARKS[name] = (fn, unit, macro)
+        return fn
+    return register
+
+def seed_all(seed: int = SEED) -> None:
+    np.random.seed(seed)
+    random.seed(seed)
+
+def time_calls(run, repeats: int) -> list[float]:
+    """Chama `run()` (que retorna quantas operações fez) repeats + 1 vezes; descarta a primeira."""
+    times = []
+    for _ in range(repeats + 1):
+        seed_all()
+        start = time.perf_counter()
+        ops = run()
+        times.append((time.perf_counter() - start) / ops)
+    return times[1:]
+
+def genome_size() -> int:
+    return len(NeuralNetwork(LAYER_SIZES).get_weights_flat())
+
+# --- Micro-benchmarks ---
+
+@benchmark("env_step", "passo")
+def bench_env_step(repeats: int) -> list[float]:
+    actions = np.random.default_rng(SEED).integers(0, 3, size=20000)
+    def run():
+        env = SnakeEnv(10, 10, seed=SEED)
+        for action in actions:
+            _, _, done, _ = env.step(action)
+            if done:
+                env.reset()
+        return len(actions)
+    return time_calls(run, repeats)
+
+@benchmark("vec_env_step", "passo de um jogo")
+def bench_vec_env_step(repeats: int) -> list[float]:
+    num_envs, num_steps = 1000, 50
+    actions = np.random.default_rng(SEED).integers(0, 3, size=(num_steps, num_envs))
+    def run():
+        venv = VecSnakeEnv(num_envs, 10, 10, seeds=list(range(num_envs)))
+        for step_actions in actions:
+            venv.step(step_actions)
+        return num_envs * num_steps
+    return time_calls(run, repeats)
+
+@benchmark("encode_state", "estado")
+def bench_encode_state(repeats: int) -> list[float]:
+    states = collect_states(10, 10, 2000, seed=SEED)
+    def run():
+        for env in states:
+            encode_state(env)
+        return len(states)
+    return time_calls(run, repeats)
+
+@benchmark("vec_encode", "estado")
+def bench_vec_encode(repeats: int) -> list[float]:
+    num_envs = 1000
+    venv = VecSnakeEnv(num_envs, 10, 10, auto_reset=True, seeds=list(range(num_envs)))
+    actions = np.random.default_rng(SEED).integers(0, 3, size=(20, num_envs))
+    for step_actions in actions:
+        venv.step(step_actions)
+    def run():
+        for _ in range(10):
+            venv.encode()
+        return 10 * num_envs
+    return time_calls(run, repeats)
+
+@benchmark("nn_forward", "forward")
+def bench_nn_forward(repeats: int) -> list[float]:
+    nn = NeuralNetwork(LAYER_SIZES)
+    nn.set_weights_flat(np.random.default_rng(SEED).normal(size=genome_size()))
+    inputs = np.random.default_rng(SEED + 1).random((5000, LAYER_SIZES[0])).astype(np.float32)
+    def run():
+        for x in inputs:
+            nn.forward(x)
+        return len(inputs)
+    return time_calls(run, repeats)
+
+@benchmark("population_forward", "forward de um jogo")
+def bench_population_forward(repeats: int) -> list[float]:
+    pop_size, episodes = 1000, 3
+    net = PopulationNetwork(LAYER_SIZES, np.random.default_rng(SEED).normal(size=(pop_size, genome_size())))
+    states = np.random.default_rng(SEED + 1).random((pop_size, episodes, LAYER_SIZES[0])).astype(np.float32)
+    def run():
+        for _ in range(20):
+            net.forward(states)
+        return 20 * pop_size * episodes
+    return time_calls(run, repeats)
+
+@benchmark("mutate", "genoma")
+def bench_mutate(repeats: int) -> list[float]:
+    genomes = np.random.default_rng(SEED).normal(size=(2000, genome_size()))
+    def run():
+        for genome in genomes:
+            mutate_genome(genome, 0.1, 0.2)
+        return len(genomes)
+    return time_calls(run, repeats)
+
+@benchmark("crossover_uniform", "par de filhos")
+def bench_crossover_uniform(repeats: int) -> list[float]:
+    genomes = np.random.default_rng(SEED).normal(size=(2000, genome_size()))
+    def run():
+        for a, b in zip(genomes[::2], genomes[1::2]):
+            crossover_uniform(a, b)
+        return len(genomes) // 2
+    return time_calls(run, repeats)
+
+@benchmark("crossover_single_point", "par de filhos")
+def bench_crossover_single_point(repeats: int) -> list[float]:
+    genomes = np.random.default_rng(SEED).normal(size=(2000, genome_size()))
+    def run():
+        for a, b in zip(genomes[::2], genomes[1::2]):
+            crossover_single_point(a, b)
+        return len(genomes) // 2
+    return time_calls(run, repeats)
+
+def _bench_evolve(pop_size: int, repeats: int) -> list[float]:
+    fitness = np.random.default_rng(SEED).gamma(2.0, 50.0, size=pop_size)
+    def run():
+        ga = GeneticAlgorithm(pop_size, genome_size(), elitism=max(2, pop_size // 20),
+                              mutation_rate=0.1, mutation_std=0.2)
+        start = time.perf_counter()
+        ga.evolve(fitness)
+        return time.perf_counter() - start
+    times = []
+    for _ in range(repeats + 1):
+        seed_all()
+        times.append(run())
+    return times[1:]
+
+@benchmark("evolve_150", "geração")
+def bench_evolve_150(repeats: int) -> list[float]:
+    return _bench_evolve(150, repeats)
+
+@benchmark("evolve_1000", "geração")
+def bench_evolve_1000(repeats: int) -> list[float]:
+    return _bench_evolve(1000, repeats)
+
+@benchmark("evolve_100000", "geração")
+def bench_evolve_100000(repeats: int) -> list[float]:
+    return _bench_evolve(100000, repeats)
+
+# --- Macro-benchmarks: uma geração completa do Trainer ---
+
+def _bench_generation(pop_size: int, size: int, repeats: int) -> list[float]:
+    times = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for _ in range(repeats + 1):
+            config = {"width": size, "height": size, "population_size": pop_size, "generations": 1,
+                      "seed": SEED, "checkpoint_interval": 0, "genome_archive": False,
+                      "run_name": "suite", "models_dir": tmp, "logs_dir": tmp}
+            seed_all()
+            with Trainer(config) as trainer:
+                start = time.perf_counter()
+                trainer.run()
+                times.append(time.perf_counter() - start)
+            # Cada repetição começa de um histórico vazio
+            for root, dirs, files in os.walk(tmp, topdown=False):
+                for name in files:
+                    os.unlink(os.path.join(root, name))
+                for name in dirs:
+                    os.rmdir(os.path.join(root, name))
+    return times[1:]
+
+for _pop in (150, 1000, 10000):
+    for _size in (10, 30):
+        benchmark(f"generation_{_pop}_{_size}x{_size}", "geração", macro=True)(
+            lambda repeats, pop=_pop, size=_size: _bench_generation(pop, size, repeats))
+
+# --- Execução, gravação e comparação ---
+
+def machine_info() -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(BASELINE_DIR), timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "numba": HAS_NUMBA,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "commit": commit,
+        "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+def select(patterns: list[str] | None, quick: bool) -> list[str]:
+    names = [name for name in BENCHMARKS if not patterns or any(fnmatch.fnmatch(name, p) for p in patterns)]
+    if quick:
+        # Sem as gerações de população 10000 (dezenas de segundos por repetição)
+        names = [name for name in names if not name.startswith("generation_10000_")]
+    return names
+
+def run_suite(names: list[str], repeats: int, macro_repeats: int) -> dict:
+    results = {}
+    for name in names:
+        fn, unit, macro = BENCHMARKS[name]
+        times = fn(macro_repeats if macro else repeats)
+        median = float(np.median(times))
+        results[name] = {"unit": unit, "median_s": median, "min_s": float(np.min(times)),
+                         "repeats": len(times), "per_s": 1.0 / median}
+        print(f"{name:>28}  {format_time(median):>10}/{unit:<18} (mín {format_time(min(times))})",
+              file=sys.stderr, flush=True)
+    return {"meta": machine_info(), "results": results}
+
+def format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.1f} ns"
+
+def compare(baseline: dict, current: dict, tolerance: float, stat: str = "min") -> list[str]:
+    """Imprime a comparação (`stat`: "min" ou "median") e retorna os nomes mais lentos que a tolerância."""
+    key = f"{stat}_s"
+    for field in ("numba", "machine", "cpu_count", "numpy"):
+        if baseline["meta"].get(field) != current["meta"].get(field):
+            print(f"aviso: {field} difere ({baseline['meta'].get(field)} -> {current['meta'].get(field)})")
+    regressions = []
+    print(f"{'benchmark':>28}  {'baseline':>10}  {'atual':>10}  {'variação':>8}")
+    for name, base in baseline["results"].items():
+        if name not in current["results"]:
+            continue
+        now = current["results"][name]
+        change = now[key] / base[key] - 1
+        if change > tolerance:
+            regressions.append(name)
+            flag = "REGRESSÃO"
+        elif change < -tolerance:
+            flag = "melhora"
+        else:
+            flag = ""
+        print(f"{name:>28}  {format_time(base[key]):>10}  {format_time(now[key]):>10}  "
+              f"{change:>+8.1%}  {flag}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Suíte de benchmarks com baselines em JSON.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="Lista os benchmarks")
+    run = commands.add_parser("run", help="Roda a suíte e imprime (ou grava) o JSON")
+    cmp = commands.add_parser("compare", help="Compara com um baseline (medindo de novo ou lendo outro JSON)")
+    for sub in (run, cmp):
+        sub.add_argument("--only", nargs="+", help="Padrões de nome (fnmatch), ex.: 'env_*' 'generation_150_*'")
+        sub.add_argument("--quick", action="store_true", help="Pula as gerações de população 10000")
+        sub.add_argument("--repeats", type=int, default=7)
+        sub.add_argument("--macro-repeats", type=int, default=5)
+    run.add_argument("--save", help="Arquivo JSON de saída (padrão: stdout)")
+    cmp.add_argument("baseline")
+    cmp.add_argument("current", nargs="?", help="JSON já medido (padrão: mede agora)")
+    cmp.add_argument("--tolerance", type=float, default=0.10, help="Variação aceita (0.10 = 10%%)")
+    cmp.add_argument("--stat", choices=("min", "median"), default="min")
+    cmp.add_argument("--save", help="Grava a medição atual neste JSON")
+    args = parser.parse_args()
+
+    if args.command == "list":
+        for name, (_, unit, macro) in BENCHMARKS.items():
+            print(f"{name:>28}  {'macro' if macro else 'micro'}  por {unit}")
+        return
+
+    if args.command == "run":
+        data = run_suite(select(args.only, args.quick), args.repeats, args.macro_repeats)
+    else:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if args.current:
+            with open(args.current) as f:
+                data = json.load(f)
+        else:
+            names = [name for name in select(args.only, args.quick) if name in baseline["results"]]
+            data = run_suite(names, args.repeats, args.macro_repeats)
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, "w") as f:
+            json.dump(data, f, indent=2)
+            f.write("\n")
+    elif args.command == "run":
+        print(json.dumps(data, indent=2))
+
+    if args.command == "compare":
+        regressions = compare(baseline, data, args.tolerance, args.stat)
+        if regressions:
+            print(f"\n{len(regressions)} regressão(ões) acima de {args.tolerance:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+        print(f"\nSem regressões acima de {args.tolerance:.0%}")
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,19 @@
+import sys
 import numpy as np
 import os
-import sys
-from tqdm import tqdm
-import time
+import signal
 
-from snake_ai.env.snake_env import SnakeEnv
-from snake_ai.agents.neural_net import NeuralNetwork
-from snake_ai.agents.genetic_algorithm import GeneticAlgorithm
-from snake_ai.training.evaluation import evaluate_genome
-from snake_ai.utils.logger import TrainingLogger
-from snake_ai.utils.paths import create_directories, MODELS_DIR, LOGS_DIR, PLOTS_DIR, SNAPSHOTS_DIR
-from snake_ai.visualization.plots import plot_training_curves
-from snake_ai.visualization.board_snapshots import save_generation_snapshot
-from snake_ai.visualization.dashboard import DashboardRenderer
-from snake_ai.utils.launcher import ConfigScreen
+from snake_ai.training.trainer import Trainer
+from snake_ai.utils import profiler
+from snake_ai.utils.paths import create_directories, PLOTS_DIR, SNAPSHOTS_DIR
+
+# Tk, tqdm, pygame e matplotlib são importados dentro de main(), só quando usados:
+# os workers do modo de processos reimportam este módulo e não devem carregá-los
 
 def main():
     # --- 1. Tela de Configuração ---
+    from snake_ai.utils.launcher import ConfigScreen
+    from tqdm import tqdm
     print("Abrindo tela de configuração...")
     launcher = ConfigScreen()
     user_config = launcher.show()
@@ -26,147 +23,105 @@ def main():
         sys.exit(0)
         
     # --- 2. Aplicar Configurações ---
-    ENV_CONFIG = {
-        "width": user_config["width"],
-        "height": user_config["height"],
-        "initial_energy": user_config["initial_energy"],
-        "grow_on_eat": user_config["grow_on_eat"]
-    }
-    
-    POPULATION_SIZE = user_config["population_size"]
-    GENERATIONS = user_config["generations"]
-    MUTATION_RATE = user_config["mutation_rate"]
-    
-    # Fixos ou derivados
-    ELITISM = max(2, int(POPULATION_SIZE * 0.05)) # 5% de elitismo
-    MUTATION_STD = 0.2
-    
-    # Arquitetura da MLP: Input=8 (Danger=3, Angle=1, Size=1, TailPath=3), Hidden=[16, 12], Output=3
-    LAYER_SIZES = [8, 16, 12, 3]
-    
-    EPISODES_PER_EVAL = 3
-    SNAPSHOT_INTERVAL = 50
+    # Visualização (o resto vai para o Trainer; parâmetros fixos vêm do DEFAULT_CONFIG)
+    LIVE_DASHBOARD = user_config.pop("live_dashboard")
+    VIEW_SPEED = user_config.pop("fps")
+    NUM_GAMES = user_config.pop("num_games", 9)  # Padrão 9 se não existir
     
-    # Visualização
-    LIVE_DASHBOARD = user_config["live_dashboard"]
-    VIEW_SPEED = user_config["fps"]
-    NUM_GAMES = user_config.get("num_games", 9)  # Padrão 9 se não existir
+    create_directories()
+    trainer = Trainer(user_config)
+    config = trainer.config
+    ENV_CONFIG = trainer.env_config
+    GENERATIONS = config["generations"]
+    SNAPSHOT_INTERVAL = config["snapshot_interval"]
     
     print("\n--- Configuração Iniciada ---")
     print(f"Gerações: {GENERATIONS}")
-    print(f"População: {POPULATION_SIZE}")
-    print(f"Crescer corpo: {user_config['grow_on_eat']}")
+    print(f"População: {config['population_size']}")
+    print(f"Crescer corpo: {config['grow_on_eat']}")
+    print(f"Backend de Avaliação: {config['eval_backend']}")
+    print(f"Execução: {config['executor_mode']} ({config['num_workers']} workers)")
+    print(f"Renovar Seeds a Cada: {config['seed_interval']} gerações")
+    print(f"Racing: {config['racing']} (orçamento: {config['step_budget'] or 'sem limite'})")
     print(f"Dashboard: {LIVE_DASHBOARD}")
     print(f"Jogos Visualizados: {NUM_GAMES}")
     print("-----------------------------\n")
+    print(f"Tamanho do Genoma (Weights + Biases): {trainer.genome_size}")
     
-    # --- Inicialização ---
-    create_directories()
-    
-    # Instância de Rede Neural usada para avaliação (pesos serão injetados)
-    nn = NeuralNetwork(LAYER_SIZES)
-    genome_size = len(nn.get_weights_flat())
-    print(f"Tamanho do Genoma (Weights + Biases): {genome_size}")
-    
-    ga = GeneticAlgorithm(
-        population_size=POPULATION_SIZE,
-        genome_size=genome_size,
-        elitism=ELITISM,
-        mutation_rate=MUTATION_RATE,
-        mutation_std=MUTATION_STD,
-        crossover_type="uniform"
-    )
-    
-    # Logger
-    timestamp = time.strftime("%Y%m%d-%H%M%S")
-    log_path = os.path.join(LOGS_DIR, f"training_{timestamp}.csv")
-    logger = TrainingLogger(log_path, ["generation", "best_fitness", "mean_fitness", "min_fitness"])
-    
-    best_overall_fitness = -float('inf')
-    best_overall_genome = None
-    
-    # Inicializar Dashboard
-    dashboard = None
+    # Dashboard em processo separado: nunca bloqueia o treinamento e pode ser
+    # aberto/fechado durante a execução (kill -USR1 <pid> alterna)
+    from snake_ai.visualization.dashboard_process import DashboardProcess
+    dashboard = DashboardProcess(ENV_CONFIG, config["layer_sizes"], caption="Treinamento Snake AI - Monitoramento em Tempo Real",
+                                 num_games=NUM_GAMES, speed=VIEW_SPEED)
     if LIVE_DASHBOARD:
         print("Inicializando Dashboard Interativo...")
-        dashboard = DashboardRenderer(ENV_CONFIG, LAYER_SIZES, caption="Treinamento Snake AI - Monitoramento em Tempo Real", num_games=NUM_GAMES)
+        dashboard.attach()
+    toggle_requested = []
+    if hasattr(signal, "SIGUSR1"):
+        signal.signal(signal.SIGUSR1, lambda signum, frame: toggle_requested.append(True))
+        print(f"Para abrir/fechar o dashboard durante o treinamento: kill -USR1 {os.getpid()}")
+    
+    from snake_ai.visualization.board_snapshots import SnapshotWriter
+    snapshots = SnapshotWriter()
     
     print(f"Iniciando treinamento por {GENERATIONS} gerações...")
+    progress = tqdm(total=GENERATIONS, desc="Generations")
+    
+    def on_generation(record, population, fitness_scores):
+        gen = record["generation"]
+        progress.update(1)
+        progress.set_postfix(
+            eval_s=f"{record['eval_s']:.2f}",
+            steps_per_s=f"{record['steps_per_s']:.0f}",
+            cache=f"{record['cache_hits']}/{record['cache_hits'] + record['cache_misses']}",
+            episodes=f"{record['mean_episodes']:.2f}",
+            saved=record["steps_saved"]
+        )
+        
+        # Ordenar para pegar os melhores
+        sorted_indices = np.argsort(fitness_scores)[::-1]
+        best_gen_genome = population[sorted_indices[0]]
+        
+        # Visualização Dashboard
+        if toggle_requested:
+            toggle_requested.clear()
+            dashboard.toggle()
+        if dashboard.closed_by_user():
+            print("\nVisualização fechada pelo usuário. O treinamento continua.")
+        with profiler.phase("dashboard"):
+            # Só enfileira o resumo e as trajetórias do episódio 0 gravadas durante
+            # a avaliação; nada é jogado de novo para o dashboard
+            trajectories = trainer.trajectories(sorted_indices[:NUM_GAMES], replay=False)
+            dashboard.submit(gen, record["best_fitness"], record["mean_fitness"], trajectories, best_gen_genome)
+        
+        # Snapshot Estático
+        if SNAPSHOT_INTERVAL and gen % SNAPSHOT_INTERVAL == 0:
+            # A imagem é montada e gravada na thread do SnapshotWriter
+            with profiler.phase("snapshot"):
+                best_trajectory = trainer.trajectories(sorted_indices[:1])[0]
+                snapshots.submit(best_trajectory, os.path.join(SNAPSHOTS_DIR, f"gen_{gen:04d}.png"))
+                if config["snapshot_animation"]:
+                    snapshots.submit_animation(best_trajectory, os.path.join(SNAPSHOTS_DIR, f"gen_{gen:04d}_episode.png"))
+        return False
     
     try:
-        for gen in tqdm(range(GENERATIONS), desc="Generations"):
-            population = ga.get_population()
-            fitness_scores = []
-            
-            # 1. Avaliação (Loop de treino)
-            for genome in population:
-                fit = evaluate_genome(genome, nn, ENV_CONFIG, num_episodes=EPISODES_PER_EVAL)
-                fitness_scores.append(fit)
-                
-            # Estatísticas
-            fitness_scores = np.array(fitness_scores)
-            best_fit = np.max(fitness_scores)
-            mean_fit = np.mean(fitness_scores)
-            min_fit = np.min(fitness_scores)
-            
-            # Ordenar para pegar os melhores
-            sorted_indices = np.argsort(fitness_scores)[::-1]
-            best_idx = sorted_indices[0]
-            best_gen_genome = population[best_idx]
-            
-            # Salvar melhor global
-            if best_fit > best_overall_fitness:
-                best_overall_fitness = best_fit
-                best_overall_genome = best_gen_genome.copy()
-                np.save(os.path.join(MODELS_DIR, "best_overall.npy"), best_overall_genome)
-                
-            np.save(os.path.join(MODELS_DIR, f"best_gen_{gen:04d}.npy"), best_gen_genome)
-            
-            logger.log({
-                "generation": gen,
-                "best_fitness": best_fit,
-                "mean_fitness": mean_fit,
-                "min_fitness": min_fit
-            })
-            
-            # 2. Visualização Dashboard
-            if dashboard:
-                # Atualizar dados do gráfico
-                dashboard.update_graph_data(gen, best_fit, mean_fit)
-                
-                # Selecionar genomas para exibir baseado na configuração
-                num_to_show = NUM_GAMES
-                top_indices = sorted_indices[:num_to_show]
-                top_genomes = [population[i] for i in top_indices]
-                
-                # Renderizar visualização paralela
-                nn.set_weights_flat(best_gen_genome) 
-                should_quit = dashboard.render_generation(top_genomes, nn, speed=VIEW_SPEED)
-                
-                if should_quit:
-                    print("\nVisualização fechada pelo usuário. Encerrando treinamento...")
-                    break
-            
-            # Snapshot Estático
-            if gen % SNAPSHOT_INTERVAL == 0:
-                snap_path = os.path.join(SNAPSHOTS_DIR, f"gen_{gen:04d}.png")
-                save_generation_snapshot(best_gen_genome, ENV_CONFIG, nn, snap_path)
-                
-            # 3. Evolução
-            ga.evolve(fitness_scores)
+        trainer.run(on_generation)
             
     except KeyboardInterrupt:
         print("\nTreinamento interrompido pelo usuário.")
         
     finally:
-        if dashboard:
-            dashboard.close()
-            
+        progress.close()
+        trainer.close()
+        dashboard.close()
+        snapshots.close()
+
         print("\nTreinamento concluído (ou encerrado)!")
-        print(f"Melhor Fitness Global: {best_overall_fitness:.2f}")
+        print(f"Melhor Fitness Global: {trainer.best_overall_fitness:.2f}")
         
-        plot_path = os.path.join(PLOTS_DIR, f"fitness_curve_{timestamp}.png")
-        plot_training_curves(log_path, plot_path)
+        from snake_ai.visualization.plots import plot_training_curves
+        plot_path = os.path.join(PLOTS_DIR, f"fitness_curve_{config['run_name']}.png")
+        plot_training_curves(trainer.history_path, plot_path)
         print(f"Gráfico final salvo em {plot_path}")
 
 if __name__ == "__main__":
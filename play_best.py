@@ -2,11 +2,13 @@ import numpy as np
 import os
 import argparse
 from snake_ai.agents.neural_net import NeuralNetwork
-from snake_ai.visualization.live_view import play_episode
+from snake_ai.utils.genome_archive import GenomeArchive
 
 def main():
     parser = argparse.ArgumentParser(description="Assistir ao melhor agente jogando Snake.")
-    parser.add_argument("--model", type=str, default="models/best_overall.npy", help="Caminho para o arquivo .npy do genoma.")
+    parser.add_argument("--model", type=str, default="models/best_overall.npy",
+                        help="Caminho para o .npy do genoma, um arquivo de genomas .gar ou uma trajetória gravada .traj.npz.")
+    parser.add_argument("--generation", type=int, default=None, help="Geração a carregar de um .gar (padrão: a de maior fitness).")
     parser.add_argument("--speed", type=int, default=10, help="Velocidade do jogo (FPS).")
     args = parser.parse_args()
     
@@ -16,10 +18,17 @@ def main():
         return
 
     print(f"Carregando modelo de {args.model}...")
-    genome = np.load(args.model)
+
+    if args.model.endswith(".traj.npz"):
+        # Episódio gravado no treinamento (o mesmo jogo da avaliação): só reproduz
+        from snake_ai.env.trajectory import Trajectory
+        trajectory = Trajectory.load(args.model)
+        print(f"Trajetória de {len(trajectory)} passos (seed {trajectory.seed})")
+        from snake_ai.visualization.live_view import play_trajectory
+        play_trajectory(trajectory, speed=args.speed)
+        return
     
-    # Deve corresponder à config usada no treinamento
-    # Idealmente salvar config junto com o modelo, mas vamos usar hardcoded por enquanto conforme o exercício
+    # Deve corresponder à config usada no treinamento (um .npy solto não guarda a config)
     ENV_CONFIG = {
         "width": 10,
         "height": 10,
@@ -27,9 +36,36 @@ def main():
     }
     
     LAYER_SIZES = [8, 16, 12, 3]
-    nn = NeuralNetwork(LAYER_SIZES)
+    
+    if args.model.endswith(".gar"):
+        # Arquivo de genomas: a config do treinamento vem nos metadados
+        with GenomeArchive(args.model) as archive:
+            generations = archive.generations
+            if len(generations) == 0:
+                print(f"Erro: Arquivo de genomas vazio em {args.model}")
+                return
+            if args.generation is None:
+                generation, fitness, genome = archive.best()
+            else:
+                try:
+                    generation, genome = args.generation, archive.get(args.generation)
+                except KeyError:
+                    print(f"Erro: Geração {args.generation} não encontrada em {args.model}")
+                    print(f"Gerações disponíveis: {generations.min()} a {generations.max()}")
+                    return
+                fitness = archive.fitness[generations == generation][-1]
+            ENV_CONFIG = archive.meta.get("env_config", ENV_CONFIG)
+            LAYER_SIZES = archive.meta.get("layer_sizes", LAYER_SIZES)
+        print(f"Geração {generation} (fitness {fitness:.2f})")
+    else:
+        genome = np.load(args.model)
+    
+    # Mesmo tipo do treinamento (float32 ou float64), para repetir as decisões da avaliação
+    nn = NeuralNetwork(LAYER_SIZES, genome.dtype.name)
     
     print("Iniciando visualização... (Pressione ESC ou feche a janela para sair)")
+    # pygame só é importado/inicializado depois de validar o modelo
+    from snake_ai.visualization.live_view import play_episode
     play_episode(genome, ENV_CONFIG, nn, speed=args.speed)
 
 if __name__ == "__main__":
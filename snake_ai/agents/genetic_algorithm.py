@@ -1,5 +1,9 @@
 import numpy as np
-from .genome import create_random_genome, mutate_genome, crossover_single_point, crossover_uniform
+from .genome import create_random_population, mutate_inplace
+from .neural_net import resolve_dtype
+
+# Genes por bloco de linhas no crossover (limita as cópias temporárias dos pais)
+CROSSOVER_BLOCK = 1 << 20
 
 class GeneticAlgorithm:
     def __init__(
@@ -9,7 +13,8 @@ class GeneticAlgorithm:
         elitism: int,
         mutation_rate: float,
         mutation_std: float,
-        crossover_type: str = "uniform"
+        crossover_type: str = "uniform",
+        dtype="float64"
     ):
         self.population_size = population_size
         self.genome_size = genome_size
@@ -17,68 +22,109 @@ class GeneticAlgorithm:
         self.mutation_rate = mutation_rate
         self.mutation_std = mutation_std
         self.crossover_type = crossover_type
+        self.dtype = resolve_dtype(dtype)
         
-        # População atual: lista de np.arrays
-        self.population = [create_random_genome(genome_size) for _ in range(population_size)]
+        # População atual: matriz (population_size, genome_size), um genoma por linha.
+        # A próxima geração é escrita em um segundo buffer e os dois se alternam,
+        # então uma população continua válida até a evolução seguinte à dela
+        self.population = create_random_population(population_size, genome_size, dtype=self.dtype)
+        self._next = None
         self.generation = 0
         self.best_genome = None
         self.best_fitness_history = []
 
-    def get_population(self) -> list[np.ndarray]:
+    def get_population(self) -> np.ndarray:
         return self.population
 
+    def selection_cutoffs(self, k: int = 3) -> list[int]:
+        """
+        Posições do ranking (0 = melhor) onde a seleção muda de comportamento:
+        - `elitism`: o primeiro genoma que não é copiado como elite;
+        - no torneio de tamanho k, a posição em que a chance de vencer um torneio
+          cai abaixo da média 1/P: k * (1 - q)^(k-1) = 1, q = 1 - (1/k)^(1/(k-1)).
+        Usado pela avaliação adaptativa para decidir quem precisa de mais episódios.
+        """
+        tournament_rank = int(round(self.population_size * (1 - (1 / k) ** (1 / (k - 1)))))
+        return sorted({self.elitism, tournament_rank})
+
     def evolve(self, fitness_scores: list[float]) -> None:
         """
         Evolui a população para a próxima geração baseada nos scores de fitness.
+        Seleção, crossover e mutação são feitos na matriz inteira (em blocos de
+        linhas), escrevendo direto no buffer da próxima geração.
         """
+        population = self.population
+        size = self.population_size
+        if self._next is None or self._next.shape != population.shape or self._next.dtype != population.dtype:
+            self._next = np.empty_like(population)
+        new_population = self._next
+
         # 1. Ordenar índices por fitness (decrescente)
         sorted_indices = np.argsort(fitness_scores)[::-1]
-        sorted_population = [self.population[i] for i in sorted_indices]
         
         # Salvar melhor da geração
-        self.best_genome = sorted_population[0].copy()
+        self.best_genome = population[sorted_indices[0]].copy()
         self.best_fitness_history.append(fitness_scores[sorted_indices[0]])
         
-        new_population = []
-        
         # 2. Elitismo: manter os k melhores
-        for i in range(self.elitism):
-            if i < len(sorted_population):
-                new_population.append(sorted_population[i].copy())
-                
-        # 3. Preencher o resto da população
-        # Usaremos seleção por torneio simples para escolher pais
-        while len(new_population) < self.population_size:
-            parent1 = self._tournament_selection(sorted_population, fitness_scores, sorted_indices)
-            parent2 = self._tournament_selection(sorted_population, fitness_scores, sorted_indices)
-            
-            # Crossover
-            if self.crossover_type == "uniform":
-                child1, child2 = crossover_uniform(parent1, parent2)
-            else:
-                child1, child2 = crossover_single_point(parent1, parent2)
-            
-            # Mutação
-            child1 = mutate_genome(child1, self.mutation_rate, self.mutation_std)
-            child2 = mutate_genome(child2, self.mutation_rate, self.mutation_std)
-            
-            new_population.append(child1)
-            if len(new_population) < self.population_size:
-                new_population.append(child2)
+        elites = min(self.elitism, size)
+        np.take(population, sorted_indices[:elites], axis=0, out=new_population[:elites], mode="clip")
         
-        self.population = new_population[:self.population_size]
+        # 3. Preencher o resto da população: pares de pais por torneio, o primeiro
+        # filho de cada par no bloco `first` e o segundo (sobra um se a conta for
+        # ímpar) no bloco `second`
+        children = size - elites
+        pairs = (children + 1) // 2
+        parent1 = sorted_indices[self._tournament_selection(pairs)]
+        parent2 = sorted_indices[self._tournament_selection(pairs)]
+        first = new_population[elites:elites + pairs]
+        second = new_population[elites + pairs:size]
+        # Os genes são combinados como inteiros do mesmo tamanho (os bits do float):
+        # com d = (pai2 - pai1) * troca, filho1 = pai1 + d e filho2 = pai2 - d são
+        # cópias exatas dos genes dos pais, sem os desvios de um np.where por gene
+        bits = np.dtype(f"i{population.itemsize}")
+        block = max(1, CROSSOVER_BLOCK // self.genome_size)
+        for start in range(0, pairs, block):
+            stop = min(start + block, pairs)
+            child1 = first[start:stop].view(bits)
+            child2 = second[start:stop].view(bits)
+            np.take(population, parent1[start:stop], axis=0, out=first[start:stop], mode="clip")
+            genes2 = np.take(population, parent2[start:stop], axis=0).view(bits)
+            delta = np.subtract(genes2, child1)
+            delta *= self._crossover_mask(stop - start)
+            np.subtract(genes2[:len(child2)], delta[:len(child2)], out=child2)
+            child1 += delta
+        
+        # Mutação (só nos genes sorteados)
+        mutate_inplace(new_population[elites:size], self.mutation_rate, self.mutation_std)
+        
+        self.population, self._next = new_population, population
         self.generation += 1
 
-    def _tournament_selection(self, sorted_pop, fitness_scores, sorted_indices, k=3):
-        """Seleciona um indivíduo via torneio."""
-        # Escolher k índices aleatórios da população
-        contestants_indices = np.random.choice(len(sorted_pop), k, replace=False)
-        
-        # Achar o melhor entre eles (que tem maior fitness)
-        # Precisamos mapear de volta para o fitness original
-        # Mas sorted_pop já está ordenado, então o menor índice em sorted_pop vence?
-        # contestants_indices são índices de sorted_pop (0 = melhor global).
-        # Então basta pegar o menor valor numérico de índice.
-        best_idx = np.min(contestants_indices)
-        return sorted_pop[best_idx]
+    def _crossover_mask(self, pairs: int) -> np.ndarray:
+        """Genes que o primeiro filho de cada par recebe do segundo pai (o segundo filho, do primeiro)."""
+        if self.crossover_type == "uniform":
+            # Um bit aleatório por gene: 8 genes por byte sorteado
+            packed = np.frombuffer(np.random.bytes(pairs * ((self.genome_size + 7) // 8)), dtype=np.uint8)
+            bits = np.unpackbits(packed.reshape(pairs, -1), axis=1, count=self.genome_size)
+            return bits.view(bool)
+        # Ponto único: do ponto de corte em diante
+        points = np.random.randint(1, self.genome_size - 1, size=pairs)
+        return np.arange(self.genome_size) >= points[:, None]
 
+    def _tournament_selection(self, count: int, k: int = 3) -> np.ndarray:
+        """
+        Posições no ranking (0 = melhor) dos vencedores de `count` torneios de `k`
+        competidores distintos: o vencedor é o de melhor posição.
+        """
+        size = self.population_size
+        # Sorteio sem reposição por torneio: o j-ésimo competidor é sorteado entre
+        # size - j posições e pula as já sorteadas (percorridas em ordem crescente)
+        contestants = np.empty((count, k), dtype=np.int64)
+        for j in range(k):
+            pick = np.random.randint(0, size - j, size=count)
+            taken = np.sort(contestants[:, :j], axis=1)
+            for column in range(j):
+                pick += pick >= taken[:, column]
+            contestants[:, j] = pick
+        return contestants.min(axis=1)
@@ -1,26 +1,56 @@
 import numpy as np
 
-def create_random_genome(size: int, scale: float = 0.1) -> np.ndarray:
+def create_random_genome(size: int, scale: float = 0.1, dtype="float64") -> np.ndarray:
     """Cria um genoma aleatório com distribuição normal."""
-    return np.random.randn(size) * scale
+    return (np.random.randn(size) * scale).astype(dtype, copy=False)
+
+def create_random_population(population_size: int, genome_size: int, scale: float = 0.1, dtype="float64") -> np.ndarray:
+    """Matriz (population_size, genome_size) de genomas aleatórios (os mesmos de `create_random_genome` em sequência)."""
+    return (np.random.randn(population_size, genome_size) * scale).astype(dtype, copy=False)
+
+def mutation_positions(size: int, mutation_rate: float) -> np.ndarray:
+    """
+    Posições (crescentes) dos genes sorteados para mutar entre `size` genes, cada um
+    com chance `mutation_rate`. Sorteia só as distâncias entre posições sorteadas
+    (geométricas), então o custo é proporcional ao número de mutações, não a `size`.
+    """
+    if mutation_rate <= 0 or size == 0:
+        return np.zeros(0, dtype=np.int64)
+    if mutation_rate >= 1:
+        return np.arange(size)
+    expected = size * mutation_rate
+    batch = int(expected + 4 * np.sqrt(expected) + 16)
+    log_keep = np.log1p(-mutation_rate)
+
+    def gaps() -> np.ndarray:
+        # Geométrica por inversão (bem mais rápida que np.random.geometric): U em (0, 1]
+        return (np.log(1.0 - np.random.random_sample(batch)) / log_keep).astype(np.int64) + 1
+
+    positions = np.cumsum(gaps()) - 1
+    while positions[-1] < size:
+        positions = np.concatenate((positions, np.cumsum(gaps()) + positions[-1]))
+    return positions[:np.searchsorted(positions, size)]
 
 def mutate_genome(genome: np.ndarray, mutation_rate: float, mutation_std: float) -> np.ndarray:
     """
     Aplica mutação gaussiana ao genoma.
     Cada gene tem 'mutation_rate' chance de ser alterado.
     """
-    # Máscara booleana para decidir quais genes mutar
-    mask = np.random.rand(len(genome)) < mutation_rate
-    
-    # Ruído gaussiano
-    noise = np.random.randn(len(genome)) * mutation_std
-    
-    # Aplicar ruído apenas onde mask é True
     mutated_genome = genome.copy()
-    mutated_genome[mask] += noise[mask]
-    
+    mutate_inplace(mutated_genome, mutation_rate, mutation_std)
     return mutated_genome
 
+def mutate_inplace(genomes: np.ndarray, mutation_rate: float, mutation_std: float) -> None:
+    """
+    Mutação gaussiana direto em um genoma ou em uma matriz contígua de genomas:
+    ruído só nos genes sorteados.
+    """
+    if not genomes.flags.c_contiguous:
+        raise ValueError("mutate_inplace precisa de um array contíguo")
+    flat = genomes.reshape(-1)
+    positions = mutation_positions(flat.size, mutation_rate)
+    flat[positions] += (np.random.randn(len(positions)) * mutation_std).astype(flat.dtype, copy=False)
+
 def crossover_uniform(parent1: np.ndarray, parent2: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
     """
     Crossover Uniforme: cada gene do filho vem do pai1 ou pai2 com 50% de chance.
@@ -1,5 +1,15 @@
 import numpy as np
 
+# Tipos numéricos dos genomas, pesos e ativações. Entradas e genomas de outro tipo
+# são convertidos uma vez na entrada, então o forward nunca mistura precisões
+DTYPES = ("float32", "float64")
+
+def resolve_dtype(dtype) -> np.dtype:
+    dtype = np.dtype(dtype)
+    if dtype.name not in DTYPES:
+        raise ValueError(f"Tipo numérico não suportado: {dtype.name} (opções: {DTYPES})")
+    return dtype
+
 class NeuralNetwork:
     """
     Rede Neural Artificial (MLP) para o agente Snake.
@@ -7,13 +17,15 @@ class NeuralNetwork:
     Ativação: ReLU nas ocultas, Tanh na saída.
     """
 
-    def __init__(self, layer_sizes: list[int]):
+    def __init__(self, layer_sizes: list[int], dtype="float64"):
         """
         Args:
             layer_sizes (list[int]): Lista com tamanhos das camadas. 
                                      Ex: [10, 16, 8, 3] (10 inputs, 2 hidden, 3 outputs).
+            dtype: Tipo dos pesos e das ativações (ver `DTYPES`).
         """
         self.layer_sizes = layer_sizes
+        self.dtype = resolve_dtype(dtype)
         self.weights = []
         self.biases = []
         
@@ -24,8 +36,8 @@ class NeuralNetwork:
             
             # He initialization para ReLU (ou Xavier para Tanh/Sigmoid, mas vamos simplificar com normal)
             scale = np.sqrt(2.0 / n_in)
-            W = np.random.randn(n_in, n_out) * scale
-            b = np.zeros((1, n_out))
+            W = (np.random.randn(n_in, n_out) * scale).astype(self.dtype, copy=False)
+            b = np.zeros((1, n_out), dtype=self.dtype)
             
             self.weights.append(W)
             self.biases.append(b)
@@ -44,7 +56,8 @@ class NeuralNetwork:
         Returns:
             np.ndarray: Vetor de saída (scores das ações).
         """
-        # Garantir que x seja (1, input_size)
+        # Garantir que x seja (1, input_size), no tipo dos pesos
+        x = np.asarray(x, dtype=self.dtype)
         if x.ndim == 1:
             a = x.reshape(1, -1)
         else:
@@ -67,6 +80,7 @@ class NeuralNetwork:
         """
         activations = []
         
+        x = np.asarray(x, dtype=self.dtype)
         if x.ndim == 1:
             a = x.reshape(1, -1)
         else:
@@ -94,7 +108,8 @@ class NeuralNetwork:
         return np.concatenate(flat_params)
 
     def set_weights_flat(self, genome: np.ndarray) -> None:
-        """Reconstroi pesos e biases a partir de um vetor 1D (genoma)."""
+        """Reconstroi pesos e biases a partir de um vetor 1D (genoma), convertido para o tipo da rede."""
+        genome = np.asarray(genome, dtype=self.dtype)
         start = 0
         new_weights = []
         new_biases = []
@@ -121,3 +136,75 @@ class NeuralNetwork:
         self.weights = new_weights
         self.biases = new_biases
 
+
+class PopulationNetwork:
+    """
+    Mesma MLP do `NeuralNetwork`, mas para uma população inteira de uma vez.
+    Os pesos dos P genomas ficam empilhados em tensores (P, in, out) que são
+    views (sem cópia) sobre a matriz de genomas (P, genome_size), e o forward
+    processa um bloco (P, batch, in) com um único matmul em lote por camada.
+    Com `dtype`, a matriz é convertida para esse tipo (sem cópia se já for dele);
+    sem, a rede usa o tipo da matriz.
+    """
+
+    def __init__(self, layer_sizes: list[int], genomes: np.ndarray | None = None, dtype=None):
+        self.layer_sizes = layer_sizes
+        self.dtype = resolve_dtype(dtype) if dtype is not None else None
+        self.weights = []
+        self.biases = []
+        self.genomes = None
+        if genomes is not None:
+            self.set_population(genomes)
+
+    @property
+    def genome_size(self) -> int:
+        return sum(n_in * n_out + n_out for n_in, n_out in zip(self.layer_sizes[:-1], self.layer_sizes[1:]))
+
+    def set_population(self, genomes: np.ndarray) -> None:
+        """
+        Aponta a rede para uma matriz de genomas (P, genome_size).
+        Mesmo layout de `NeuralNetwork.set_weights_flat` (W da camada seguido do bias).
+        """
+        genomes = np.asarray(genomes, dtype=self.dtype)
+        if genomes.ndim != 2 or genomes.shape[1] != self.genome_size:
+            raise ValueError(f"Esperado matriz (P, {self.genome_size}), recebido {genomes.shape}")
+
+        pop_size = genomes.shape[0]
+        start = 0
+        new_weights = []
+        new_biases = []
+
+        for i in range(len(self.layer_sizes) - 1):
+            n_in = self.layer_sizes[i]
+            n_out = self.layer_sizes[i+1]
+
+            # Fatiar colunas e separar o último eixo é sempre uma view
+            end = start + n_in * n_out
+            W = genomes[:, start:end].reshape(pop_size, n_in, n_out)
+            start = end
+
+            end = start + n_out
+            b = genomes[:, start:end].reshape(pop_size, 1, n_out)
+            start = end
+
+            new_weights.append(W)
+            new_biases.append(b)
+
+        self.genomes = genomes
+        self.weights = new_weights
+        self.biases = new_biases
+
+    def forward(self, x: np.ndarray) -> np.ndarray:
+        """
+        Forward pass de toda a população.
+        Args:
+            x (np.ndarray): Entradas com shape (P, batch, input_size); a linha p é
+                            avaliada com os pesos do genoma p.
+        Returns:
+            np.ndarray: Saídas com shape (P, batch, output_size).
+        """
+        a = np.asarray(x, dtype=self.genomes.dtype)
+        for i in range(len(self.weights) - 1):
+            a = np.maximum(0, np.matmul(a, self.weights[i]) + self.biases[i])
+
+        return np.tanh(np.matmul(a, self.weights[-1]) + self.biases[-1])
@@ -0,0 +1,204 @@
+"""
+Kernels Numba para o VecSnakeEnv (passo do jogo e encode do estado).
+
+Operam diretamente sobre os arrays inteiros do VecSnakeEnv, com um loop
+por jogo no lugar das operações vetorizadas. Importar este módulo levanta
+ImportError se o Numba não estiver instalado; o VecSnakeEnv usa então o
+caminho puro NumPy.
+"""
+import math
+import numpy as np
+from numba import njit
+
+@njit(cache=True)
+def _occupy(i, cell, grid, free, free_pos, n_free):
+    grid[i, cell] = True
+    pos = free_pos[i, cell]
+    last = free[i, n_free[i] - 1]
+    free[i, pos] = last
+    free_pos[i, last] = pos
+    free_pos[i, cell] = -1
+    n_free[i] -= 1
+
+@njit(cache=True)
+def _vacate(i, cell, grid, free, free_pos, n_free):
+    grid[i, cell] = False
+    k = n_free[i]
+    free[i, k] = cell
+    free_pos[i, cell] = k
+    n_free[i] += 1
+
+@njit(cache=True)
+def step_kernel(
+    actions, grid, free, free_pos, n_free, body, head_ptr, length, head_x, head_y, direction,
+    apple_x, apple_y, energy, score, steps, done,
+    rewards, dones, reasons, ate, old_tail,
+    width, height, initial_energy
+):
+    """
+    Mesmas regras de `VecSnakeEnv._step_active`, jogo a jogo.
+    Jogos que comeram ficam marcados em `ate` (com a cauda antiga em `old_tail`);
+    o sorteio da nova maçã e o corte da cauda sem crescimento ficam com o chamador.
+    """
+    cap = width * height
+    for i in range(len(done)):
+        if done[i]:
+            continue
+
+        steps[i] += 1
+        energy[i] -= 1
+
+        # Atualizar direção (0=Esquerda, 1=Reto, 2=Direita)
+        d = direction[i]
+        if actions[i] == 0:
+            d = (d + 3) % 4
+        elif actions[i] == 2:
+            d = (d + 1) % 4
+        direction[i] = d
+
+        nx = head_x[i]
+        ny = head_y[i]
+        if d == 0:
+            ny -= 1
+        elif d == 1:
+            nx += 1
+        elif d == 2:
+            ny += 1
+        else:
+            nx -= 1
+
+        # Colisão com parede
+        if nx < 0 or nx >= width or ny < 0 or ny >= height:
+            done[i] = True
+            dones[i] = True
+            rewards[i] = -10.0
+            reasons[i] = 1
+            continue
+
+        # Colisão com corpo (a cauda ainda vai sair)
+        cell = ny * width + nx
+        hp = head_ptr[i]
+        tail = body[i, (hp + length[i] - 1) % cap]
+        if grid[i, cell] and cell != tail:
+            done[i] = True
+            dones[i] = True
+            rewards[i] = -30.0
+            reasons[i] = 2
+            continue
+
+        # Energia
+        if energy[i] <= 0:
+            done[i] = True
+            dones[i] = True
+            rewards[i] = -1.0
+            reasons[i] = 3
+            continue
+
+        eat = cell == apple_y[i] * width + apple_x[i]
+        if not eat:
+            _vacate(i, tail, grid, free, free_pos, n_free)
+
+        hp = (hp - 1 + cap) % cap
+        head_ptr[i] = hp
+        body[i, hp] = cell
+        _occupy(i, cell, grid, free, free_pos, n_free)
+        head_x[i] = nx
+        head_y[i] = ny
+
+        if eat:
+            length[i] += 1
+            score[i] += 1
+            rewards[i] = 10.0
+            energy[i] = initial_energy + length[i] * 2
+            ate[i] = True
+            old_tail[i] = tail
+
+@njit(cache=True)
+def encode_kernel(indices, grid, body, head_ptr, length, head_x, head_y, direction, apple_x, apple_y, width, height, out):
+    """Mesmo resultado de `VecSnakeEnv.encode`, com uma BFS por jogo a partir da cauda."""
+    cap = width * height
+    dxs = np.array([0, 1, 0, -1])
+    dys = np.array([-1, 0, 1, 0])
+
+    # Buffers da BFS reaproveitados entre jogos (visited usa um carimbo por jogo)
+    visited = np.zeros(cap, dtype=np.int32)
+    queue = np.empty(cap, dtype=np.int32)
+    dist = np.empty(cap, dtype=np.int32)
+
+    for k in range(len(indices)):
+        i = indices[k]
+        hx = head_x[i]
+        hy = head_y[i]
+        d = direction[i]
+        tail = body[i, (head_ptr[i] + length[i] - 1) % cap]
+
+        cand_cell = np.empty(3, dtype=np.int32)
+        cand_valid = np.zeros(3, dtype=np.bool_)
+        tail_paths = np.zeros(3)
+        pending = 0
+
+        for j in range(3):
+            cd = (d + (0, 1, 3)[j]) % 4
+            px = hx + dxs[cd]
+            py = hy + dys[cd]
+            inside = px >= 0 and px < width and py >= 0 and py < height
+            cell = py * width + px if inside else 0
+            occupied = inside and grid[i, cell]
+
+            # 1. Perigo (parede ou qualquer parte do corpo)
+            out[k, j] = 0.0 if inside and not occupied else 1.0
+
+            cand_cell[j] = cell
+            if inside and (not occupied or cell == tail):
+                if cell == tail:
+                    tail_paths[j] = 1.0
+                else:
+                    cand_valid[j] = True
+                    pending += 1
+
+        # 4. Caminho para Cauda: BFS a partir da cauda até resolver os candidatos
+        if pending > 0:
+            stamp = k + 1
+            visited[tail] = stamp
+            queue[0] = tail
+            dist[tail] = 0
+            q_head = 0
+            q_tail = 1
+            while q_head < q_tail and pending > 0:
+                cur = queue[q_head]
+                q_head += 1
+                cx = cur % width
+                cy = cur // width
+                for m in range(4):
+                    nx = cx + dxs[m]
+                    ny = cy + dys[m]
+                    if nx < 0 or nx >= width or ny < 0 or ny >= height:
+                        continue
+                    nb = ny * width + nx
+                    if visited[nb] == stamp or grid[i, nb]:
+                        continue
+                    visited[nb] = stamp
+                    dist[nb] = dist[cur] + 1
+                    queue[q_tail] = nb
+                    q_tail += 1
+                    for j in range(3):
+                        if cand_valid[j] and cand_cell[j] == nb:
+                            tail_paths[j] = 1.0 / dist[nb]
+                            cand_valid[j] = False
+                            pending -= 1
+
+        for j in range(3):
+            if tail_paths[j] == 0.0:
+                out[k, j] = 1.0
+            out[k, 5 + j] = tail_paths[j]
+
+        # 2. Maçã (Ângulo relativo à direção)
+        angle_diff = math.atan2(apple_y[i] - hy, apple_x[i] - hx) - math.atan2(dys[d], dxs[d])
+        if angle_diff > math.pi:
+            angle_diff -= 2 * math.pi
+        elif angle_diff <= -math.pi:
+            angle_diff += 2 * math.pi
+        out[k, 3] = angle_diff / math.pi
+
+        # 3. Tamanho
+        out[k, 4] = length[i] / cap
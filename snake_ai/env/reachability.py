@@ -0,0 +1,236 @@
+"""
+Estado incremental de alcançabilidade da cauda, carregado entre os passos do SnakeEnv.
+
+Entre dois passos só mudam duas células do "espaço aberto" (células livres + a
+cauda, que é o conjunto percorrido pela BFS de `get_tail_distances`):
+    - a nova cabeça fecha;
+    - a nova cauda abre (a cauda antiga continua aberta, agora como célula livre).
+
+As regiões conexas do espaço aberto ficam em uma union-find. Abrir uma célula só
+une regiões (O(1) amortizado). Fechar uma célula pode dividir uma região; isso só
+é possível se os vizinhos abertos da célula deixam de se ligar pelo anel de 8
+células ao redor dela, e só nesse caso as regiões são refeitas do zero.
+
+Com as regiões, um candidato fora da região da cauda é resolvido sem busca
+(caminho 0.0). Para os demais a distância exata vem de uma busca A* (heurística
+Manhattan) até o candidato, que explora só o entorno do caminho em vez do
+tabuleiro inteiro como a BFS.
+"""
+# Anel de 8 vizinhos em ordem circular (N, NE, L, SE, S, SO, O, NO); True = ortogonal
+_RING = ((0, -1, True), (1, -1, False), (1, 0, True), (1, 1, False),
+         (0, 1, True), (-1, 1, False), (-1, 0, True), (-1, -1, False))
+
+# Ocupado (1) -> fechado (0), livre (0) -> aberto (1)
+_INVERT = bytes([1]) + bytes(255)
+
+class TailReachability:
+    """
+    Regiões do espaço aberto (livres + cauda) e distâncias até a cauda.
+
+    Uso: `rebuild(occupancy, head, tail)` após o reset e `update(head, tail)` após cada
+    passo (células como índice y * width + x); `tail_distances(starts)` devolve os
+    mesmos valores que `get_tail_distances`.
+    """
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.open = bytearray(width * height)
+        self.tail = 0
+        self._head = 0
+        # node[c] é o nó da union-find da célula c; uma célula que reabre ganha um
+        # nó novo, porque o antigo pode ainda estar no caminho de outros nós
+        self.node = []
+        self.parent = []
+        self._dirty = True
+        # Contadores (diagnóstico)
+        self.rebuilds = 0
+        self.updates = 0
+        # Nós fechados do A* (com um carimbo por busca, sem limpar entre buscas)
+        self._closed = [0] * (width * height)
+        self._stamp = 0
+
+    def rebuild(self, occupancy, head: int, tail: int) -> None:
+        """Recarrega o espaço aberto a partir da grade de ocupação, da cabeça e da cauda."""
+        self._head = head
+        self.open[:] = bytes(occupancy).translate(_INVERT)
+        self.open[tail] = 1
+        self.tail = tail
+        self._dirty = True
+
+    def update(self, head: int, tail: int) -> None:
+        """Aplica o diff de um passo: `head` fechou e `tail` é a cauda atual."""
+        self.updates += 1
+        self._head = head
+        if tail != self.tail:
+            self.tail = tail
+            if not self.open[tail]:
+                self.open[tail] = 1
+                if not self._dirty:
+                    self._join(tail)
+        if self.open[head]:
+            self.open[head] = 0
+            if not self._dirty and self._may_split(head):
+                self._dirty = True
+
+    def reachable(self, cell: int) -> bool:
+        """Se `cell` está na mesma região aberta que a cauda."""
+        if not self.open[cell]:
+            return False
+        if self._dirty:
+            self._relabel()
+        return self._find(self.node[cell]) == self._find(self.node[self.tail])
+
+    def tail_distances(self, starts: list[tuple]) -> list[float]:
+        """Mesmo resultado que `get_tail_distances(starts, tail, ...)` para o estado atual."""
+        width = self.width
+        tx, ty = self.tail % width, self.tail // width
+        results = [0.0] * len(starts)
+        goals = {}
+        for i, (x, y) in enumerate(starts):
+            if (x, y) == (tx, ty):
+                results[i] = 1.0
+            elif 0 <= x < width and 0 <= y < self.height and self.reachable(y * width + x):
+                goals.setdefault(y * width + x, []).append(i)
+        if goals:
+            for cell, dist in self._distances(goals).items():
+                for i in goals[cell]:
+                    results[i] = 1.0 / dist
+        return results
+
+    def _find(self, n: int) -> int:
+        parent = self.parent
+        root = n
+        while parent[root] != root:
+            root = parent[root]
+        while parent[n] != root:
+            parent[n], n = root, parent[n]
+        return root
+
+    def _join(self, cell: int) -> None:
+        # Nó novo para a célula que abriu, unido às regiões dos vizinhos abertos
+        n = len(self.parent)
+        self.parent.append(n)
+        self.node[cell] = n
+        for nb in self._neighbors(cell):
+            if self.open[nb]:
+                root = self._find(self.node[nb])
+                if root != n:
+                    self.parent[root] = n
+        # Muitos nós mortos: mais barato refazer as regiões
+        if len(self.parent) > 2 * len(self.open):
+            self._dirty = True
+
+    def _may_split(self, cell: int) -> bool:
+        """
+        Fechar `cell` pode dividir sua região se os vizinhos ortogonais abertos
+        caem em mais de um trecho contínuo de células abertas do anel ao redor.
+        """
+        width, height = self.width, self.height
+        x, y = cell % width, cell // width
+        ring = []
+        for dx, dy, ortho in _RING:
+            nx, ny = x + dx, y + dy
+            ring.append((0 <= nx < width and 0 <= ny < height and self.open[ny * width + nx] == 1, ortho))
+
+        # Começar a varredura logo após uma célula fechada (se houver)
+        start = next((k + 1 for k in range(8) if not ring[k][0]), None)
+        if start is None:
+            return False
+        runs = 0
+        in_run = has_ortho = False
+        for k in range(start, start + 8):
+            is_open, ortho = ring[k % 8]
+            if is_open:
+                in_run = True
+                has_ortho = has_ortho or ortho
+            elif in_run:
+                runs += has_ortho
+                in_run = has_ortho = False
+        runs += in_run and has_ortho
+        return runs > 1
+
+    def _relabel(self) -> None:
+        """Refaz as regiões do zero (flood fill); cada região aponta para uma célula raiz."""
+        self.rebuilds += 1
+        self._dirty = False
+        num_cells = len(self.open)
+        self.node = list(range(num_cells))
+        parent = self.parent = list(range(num_cells))
+        is_open = self.open
+        visited = bytearray(num_cells)
+        for c in range(num_cells):
+            if not is_open[c] or visited[c]:
+                continue
+            visited[c] = 1
+            stack = [c]
+            while stack:
+                cur = stack.pop()
+                parent[cur] = c
+                for nb in self._neighbors(cur):
+                    if is_open[nb] and not visited[nb]:
+                        visited[nb] = 1
+                        stack.append(nb)
+
+    def _neighbors(self, cell: int) -> list[int]:
+        width = self.width
+        cy, cx = divmod(cell, width)
+        neighbors = []
+        if cy + 1 < self.height: neighbors.append(cell + width)
+        if cy > 0: neighbors.append(cell - width)
+        if cx + 1 < width: neighbors.append(cell + 1)
+        if cx > 0: neighbors.append(cell - 1)
+        return neighbors
+
+    def _distances(self, goals) -> dict:
+        """
+        Distâncias exatas cauda -> cada goal pelo espaço aberto (goals alcançáveis).
+
+        Os goals são vizinhos da cabeça, então uma única busca A* serve para todos,
+        com heurística h = Manhattan até a cabeça - 1 (consistente: cada goal sai
+        da busca já com a distância mínima). Em grade unitária um passo muda h em
+        ±1, ou seja, f = g + h fica igual ou sobe 2; a fila de prioridade vira
+        dois baldes (f atual e f + 2), sem heap. Dentro do balde a ordem é LIFO,
+        o que favorece os nós mais profundos nos empates.
+        """
+        width, height = self.width, self.height
+        hy, hx = divmod(self._head, width)
+        self._stamp += 1
+        stamp = self._stamp
+        closed = self._closed
+        is_open = self.open
+
+        found = {}
+        bucket = [(0, self.tail)]
+        next_bucket = []
+        while bucket or next_bucket:
+            if not bucket:
+                bucket, next_bucket = next_bucket, bucket
+            g, cur = bucket.pop()
+            if closed[cur] == stamp:
+                continue
+            closed[cur] = stamp
+            if cur in goals:
+                found[cur] = g
+                if len(found) == len(goals):
+                    return found
+            g += 1
+            cy, cx = divmod(cur, width)
+            # Vizinho que aproxima da cabeça mantém f; os demais vão para f + 2
+            if cy + 1 < height:
+                nb = cur + width
+                if is_open[nb] and closed[nb] != stamp:
+                    (bucket if cy < hy else next_bucket).append((g, nb))
+            if cy > 0:
+                nb = cur - width
+                if is_open[nb] and closed[nb] != stamp:
+                    (bucket if cy > hy else next_bucket).append((g, nb))
+            if cx + 1 < width:
+                nb = cur + 1
+                if is_open[nb] and closed[nb] != stamp:
+                    (bucket if cx < hx else next_bucket).append((g, nb))
+            if cx > 0:
+                nb = cur - 1
+                if is_open[nb] and closed[nb] != stamp:
+                    (bucket if cx > hx else next_bucket).append((g, nb))
+        raise ValueError("Célula fora da região da cauda")
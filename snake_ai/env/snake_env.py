@@ -1,7 +1,17 @@
 import numpy as np
 import random
+from collections import deque
 from enum import Enum
 
+# Códigos inteiros do motivo de término (info["reason"] do SnakeEnv), usados nos arrays da avaliação
+REASON_NONE = 0
+REASON_WALL = 1
+REASON_BODY = 2
+REASON_STARVATION = 3
+REASON_WIN = 4
+REASON_NAMES = (None, "wall_collision", "body_collision", "starvation", "win")
+REASON_CODES = {name: code for code, name in enumerate(REASON_NAMES)}
+
 class Direction(Enum):
     UP = 0
     RIGHT = 1
@@ -13,18 +23,48 @@ class SnakeEnv:
     Ambiente do jogo Snake (Cobrinha) para treinamento de IA.
     """
 
-    def __init__(self, width: int = 10, height: int = 10, initial_energy: int | None = None, grow_on_eat: bool = True):
+    def __init__(self, width: int = 10, height: int = 10, initial_energy: int | None = None, grow_on_eat: bool = True, seed: int | None = None, track_reachability: bool = False):
         self.width = width
         self.height = height
         self.initial_energy = initial_energy if initial_energy is not None else width * height
         self.grow_on_eat = grow_on_eat
+        # Sem seed usa o gerador global do módulo random (comportamento original)
+        self.rng = random.Random(seed) if seed is not None else random
+        
+        # Grade de ocupação do corpo (inclui a cauda), índice y * width + x
+        self.occupancy = bytearray(width * height)
+        
+        # Índice de células livres para sortear a maçã em O(1):
+        # free_cells guarda as células livres (ordem arbitrária, remoção por troca
+        # com a última) e free_pos[c] a posição de c em free_cells (-1 se ocupada)
+        self.free_cells = []
+        self.free_pos = []
+        
+        # Regiões alcançáveis a partir da cauda, atualizadas a cada passo
+        # (usadas por encode_state no lugar da BFS completa)
+        self.reachability = None
+        if track_reachability:
+            # Import local: quem não acompanha a alcançabilidade não carrega o módulo
+            from .reachability import TailReachability
+            self.reachability = TailReachability(width, height)
         self.reset()
 
-    def reset(self) -> dict:
+    def reset(self, seed: int | None = None) -> dict:
+        if seed is not None:
+            self.rng = random.Random(seed)
+            
         self.direction = Direction.RIGHT
         head_x = self.width // 2
         head_y = self.height // 2
-        self.snake = [(head_x, head_y), (head_x - 1, head_y), (head_x - 2, head_y)]
+        # Corpo como deque (cabeça em snake[0], cauda em snake[-1])
+        self.snake = deque([(head_x, head_y), (head_x - 1, head_y), (head_x - 2, head_y)])
+        
+        num_cells = self.width * self.height
+        self.occupancy[:] = bytes(num_cells)
+        self.free_cells = list(range(num_cells))
+        self.free_pos = list(range(num_cells))
+        for x, y in self.snake:
+            self._occupy(y * self.width + x)
         
         self.score = 0
         self.energy = self.initial_energy
@@ -33,15 +73,37 @@ class SnakeEnv:
         
         self._place_apple()
         
+        if self.reachability is not None:
+            (hx, hy), (tx, ty) = self.snake[0], self.snake[-1]
+            self.reachability.rebuild(self.occupancy, hy * self.width + hx, ty * self.width + tx)
+        
         return self._get_state_info()
 
-    def _place_apple(self):
-        while True:
-            x = random.randint(0, self.width - 1)
-            y = random.randint(0, self.height - 1)
-            if (x, y) not in self.snake:
-                self.apple = (x, y)
-                break
+    def _place_apple(self) -> bool:
+        """
+        Sorteia a maçã uniformemente entre as células livres.
+        Retorna False se o tabuleiro está cheio (a maçã fica onde estava).
+        """
+        if not self.free_cells:
+            return False
+        cell = self.free_cells[self.rng.randrange(len(self.free_cells))]
+        self.apple = (cell % self.width, cell // self.width)
+        return True
+
+    def _occupy(self, cell: int):
+        self.occupancy[cell] = 1
+        # Remover do índice de livres trocando com a última
+        pos = self.free_pos[cell]
+        last = self.free_cells.pop()
+        if last != cell:
+            self.free_cells[pos] = last
+            self.free_pos[last] = pos
+        self.free_pos[cell] = -1
+
+    def _vacate(self, cell: int):
+        self.occupancy[cell] = 0
+        self.free_pos[cell] = len(self.free_cells)
+        self.free_cells.append(cell)
 
     def step(self, action: int) -> tuple[dict, float, bool, dict]:
         if self.done:
@@ -81,8 +143,8 @@ class SnakeEnv:
             self.done = True
             reward = -10.0
             return self._get_state_info(), reward, self.done, {"score": self.score, "reason": "wall_collision"}
-        # Verificar colisão com corpo
-        elif new_head in self.snake[:-1]:
+        # Verificar colisão com corpo (a cauda ainda vai sair, então não conta)
+        elif self.occupancy[y * self.width + x] and new_head != self.snake[-1]:
             self.done = True
             reward = -30.0
             return self._get_state_info(), reward, self.done, {"score": self.score, "reason": "body_collision"}
@@ -93,11 +155,19 @@ class SnakeEnv:
             reward = -1.0
             return self._get_state_info(), reward, self.done, {"score": self.score, "reason": "starvation"}
 
+        ate = new_head == self.apple
+        
+        # Se não comeu, remove cauda (antes de ocupar a nova cabeça,
+        # que pode ser justamente a célula da cauda)
+        if not ate:
+            self._pop_tail()
+            
         # Mover
-        self.snake.insert(0, new_head)
+        self.snake.appendleft(new_head)
+        self._occupy(y * self.width + x)
         
         # Comer Maçã
-        if new_head == self.apple:
+        if ate:
             self.score += 1
             reward = 10.0
             
@@ -106,18 +176,44 @@ class SnakeEnv:
             energy_bonus = len(self.snake) * 2 
             self.energy = self.initial_energy + energy_bonus
             
-            self._place_apple()
+            placed = self._place_apple()
             
             # Se NÃO deve crescer, remove a cauda mesmo comendo
             if not self.grow_on_eat:
-                self.snake.pop()
+                self._pop_tail()
+                
+            self._update_reachability()
+                
+            # Tabuleiro cheio: não há onde pôr a maçã, a cobra venceu
+            if not placed:
+                self.done = True
+                return self._get_state_info(), reward, self.done, {"score": self.score, "reason": "win"}
         else:
-            # Se não comeu, remove cauda
-            self.snake.pop()
-            reward = 0
+            self._update_reachability()
             
         return self._get_state_info(), reward, self.done, {"score": self.score}
 
+    @property
+    def grid(self) -> np.ndarray:
+        """View NumPy (height, width) da grade de ocupação (sem cópia)."""
+        return np.frombuffer(self.occupancy, dtype=np.uint8).reshape(self.height, self.width)
+
+    def _pop_tail(self):
+        tx, ty = self.snake.pop()
+        self._vacate(ty * self.width + tx)
+
+    def _update_reachability(self):
+        if self.reachability is not None:
+            (hx, hy), (tx, ty) = self.snake[0], self.snake[-1]
+            self.reachability.update(hy * self.width + hx, ty * self.width + tx)
+
+    def is_collision(self, pt: tuple) -> bool:
+        """Verifica em O(1) se um ponto é parede ou qualquer parte do corpo."""
+        x, y = pt
+        if x < 0 or x >= self.width or y < 0 or y >= self.height:
+            return True
+        return self.occupancy[y * self.width + x] == 1
+
     def _get_state_info(self) -> dict:
         return {
             "snake": self.snake,
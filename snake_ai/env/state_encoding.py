@@ -1,6 +1,7 @@
 import numpy as np
 import math
 import heapq
+from collections import deque
 from .snake_env import SnakeEnv, Direction
 
 def get_dijkstra_distance(start: tuple, goal: tuple, obstacles: set, width: int, height: int) -> float:
@@ -49,15 +50,73 @@ def get_dijkstra_distance(start: tuple, goal: tuple, obstacles: set, width: int,
                     
     return 0.0
 
+def get_tail_distances(starts: list[tuple], tail: tuple, occupancy, width: int, height: int) -> list[float]:
+    """
+    Versão de `get_dijkstra_distance` para vários pontos de partida com uma única busca.
+    Faz uma BFS a partir da cauda (o grid tem peso unitário e é não-direcionado, então
+    a distância cauda -> ponto é a mesma de ponto -> cauda) e para assim que todos os
+    pontos foram resolvidos.
+    
+    `occupancy` é a grade de ocupação achatada do corpo (índice y * width + x, valor
+    não-zero = corpo), como `SnakeEnv.occupancy`. A cauda conta como livre.
+    
+    Retorna, para cada ponto, o mesmo valor que `get_dijkstra_distance(ponto, tail, ...)`:
+    - 1/distância: Se existe caminho
+    - 0.0: Se não existe caminho
+    """
+    results = [0.0] * len(starts)
+    pending = {}
+    tail_cell = tail[1] * width + tail[0]
+    
+    for i, (x, y) in enumerate(starts):
+        if (x, y) == tail:
+            results[i] = 1.0
+        elif 0 <= x < width and 0 <= y < height and not occupancy[y * width + x]:
+            pending.setdefault(y * width + x, []).append(i)
+            
+    if not pending:
+        return results
+        
+    visited = bytearray(width * height)
+    visited[tail_cell] = 1
+    queue = deque([(tail_cell, 0)])
+    
+    while queue:
+        current, cost = queue.popleft()
+        new_cost = cost + 1
+        cy, cx = divmod(current, width)
+        
+        # Vizinhos dentro do tabuleiro (baixo, cima, direita, esquerda)
+        neighbors = []
+        if cy + 1 < height: neighbors.append(current + width)
+        if cy > 0: neighbors.append(current - width)
+        if cx + 1 < width: neighbors.append(current + 1)
+        if cx > 0: neighbors.append(current - 1)
+        
+        for neighbor in neighbors:
+            if not occupancy[neighbor] and not visited[neighbor]:
+                visited[neighbor] = 1
+                
+                if neighbor in pending:
+                    for i in pending.pop(neighbor):
+                        results[i] = 1.0 / new_cost
+                    if not pending:
+                        return results
+                        
+                queue.append((neighbor, new_cost))
+                
+    return results
+
 def encode_state(env: SnakeEnv) -> np.ndarray:
     """
     Converte o estado atual do ambiente em um vetor de entrada para a rede neural.
-    Versão com Perigo, Ângulo, Tamanho e Dijkstra para Cauda (8 Inputs):
+    Versão com Perigo, Ângulo, Tamanho e Caminho para Cauda (8 Inputs):
     
     1. Perigo (3 valores): Frente, Direita, Esquerda.
     2. Maçã (1 valor): Ângulo relativo à cabeça.
     3. Tamanho (1 valor): Comprimento atual normalizado.
-    4. Cauda (3 valores): Dijkstra para a cauda em cada direção (sobrevivência).
+    4. Cauda (3 valores): Distância até a cauda em cada direção (sobrevivência),
+       calculada com uma única BFS a partir da cauda.
     
     Total: 3 + 1 + 1 + 3 = 8 inputs.
     """
@@ -70,14 +129,8 @@ def encode_state(env: SnakeEnv) -> np.ndarray:
     width = state_info["width"]
     height = state_info["height"]
 
-    # Helper para verificar colisão em um ponto arbitrário
-    def is_collision(pt):
-        x, y = pt
-        if x < 0 or x >= width or y < 0 or y >= height:
-            return True
-        if pt in snake: # Colisão com corpo
-            return True
-        return False
+    # Helper para verificar colisão em um ponto arbitrário (O(1) pela grade de ocupação)
+    is_collision = env.is_collision
 
     # Coordenadas ao redor da cabeça
     point_l = (head[0] - 1, head[1])
@@ -136,17 +189,21 @@ def encode_state(env: SnakeEnv) -> np.ndarray:
     max_len = width * height
     norm_len = len(snake) / max_len
     
-    # 4. Caminho para Cauda (Dijkstra) - Sobrevivência
+    # 4. Caminho para Cauda (BFS) - Sobrevivência
     # A cauda é um alvo móvel, mas alcançar a posição atual da cauda é uma boa heurística de segurança
     tail = snake[-1]
     
-    # Obstáculos: corpo da cobra, exceto a cauda (que se move)
-    obstacles = set(snake[:-1]) 
-    
-    # Calcular caminho para a cauda a partir de cada direção
-    tail_path_fwd = get_dijkstra_distance(pt_fwd, tail, obstacles, width, height)
-    tail_path_right = get_dijkstra_distance(pt_right, tail, obstacles, width, height)
-    tail_path_left = get_dijkstra_distance(pt_left, tail, obstacles, width, height)
+    # Obstáculos: corpo da cobra (grade de ocupação), exceto a cauda (que se move)
+    # Calcular caminho para a cauda a partir de cada direção (uma BFS para as três)
+    # (com o estado incremental do env, se ativo, em vez de uma BFS nova a cada passo)
+    if env.reachability is not None:
+        tail_path_fwd, tail_path_right, tail_path_left = env.reachability.tail_distances(
+            [pt_fwd, pt_right, pt_left]
+        )
+    else:
+        tail_path_fwd, tail_path_right, tail_path_left = get_tail_distances(
+            [pt_fwd, pt_right, pt_left], tail, env.occupancy, width, height
+        )
     
     # Atualizar PERIGO para incluir "sem saída" (se não alcança a cauda)
     # Se já é colisão (1.0) ou se não tem caminho para cauda (0.0), vira Perigo=1.0
@@ -0,0 +1,134 @@
+"""
+Trajetórias gravadas: um episódio em poucos bytes, reproduzível sem a rede.
+
+Uma `Trajectory` guarda a seed do episódio, as ações (uint8, 0=Esquerda,
+1=Reto, 2=Direita) e as maçãs sorteadas (índice da célula, y * width + x: a
+inicial e uma por maçã comida). Se a gravação parou porque a cobra entrou em um
+ciclo sem comer (ver `snake_ai.training.cycle_detection`), `cycle` é o período da
+volta e `steps` a duração projetada do episódio: dali em diante as ações são as
+últimas `cycle` ações repetidas, até a cobra morrer de fome ou o limite de passos.
+
+O `TrajectoryRecorder` grava enquanto o episódio é jogado
+(`run_episode(..., recorder=...)`) e `replay` reconstrói os quadros com o próprio
+`SnakeEnv`, pondo as maçãs gravadas no lugar do sorteio: é exatamente o jogo
+gravado, mesmo sem seed, e nenhum forward da rede é feito.
+"""
+import json
+import numpy as np
+from .snake_env import SnakeEnv
+
+ENV_KEYS = ("width", "height", "initial_energy", "grow_on_eat")
+
+class Trajectory:
+    def __init__(self, env_config: dict, seed: int | None, actions: np.ndarray, apples: np.ndarray,
+                 cycle: int = 0, steps: int | None = None):
+        self.env_config = {key: env_config[key] for key in ENV_KEYS if key in env_config}
+        self.seed = seed
+        self.actions = np.asarray(actions, dtype=np.uint8)
+        self.apples = np.asarray(apples)
+        self.cycle = int(cycle)
+        self.steps = int(steps) if cycle else len(self.actions)
+
+    def __len__(self) -> int:
+        return self.steps
+
+    def iter_actions(self):
+        """Todas as ações do episódio, com o ciclo final expandido."""
+        actions = self.actions.tolist()
+        yield from actions
+        if self.cycle:
+            loop = actions[-self.cycle:]
+            for k in range(self.steps - len(actions)):
+                yield loop[k % self.cycle]
+
+    @property
+    def nbytes(self) -> int:
+        return self.actions.nbytes + self.apples.nbytes
+
+    def to_arrays(self, prefix: str = "") -> dict:
+        """Arrays para um .npz (várias trajetórias no mesmo arquivo com prefixos diferentes)."""
+        meta = {"env_config": self.env_config, "seed": self.seed, "cycle": self.cycle, "steps": self.steps}
+        return {
+            f"{prefix}actions": self.actions,
+            f"{prefix}apples": self.apples,
+            f"{prefix}meta": np.frombuffer(json.dumps(meta).encode(), dtype=np.uint8),
+        }
+
+    @classmethod
+    def from_arrays(cls, data, prefix: str = "") -> "Trajectory":
+        meta = json.loads(bytes(data[f"{prefix}meta"]).decode())
+        return cls(meta["env_config"], meta["seed"], data[f"{prefix}actions"], data[f"{prefix}apples"],
+                   meta["cycle"], meta["steps"])
+
+    def save(self, path: str) -> None:
+        np.savez(path, **self.to_arrays())
+
+    @classmethod
+    def load(cls, path: str) -> "Trajectory":
+        with np.load(path, allow_pickle=False) as data:
+            return cls.from_arrays(data)
+
+class TrajectoryRecorder:
+    """Grava as ações e as maçãs de um episódio em andamento (custo: um append por passo)."""
+
+    def __init__(self, env_config: dict, seed: int | None = None):
+        self.env_config = env_config
+        self.seed = seed
+        self.actions = bytearray()
+        self.apples = []
+        self.cycle = 0
+        self.steps = None
+        self._score = 0
+
+    def start(self, env: SnakeEnv) -> None:
+        """Chamado logo após o reset do ambiente."""
+        self.actions.clear()
+        self.apples = [env.apple[1] * env.width + env.apple[0]]
+        self.cycle = 0
+        self.steps = None
+        self._score = env.score
+
+    def step(self, env: SnakeEnv, action: int) -> None:
+        """Chamado após cada `env.step(action)`."""
+        self.actions.append(action)
+        # Comeu e o jogo continua: uma maçã nova foi sorteada (sem sorteio só na vitória)
+        if env.score != self._score:
+            self._score = env.score
+            if not env.done:
+                self.apples.append(env.apple[1] * env.width + env.apple[0])
+
+    def end_cycle(self, period: int, steps: int) -> None:
+        """A gravação para aqui: as próximas ações repetem a última volta (`period` passos) até `steps`."""
+        self.cycle = period
+        self.steps = steps
+
+    def trajectory(self) -> Trajectory:
+        cells = self.env_config["width"] * self.env_config["height"]
+        apples = np.array(self.apples, dtype=np.min_scalar_type(cells - 1))
+        actions = np.frombuffer(bytes(self.actions), dtype=np.uint8)
+        return Trajectory(self.env_config, self.seed, actions, apples, self.cycle, self.steps)
+
+class ReplayEnv(SnakeEnv):
+    """`SnakeEnv` que põe as maçãs na ordem gravada em vez de sorteá-las."""
+
+    def __init__(self, trajectory: Trajectory):
+        self._apples = iter(trajectory.apples.tolist())
+        super().__init__(**trajectory.env_config)
+
+    def _place_apple(self) -> bool:
+        cell = next(self._apples, None)
+        if cell is None:
+            return False
+        self.apple = (cell % self.width, cell // self.width)
+        return True
+
+def replay(trajectory: Trajectory):
+    """
+    Gera o ambiente no estado inicial e depois de cada ação gravada (o mesmo objeto,
+    atualizado a cada passo). Para quadros independentes, copie o que precisar.
+    """
+    env = ReplayEnv(trajectory)
+    yield env
+    for action in trajectory.iter_actions():
+        env.step(action)
+        yield env
@@ -0,0 +1,433 @@
+import numpy as np
+import random
+import importlib.util
+from .snake_env import (Direction, REASON_NONE, REASON_WALL, REASON_BODY, REASON_STARVATION, REASON_WIN,
+                        REASON_NAMES, REASON_CODES)
+
+# Backend compilado opcional: usado se o Numba estiver instalado. O módulo dos kernels
+# (e o próprio numba, ~0.3 s) só é importado no primeiro VecSnakeEnv que usa o JIT
+HAS_NUMBA = importlib.util.find_spec("numba") is not None
+jit_kernels = None
+
+def _load_jit_kernels():
+    """Importa os kernels na primeira chamada; None se o Numba não estiver disponível."""
+    global jit_kernels, HAS_NUMBA
+    if jit_kernels is None and HAS_NUMBA:
+        try:
+            from . import jit_kernels as kernels
+            jit_kernels = kernels
+        except ImportError:
+            HAS_NUMBA = False
+    return jit_kernels
+
+# Deslocamentos por direção, indexados por Direction.value (UP, RIGHT, DOWN, LEFT)
+DX = np.array([0, 1, 0, -1], dtype=np.int32)
+DY = np.array([-1, 0, 1, 0], dtype=np.int32)
+
+class VecSnakeEnv:
+    """
+    N jogos de Snake simulados em lote (structure-of-arrays).
+
+    Todo o estado fica em arrays NumPy indexados pelo número do jogo:
+    grade de ocupação, índice de células livres, corpo como ring buffer de
+    índices de célula, cabeça, direção, energia, maçã, score e passos. Um único `step(actions)` avança
+    todos os jogos ativos com as mesmas regras e recompensas de `SnakeEnv.step`.
+
+    A maçã é sorteada com um `random.Random` por jogo usando o mesmo
+    algoritmo do `SnakeEnv`, então com a mesma seed os dois ambientes
+    produzem exatamente o mesmo jogo.
+
+    Com o Numba instalado, `step` e `encode` usam os kernels compilados de
+    `jit_kernels` (mesmos resultados); `use_jit=False` força o caminho NumPy.
+    """
+
+    def __init__(
+        self,
+        num_envs: int,
+        width: int = 10,
+        height: int = 10,
+        initial_energy: int | None = None,
+        grow_on_eat: bool = True,
+        auto_reset: bool = True,
+        seeds: list[int] | None = None,
+        use_jit: bool | None = None
+    ):
+        self.num_envs = num_envs
+        self.width = width
+        self.height = height
+        self.initial_energy = initial_energy if initial_energy is not None else width * height
+        self.grow_on_eat = grow_on_eat
+        self.auto_reset = auto_reset
+        
+        if use_jit is not False and _load_jit_kernels() is None:
+            if use_jit:
+                raise ImportError("use_jit=True requer o pacote numba")
+            use_jit = False
+        self.use_jit = use_jit is not False
+
+        n = num_envs
+        self.capacity = width * height
+
+        # Ocupação do corpo (inclui a cauda), achatada em (N, H*W)
+        self.grid = np.zeros((n, self.capacity), dtype=np.bool_)
+        # Corpo: ring buffer de células (y * width + x), cabeça em body[i, head_ptr[i]]
+        # e os segmentos seguintes em head_ptr+1, head_ptr+2, ... (mod capacity)
+        self.body = np.zeros((n, self.capacity), dtype=np.int32)
+        self.head_ptr = np.zeros(n, dtype=np.int32)
+        self.length = np.zeros(n, dtype=np.int32)
+        # Índice de células livres de cada jogo, mesma estrutura do SnakeEnv:
+        # free[i, :n_free[i]] são as livres e free_pos[i, c] a posição de c (-1 se ocupada)
+        self.free = np.zeros((n, self.capacity), dtype=np.int32)
+        self.free_pos = np.zeros((n, self.capacity), dtype=np.int32)
+        self.n_free = np.zeros(n, dtype=np.int32)
+
+        self.head_x = np.zeros(n, dtype=np.int32)
+        self.head_y = np.zeros(n, dtype=np.int32)
+        self.direction = np.zeros(n, dtype=np.int8)
+        self.apple_x = np.zeros(n, dtype=np.int32)
+        self.apple_y = np.zeros(n, dtype=np.int32)
+
+        self.energy = np.zeros(n, dtype=np.int32)
+        self.score = np.zeros(n, dtype=np.int32)
+        self.steps = np.zeros(n, dtype=np.int32)
+        self.done = np.zeros(n, dtype=np.bool_)
+
+        # Sem seeds, cada jogo recebe uma seed tirada do gerador global
+        if seeds is None:
+            seeds = [random.getrandbits(32) for _ in range(n)]
+        self.rngs = [random.Random(s) for s in seeds]
+
+        self.reset()
+
+    def reset(self, indices: np.ndarray | None = None) -> None:
+        """Reinicia os jogos indicados (todos se None)."""
+        if indices is None:
+            indices = np.arange(self.num_envs)
+        indices = np.asarray(indices, dtype=np.intp)
+        if len(indices) == 0:
+            return
+
+        w = self.width
+        head_x = w // 2
+        head_y = self.height // 2
+
+        self.grid[indices] = False
+        self.free[indices] = np.arange(self.capacity)
+        self.free_pos[indices] = np.arange(self.capacity)
+        self.n_free[indices] = self.capacity
+        self.head_ptr[indices] = 0
+        self.length[indices] = 3
+
+        # Mesma cobra inicial do SnakeEnv: cabeça no centro, corpo para a esquerda
+        for k in range(3):
+            cell = head_y * w + (head_x - k)
+            self.body[indices, k] = cell
+            self._occupy(indices, np.full(len(indices), cell))
+
+        self.head_x[indices] = head_x
+        self.head_y[indices] = head_y
+        self.direction[indices] = Direction.RIGHT.value
+        self.energy[indices] = self.initial_energy
+        self.score[indices] = 0
+        self.steps[indices] = 0
+        self.done[indices] = False
+
+        self._place_apples(indices)
+
+    def _place_apples(self, indices: np.ndarray) -> np.ndarray:
+        """
+        Mesmo sorteio do SnakeEnv._place_apple (uniforme entre as células livres),
+        jogo a jogo. Só roda no reset e quando alguém come, então o loop Python é raro.
+        Retorna os jogos cujo tabuleiro está cheio (sem lugar para a maçã).
+        """
+        w = self.width
+        full = []
+        for i in indices:
+            n_free = self.n_free[i]
+            if n_free == 0:
+                full.append(i)
+                continue
+            cell = self.free[i, self.rngs[i].randrange(n_free)]
+            self.apple_x[i] = cell % w
+            self.apple_y[i] = cell // w
+        return np.array(full, dtype=np.intp)
+
+    def _occupy(self, rows: np.ndarray, cells: np.ndarray) -> None:
+        """Marca uma célula por jogo como corpo e a remove do índice de livres (troca com a última)."""
+        self.grid[rows, cells] = True
+        pos = self.free_pos[rows, cells]
+        last = self.free[rows, self.n_free[rows] - 1]
+        self.free[rows, pos] = last
+        self.free_pos[rows, last] = pos
+        self.free_pos[rows, cells] = -1
+        self.n_free[rows] -= 1
+
+    def _vacate(self, rows: np.ndarray, cells: np.ndarray) -> None:
+        """Libera uma célula por jogo, adicionando-a ao fim do índice de livres."""
+        self.grid[rows, cells] = False
+        k = self.n_free[rows]
+        self.free[rows, k] = cells
+        self.free_pos[rows, cells] = k
+        self.n_free[rows] += 1
+
+    def step(self, actions: np.ndarray) -> tuple[np.ndarray, np.ndarray, dict]:
+        """
+        Avança todos os jogos ativos em um passo.
+        Args:
+            actions (np.ndarray): Ação de cada jogo (0=Esquerda, 1=Reto, 2=Direita).
+                                  Ações de jogos já terminados são ignoradas.
+        Returns:
+            (rewards, dones, info): recompensas e término deste passo, e um dict
+            com "score", "steps", "length" e "reason" (códigos REASON_*) de cada
+            jogo no momento do passo, antes de um eventual auto-reset.
+        """
+        n = self.num_envs
+        rewards = np.zeros(n, dtype=np.float32)
+        dones = np.zeros(n, dtype=np.bool_)
+        reasons = np.zeros(n, dtype=np.int8)
+
+        if self.use_jit:
+            self._step_jit(np.asarray(actions), rewards, dones, reasons)
+        else:
+            idx = np.flatnonzero(~self.done)
+            if len(idx) > 0:
+                self._step_active(idx, np.asarray(actions)[idx], rewards, dones, reasons)
+
+        info = {
+            "score": self.score.copy(),
+            "steps": self.steps.copy(),
+            "length": self.length.copy(),
+            "reason": reasons
+        }
+
+        if self.auto_reset:
+            self.reset(np.flatnonzero(dones))
+
+        return rewards, dones, info
+
+    def _step_jit(self, actions, rewards, dones, reasons) -> None:
+        ate = np.zeros(self.num_envs, dtype=np.bool_)
+        old_tail = np.zeros(self.num_envs, dtype=np.int32)
+        jit_kernels.step_kernel(
+            actions, self.grid, self.free, self.free_pos, self.n_free,
+            self.body, self.head_ptr, self.length,
+            self.head_x, self.head_y, self.direction, self.apple_x, self.apple_y,
+            self.energy, self.score, self.steps, self.done,
+            rewards, dones, reasons, ate, old_tail,
+            self.width, self.height, self.initial_energy
+        )
+
+        # Sorteio da maçã (gerador Python por jogo) e corte da cauda sem crescimento
+        eaters = np.flatnonzero(ate)
+        if len(eaters) == 0:
+            return
+        self._finish_eating(eaters, old_tail[eaters], dones, reasons)
+
+    def _finish_eating(self, eaters, old_tail, dones, reasons) -> None:
+        full = self._place_apples(eaters)
+
+        # Se NÃO deve crescer, remove a cauda mesmo comendo
+        if not self.grow_on_eat:
+            self._vacate(eaters, old_tail)
+            self.length[eaters] -= 1
+
+        # Tabuleiro cheio: a cobra venceu
+        dones[full] = True
+        reasons[full] = REASON_WIN
+        self.done[full] = True
+
+    def _step_active(self, idx, actions, rewards, dones, reasons) -> None:
+        w = self.width
+        h = self.height
+        cap = self.capacity
+
+        self.steps[idx] += 1
+        self.energy[idx] -= 1
+
+        # Atualizar direção (0=Esquerda, 1=Reto, 2=Direita)
+        d = self.direction[idx].astype(np.int32)
+        d = (d + (actions == 2) - (actions == 0)) % 4
+        self.direction[idx] = d
+
+        # Calcular nova posição
+        nx = self.head_x[idx] + DX[d]
+        ny = self.head_y[idx] + DY[d]
+
+        # Colisão com parede primeiro
+        wall = (nx < 0) | (nx >= w) | (ny < 0) | (ny >= h)
+        cell = np.where(wall, 0, ny * w + nx)
+
+        # Colisão com corpo (new_head in snake[:-1]): a cauda ainda vai sair
+        hp = self.head_ptr[idx]
+        length = self.length[idx]
+        tail = self.body[idx, (hp + length - 1) % cap]
+        body = ~wall & self.grid[idx, cell] & (cell != tail)
+
+        # Energia (só conta se não colidiu)
+        starve = ~wall & ~body & (self.energy[idx] <= 0)
+
+        dead = wall | body | starve
+        rewards[idx[wall]] = -10.0
+        rewards[idx[body]] = -30.0
+        rewards[idx[starve]] = -1.0
+        reasons[idx[wall]] = REASON_WALL
+        reasons[idx[body]] = REASON_BODY
+        reasons[idx[starve]] = REASON_STARVATION
+        dones[idx[dead]] = True
+        self.done[idx[dead]] = True
+
+        # Mover os sobreviventes
+        alive = ~dead
+        mv = idx[alive]
+        if len(mv) == 0:
+            return
+        cell = cell[alive]
+        tail = tail[alive]
+        hp = hp[alive]
+
+        eat = cell == self.apple_y[mv] * w + self.apple_x[mv]
+
+        # Quem não comeu solta a cauda antes de ocupar a nova cabeça
+        # (a nova cabeça pode ser a célula onde estava a cauda)
+        self._vacate(mv[~eat], tail[~eat])
+
+        hp = (hp - 1) % cap
+        self.head_ptr[mv] = hp
+        self.body[mv, hp] = cell
+        self._occupy(mv, cell)
+        self.head_x[mv] = cell % w
+        self.head_y[mv] = cell // w
+
+        # Comer Maçã
+        eaters = mv[eat]
+        if len(eaters) == 0:
+            return
+        self.length[eaters] += 1
+        self.score[eaters] += 1
+        rewards[eaters] = 10.0
+        self.energy[eaters] = self.initial_energy + self.length[eaters] * 2
+
+        self._finish_eating(eaters, tail[eat], dones, reasons)
+
+    def snake(self, i: int) -> list[tuple[int, int]]:
+        """Corpo do jogo i como lista de (x, y), cabeça primeiro (igual a SnakeEnv.snake)."""
+        cells = self.body[i, (self.head_ptr[i] + np.arange(self.length[i])) % self.capacity]
+        return [(int(c % self.width), int(c // self.width)) for c in cells]
+
+    def encode(self, indices: np.ndarray | None = None) -> np.ndarray:
+        """
+        Versão em lote de `encode_state` para os jogos indicados (todos se None).
+        Retorna array (len(indices), 8) float32 com os mesmos valores.
+        """
+        if indices is None:
+            indices = np.arange(self.num_envs)
+        indices = np.asarray(indices, dtype=np.intp)
+        m = len(indices)
+
+        if self.use_jit:
+            state = np.empty((m, 8), dtype=np.float32)
+            jit_kernels.encode_kernel(
+                indices, self.grid, self.body, self.head_ptr, self.length,
+                self.head_x, self.head_y, self.direction, self.apple_x, self.apple_y,
+                self.width, self.height, state
+            )
+            return state
+
+        w = self.width
+        h = self.height
+        cap = self.capacity
+
+        hx = self.head_x[indices]
+        hy = self.head_y[indices]
+        d = self.direction[indices].astype(np.int32)
+        grid = self.grid[indices]
+        length = self.length[indices]
+        tail = self.body[indices, (self.head_ptr[indices] + length - 1) % cap]
+
+        # Pontos candidatos: Frente, Direita, Esquerda
+        dirs = np.stack([d, (d + 1) % 4, (d - 1) % 4], axis=1)
+        px = hx[:, None] + DX[dirs]
+        py = hy[:, None] + DY[dirs]
+        inside = (px >= 0) & (px < w) & (py >= 0) & (py < h)
+        cells = np.where(inside, py * w + px, 0)
+        rows = np.arange(m)[:, None]
+
+        # 1. Perigo (parede ou qualquer parte do corpo)
+        occupied = grid[rows, cells]
+        danger = (~inside | occupied).astype(np.float64)
+
+        # 2. Maçã (Ângulo relativo à direção)
+        angle_apple = np.arctan2(self.apple_y[indices] - hy, self.apple_x[indices] - hx)
+        angle_head = np.arctan2(DY[d], DX[d])
+        angle_diff = angle_apple - angle_head
+        angle_diff = np.where(angle_diff > np.pi, angle_diff - 2 * np.pi, angle_diff)
+        angle_diff = np.where(angle_diff <= -np.pi, angle_diff + 2 * np.pi, angle_diff)
+        norm_angle = angle_diff / np.pi
+
+        # 3. Tamanho
+        norm_len = length / (w * h)
+
+        # 4. Caminho para Cauda: BFS a partir da cauda sobre as células livres
+        # (obstáculos = corpo sem a cauda), resolvendo os 3 candidatos de uma vez
+        is_tail = cells == tail[:, None]
+        valid = inside & (~occupied | is_tail)
+        dist = self._tail_distances(grid, tail, cells, valid)
+        tail_paths = np.where(dist >= 0, 1.0 / np.maximum(1, dist), 0.0)
+
+        danger[tail_paths == 0.0] = 1.0
+
+        state = np.empty((m, 8), dtype=np.float32)
+        state[:, 0:3] = danger
+        state[:, 3] = norm_angle
+        state[:, 4] = norm_len
+        state[:, 5:8] = tail_paths
+        return state
+
+    def _tail_distances(self, grid, tail, cells, valid) -> np.ndarray:
+        """
+        BFS simultânea em todos os tabuleiros partindo da cauda.
+        Retorna (m, 3) com a distância até cada candidato, ou -1 se inalcançável.
+        """
+        m = len(tail)
+        w = self.width
+        h = self.height
+        rows = np.arange(m)
+
+        free = ~grid.reshape(m, h, w)
+        free.reshape(m, -1)[rows, tail] = True
+
+        visited = np.zeros((m, h, w), dtype=np.bool_)
+        visited.reshape(m, -1)[rows, tail] = True
+        frontier = visited.copy()
+
+        dist = np.full(cells.shape, -1, dtype=np.int32)
+        dist[valid & (cells == tail[:, None])] = 0
+        pending = valid & (dist < 0)
+
+        active = np.flatnonzero(pending.any(axis=1))
+        cost = 0
+        while len(active) > 0:
+            cost += 1
+            f = frontier[active]
+            grown = np.zeros_like(f)
+            grown[:, 1:, :] |= f[:, :-1, :]
+            grown[:, :-1, :] |= f[:, 1:, :]
+            grown[:, :, 1:] |= f[:, :, :-1]
+            grown[:, :, :-1] |= f[:, :, 1:]
+            grown &= free[active] & ~visited[active]
+
+            visited[active] |= grown
+            frontier[active] = grown
+
+            reached = grown.reshape(len(active), -1)[np.arange(len(active))[:, None], cells[active]]
+            hit = reached & pending[active]
+            sub = dist[active]
+            sub[hit] = cost
+            dist[active] = sub
+            pending[active] &= ~hit
+
+            # Continua só quem ainda tem candidato pendente e fronteira não vazia
+            keep = pending[active].any(axis=1) & grown.reshape(len(active), -1).any(axis=1)
+            active = active[keep]
+
+        return dist
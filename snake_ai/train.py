@@ -0,0 +1,197 @@
+"""
+Treinamento sem interface gráfica (servidores sem display, lotes de experimentos).
+
+Lê a configuração de arquivos TOML/JSON (mesmas chaves de `DEFAULT_CONFIG` em
+snake_ai/training/trainer.py), aplica os `--set chave=valor` e escreve o progresso
+em JSON lines no stdout: um evento "generation" por geração e um "run_end" por
+treinamento. Vários arquivos e/ou `--runs N` rodam um treinamento após o outro no
+mesmo processo, com sementes seed+0, seed+1, ... (`--same-seed` mantém a mesma).
+`--resume` continua um treinamento a partir do seu checkpoint
+(a configuração vem do checkpoint; `--set` ainda vale, ex.: mais gerações).
+`--dashboard` abre o dashboard ao vivo em um processo separado (precisa de
+display); `kill -USR1 <pid>` abre/fecha o dashboard durante o treinamento.
+
+Uso:
+    python -m snake_ai.train --config exp.toml --set population_size=300 --set racing=true
+    python -m snake_ai.train --config a.toml b.json --runs 3 --seed 0
+    python -m snake_ai.train --resume models/checkpoint_<run>.npz --set generations=2000
+"""
+import argparse
+import json
+import os
+import signal
+import sys
+import time
+
+from .training.trainer import Trainer, DEFAULT_CONFIG, resolve_config
+from .utils.paths import MODELS_DIR
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
+
+def load_config_file(path: str) -> dict:
+    """Lê um arquivo .toml ou .json; no TOML as chaves podem vir em tabelas ([env], [ga], ...)."""
+    if path.endswith(".toml"):
+        if tomllib is None:
+            raise RuntimeError("Arquivos TOML exigem Python 3.11+ (tomllib); use JSON.")
+        with open(path, "rb") as f:
+            data = tomllib.load(f)
+    else:
+        with open(path) as f:
+            data = json.load(f)
+
+    # Tabelas só organizam o arquivo: as chaves são achatadas
+    config = {}
+    for key, value in data.items():
+        if isinstance(value, dict):
+            config.update(value)
+        else:
+            config[key] = value
+    return config
+
+def parse_override(text: str) -> tuple[str, object]:
+    """`chave=valor`, com o valor lido como JSON (números, true/false, null, listas) ou texto."""
+    key, sep, raw = text.partition("=")
+    if not sep or not key:
+        raise argparse.ArgumentTypeError(f"Esperado chave=valor, recebido {text!r}")
+    try:
+        value = json.loads(raw)
+    except json.JSONDecodeError:
+        value = raw
+    return key.strip(), value
+
+def emit(event: str, **fields) -> None:
+    print(json.dumps({"event": event, **fields}), flush=True)
+
+class DashboardToggle:
+    """
+    Liga o dashboard em processo separado ao callback de geração: `--dashboard`
+    abre na largada e SIGUSR1 abre/fecha no meio do treinamento. O módulo do
+    dashboard só é importado quando ele é aberto pela primeira vez.
+    """
+
+    def __init__(self, attach: bool, num_games: int = 9, speed: int = 30):
+        self.num_games = num_games
+        self.speed = speed
+        self.requested = attach
+        self.dashboards = {}  # run -> DashboardProcess
+        if hasattr(signal, "SIGUSR1"):
+            signal.signal(signal.SIGUSR1, self._on_signal)
+
+    def _on_signal(self, signum, frame) -> None:
+        self.requested = not self.requested
+
+    def submit(self, run: int, trainer: Trainer, record: dict, population, fitness) -> None:
+        dashboard = self.dashboards.get(run)
+        if dashboard is None:
+            if not self.requested:
+                return
+            from .visualization.dashboard_process import DashboardProcess
+            dashboard = DashboardProcess(trainer.env_config, trainer.config["layer_sizes"],
+                                         caption=f"Snake AI - run {run}", num_games=self.num_games, speed=self.speed)
+            self.dashboards[run] = dashboard
+        if dashboard.closed_by_user():
+            self.requested = False
+        if self.requested != dashboard.attached:
+            dashboard.toggle()
+        if not dashboard.attached:
+            dashboard.submit(record["generation"], record["best_fitness"], record["mean_fitness"])
+            return
+        order = sorted(range(len(fitness)), key=lambda i: fitness[i], reverse=True)[:self.num_games]
+        dashboard.submit(record["generation"], record["best_fitness"], record["mean_fitness"],
+                         trainer.trajectories(order, replay=False), population[order[0]])
+
+    def finish(self, run: int) -> None:
+        dashboard = self.dashboards.pop(run, None)
+        if dashboard is not None:
+            dashboard.close()
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Treinamento headless do Snake AI (progresso em JSON lines).")
+    parser.add_argument("--config", nargs="*", default=[None], metavar="ARQUIVO",
+                        help="Arquivos .toml/.json; um treinamento por arquivo (padrão: só os defaults)")
+    parser.add_argument("--set", dest="overrides", action="append", type=parse_override, default=[],
+                        metavar="CHAVE=VALOR", help="Sobrescreve uma chave da configuração (repetível)")
+    parser.add_argument("--runs", type=int, default=1,
+                        help="Treinamentos por arquivo de configuração; com mais de um treinamento no lote, "
+                             "a semente (de --seed ou do arquivo) vira seed+0, seed+1, ... pela posição no lote")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Semente do primeiro treinamento; os seguintes usam seed+1, seed+2, ...")
+    parser.add_argument("--same-seed", action="store_true",
+                        help="Todos os treinamentos do lote usam a mesma semente (repetições idênticas)")
+    parser.add_argument("--resume", metavar="CHECKPOINT", default=None,
+                        help="Continua o treinamento salvo neste checkpoint (ignora --config/--runs/--seed)")
+    parser.add_argument("--dashboard", action="store_true",
+                        help="Abre o dashboard ao vivo em outro processo (kill -USR1 <pid> abre/fecha)")
+    parser.add_argument("--print-defaults", action="store_true", help="Mostra a configuração padrão em JSON e sai")
+    args = parser.parse_args(argv)
+
+    if args.print_defaults:
+        print(json.dumps(DEFAULT_CONFIG, indent=2))
+        return 0
+
+    dashboard = DashboardToggle(args.dashboard)
+
+    if args.resume:
+        try:
+            with Trainer.resume(args.resume, dict(args.overrides)) as trainer:
+                emit("run_start", run=0, resumed_from=args.resume, generation=trainer.generation, config=trainer.config)
+
+                def on_generation(record, population, fitness):
+                    emit("generation", run=0, **record)
+                    dashboard.submit(0, trainer, record, population, fitness)
+
+                summary = trainer.run(on_generation)
+        except KeyboardInterrupt:
+            emit("interrupted", run=0)
+            return 130
+        finally:
+            dashboard.finish(0)
+        emit("run_end", run=0, **summary)
+        return 0
+
+    jobs = []
+    for path in args.config or [None]:
+        base = load_config_file(path) if path else {}
+        base.update(dict(args.overrides))
+        try:
+            resolve_config(base)
+        except ValueError as e:
+            parser.error(f"{path or 'defaults'}: {e}")
+        for _ in range(args.runs):
+            jobs.append((path, dict(base)))
+
+    batch = time.strftime("%Y%m%d-%H%M%S")
+    for index, (path, config) in enumerate(jobs):
+        if args.seed is not None:
+            config["seed"] = args.seed
+        if config.get("seed") is not None and not args.same_seed:
+            # Cada treinamento do lote com a sua semente (senão o lote repete o mesmo treino)
+            config["seed"] += index
+        if len(jobs) > 1:
+            # Nomes e pastas de modelos distintos para não sobrescrever entre treinamentos
+            config["run_name"] = f"{config.get('run_name') or batch}_{index:03d}"
+            if config.get("models_dir") is None:
+                config["models_dir"] = os.path.join(MODELS_DIR, config["run_name"])
+
+        try:
+            with Trainer(config) as trainer:
+                emit("run_start", run=index, config_file=path, config=trainer.config)
+
+                def on_generation(record, population, fitness):
+                    emit("generation", run=index, **record)
+                    dashboard.submit(index, trainer, record, population, fitness)
+
+                summary = trainer.run(on_generation)
+        except KeyboardInterrupt:
+            emit("interrupted", run=index)
+            return 130
+        finally:
+            dashboard.finish(index)
+        emit("run_end", run=index, **summary)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
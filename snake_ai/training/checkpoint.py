@@ -0,0 +1,76 @@
+"""
+Checkpoints do treinamento em um único .npz.
+
+`save_checkpoint` recebe um dict plano: arrays com pelo menos uma dimensão viram
+membros do .npz, e o resto (escalares, listas, config) vai junto em um único
+membro JSON "meta". Cada membro do zip tem um custo fixo de escrita, então juntar
+os valores pequenos mantém o checkpoint barato. Floats passam pelo JSON sem perda
+(repr exato, incluindo inf/nan).
+
+A escrita é atômica: vai para um arquivo temporário na mesma pasta, que é
+sincronizado em disco e então renomeado por cima do anterior, de modo que um
+processo morto no meio da escrita deixa o checkpoint antigo intacto.
+"""
+import json
+import os
+import random
+import tempfile
+import numpy as np
+
+CHECKPOINT_VERSION = 1
+
+def _to_json(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Valor não serializável no checkpoint: {type(value).__name__}")
+
+def save_checkpoint(path: str, state: dict) -> None:
+    """Grava `state` (nome -> array, escalar ou estrutura JSON) em `path` de forma atômica."""
+    arrays = {name: value for name, value in state.items() if isinstance(value, np.ndarray) and value.ndim > 0}
+    meta = {name: value for name, value in state.items() if name not in arrays}
+    meta["version"] = CHECKPOINT_VERSION
+    arrays["meta"] = np.frombuffer(json.dumps(meta, default=_to_json).encode(), dtype=np.uint8)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=".checkpoint-", suffix=".npz", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, **arrays)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def load_checkpoint(path: str) -> dict:
+    """Lê um checkpoint gravado por `save_checkpoint` (mesmo dict plano)."""
+    with np.load(path, allow_pickle=False) as data:
+        state = {name: data[name] for name in data.files}
+    meta = json.loads(state.pop("meta").tobytes().decode())
+    version = meta.pop("version")
+    if version != CHECKPOINT_VERSION:
+        raise ValueError(f"Versão de checkpoint não suportada: {version} (esperado {CHECKPOINT_VERSION})")
+    state.update(meta)
+    return state
+
+def rng_state() -> dict:
+    """Estados do np.random global e do módulo random."""
+    _, keys, pos, has_gauss, cached_gaussian = np.random.get_state()
+    version, internal, gauss_next = random.getstate()
+    return {
+        "np_rng_keys": keys,
+        "np_rng": [pos, has_gauss, cached_gaussian],
+        "py_rng_state": np.array(internal, dtype=np.uint64),
+        "py_rng": [version, gauss_next],
+    }
+
+def set_rng_state(state: dict) -> None:
+    """Restaura os geradores a partir do que `rng_state` gravou."""
+    pos, has_gauss, cached_gaussian = state["np_rng"]
+    np.random.set_state(("MT19937", state["np_rng_keys"], pos, has_gauss, cached_gaussian))
+    version, gauss_next = state["py_rng"]
+    random.setstate((version, tuple(int(v) for v in state["py_rng_state"]), gauss_next))
@@ -0,0 +1,168 @@
+"""
+Detecção de ciclos para encerrar cedo episódios em que a cobra fica rodando sem comer.
+
+Entre duas maçãs o jogo é determinístico e não depende da energia: a ação vem do
+encode (corpo, direção, maçã, tamanho) e o sorteio da maçã só acontece ao comer.
+Se o estado (corpo em ordem + maçã) se repete sem comer, a cobra vai repetir o
+mesmo trecho até morrer de fome (ou até o limite de passos). Nesse caso o episódio
+pode ser encerrado na hora, com o resultado projetado por `project_starvation`,
+idêntico ao que o jogo daria rodando até o fim.
+
+O estado é resumido por um hash rolante do corpo, atualizado em O(1) a cada passo:
+    H = soma_k (célula_k + 1) * B^k  (mod 2^64), k = 0 na cabeça.
+Um passo sem comer vira H' = B * H + (nova cabeça + 1) - (cauda + 1) * B^L. A
+direção é a da cabeça em relação ao segmento seguinte (já está no corpo) e a maçã
+não muda até a próxima janela, que começa a cada maçã comida. Todo acerto do hash
+é conferido comparando o corpo, então um ciclo só é declarado se for real.
+"""
+import numpy as np
+from ..env.snake_env import REASON_NONE, REASON_STARVATION
+
+HASH_BASE = 0x9E3779B97F4A7C15
+_MASK = (1 << 64) - 1
+
+def project_starvation(steps, energy, max_steps: int):
+    """
+    Passos finais e código do motivo de término de uma cobra presa em um ciclo
+    após `steps` passos com `energy` restante (escalares ou arrays): morre de
+    fome no passo steps + energy, a menos que o limite de passos chegue antes.
+    """
+    starve_at = steps + energy
+    final_steps = np.minimum(starve_at, max_steps)
+    reason = np.where(starve_at <= max_steps, REASON_STARVATION, REASON_NONE)
+    return final_steps, reason
+
+class CycleDetector:
+    """
+    Detector para um `SnakeEnv`: guarda o hash de cada estado da janela atual
+    (desde a última maçã) e encontra a primeira repetição.
+    Uso: `reset(env)` no início do episódio e `step(env)` após cada passo; quando
+    `step` acha o ciclo, `period` tem o número de passos de uma volta.
+    """
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.period = 0
+        self.powers = [pow(HASH_BASE, k, 1 << 64) for k in range(width * height + 1)]
+
+    def reset(self, env) -> None:
+        w = self.width
+        # Células das cabeças em ordem; o corpo é sempre heads[-len(snake):] invertido
+        self.heads = [y * w + x for x, y in reversed(env.snake)]
+        self._start_window(env)
+
+    def _start_window(self, env) -> None:
+        length = len(env.snake)
+        self.length = length
+        self.score = env.score
+        self.hash = 0
+        for k, cell in enumerate(reversed(self.heads[-length:])):
+            self.hash = (self.hash + (cell + 1) * self.powers[k]) & _MASK
+        self.seen = {self.hash: len(self.heads)}
+
+    def step(self, env) -> bool:
+        """Registra o passo; True se o estado atual já apareceu nesta janela (ciclo provado)."""
+        x, y = env.snake[0]
+        head = y * self.width + x
+        self.heads.append(head)
+
+        if env.score != self.score:
+            self._start_window(env)
+            return False
+
+        tail = self.heads[-self.length - 1]
+        self.hash = (self.hash * HASH_BASE + head + 1 - (tail + 1) * self.powers[self.length]) & _MASK
+        end = len(self.heads)
+        previous = self.seen.get(self.hash)
+        if previous is not None and self.heads[previous - self.length:previous] == self.heads[end - self.length:]:
+            # Passos de uma volta: daqui em diante as ações se repetem com este período
+            self.period = end - previous
+            return True
+        self.seen[self.hash] = end
+        return False
+
+class VecCycleDetector:
+    """
+    Detector em lote para um `VecSnakeEnv`, com o mesmo hash do `CycleDetector`.
+
+    Guardar todos os hashes de cada jogo exigiria um dict por jogo; aqui cada jogo
+    guarda só um estado de referência, renovado quando o número de passos da janela
+    é potência de 2 (algoritmo de Brent). O ciclo é achado no máximo cerca de duas
+    voltas depois de começar, com custo O(1) vetorizado por passo. Quando `step`
+    acha o ciclo de um jogo, `period` guarda os passos desde o estado de referência
+    (uma volta ou um múltiplo dela: as ações se repetem com esse período).
+    """
+
+    def __init__(self, venv):
+        self.venv = venv
+        n, cap = venv.num_envs, venv.capacity
+        powers = np.empty(cap + 1, dtype=np.uint64)
+        value = 1
+        for k in range(cap + 1):
+            powers[k] = value
+            value = (value * HASH_BASE) & _MASK
+        self.powers = powers
+        self.hash = np.zeros(n, dtype=np.uint64)
+        self.window_steps = np.zeros(n, dtype=np.int64)
+        self.saved_hash = np.zeros(n, dtype=np.uint64)
+        self.saved_body = np.zeros((n, cap), dtype=np.int32)
+        self.saved_steps = np.zeros(n, dtype=np.int64)
+        self.period = np.zeros(n, dtype=np.int64)
+        self.score = np.zeros(n, dtype=np.int64)
+
+    def _ordered_body(self, rows: np.ndarray) -> np.ndarray:
+        """Corpo em ordem (cabeça primeiro) dos jogos `rows`; posições além do tamanho valem -1."""
+        venv = self.venv
+        k = np.arange(venv.capacity)
+        cells = venv.body[rows[:, None], (venv.head_ptr[rows, None] + k) % venv.capacity]
+        return np.where(k < venv.length[rows, None], cells, -1)
+
+    def start_window(self, rows: np.ndarray) -> None:
+        """Começa uma janela nova (início do episódio ou maçã comida) nos jogos `rows`."""
+        if len(rows) == 0:
+            return
+        body = self._ordered_body(rows)
+        with np.errstate(over="ignore"):
+            terms = (body + 1).astype(np.uint64) * self.powers[:-1]
+        self.hash[rows] = terms.sum(axis=1, dtype=np.uint64)
+        self.window_steps[rows] = 0
+        self.saved_hash[rows] = self.hash[rows]
+        self.saved_body[rows] = body
+        self.saved_steps[rows] = 0
+        self.score[rows] = self.venv.score[rows]
+
+    def tails(self, rows: np.ndarray) -> np.ndarray:
+        """Caudas atuais dos jogos `rows` (chamar antes do passo)."""
+        venv = self.venv
+        return venv.body[rows, (venv.head_ptr[rows] + venv.length[rows] - 1) % venv.capacity]
+
+    def step(self, rows: np.ndarray, old_tails: np.ndarray) -> np.ndarray:
+        """
+        Atualiza os jogos `rows` (ainda vivos após o passo; `old_tails` são as caudas
+        de antes do passo) e retorna os que estão comprovadamente em um ciclo.
+        """
+        venv = self.venv
+        ate = venv.score[rows] != self.score[rows]
+        self.start_window(rows[ate])
+        rows, old_tails = rows[~ate], old_tails[~ate]
+        if len(rows) == 0:
+            return rows
+
+        head = venv.body[rows, venv.head_ptr[rows]].astype(np.uint64)
+        with np.errstate(over="ignore"):
+            self.hash[rows] = (self.hash[rows] * np.uint64(HASH_BASE) + head + np.uint64(1)
+                               - (old_tails.astype(np.uint64) + np.uint64(1)) * self.powers[venv.length[rows]])
+        self.window_steps[rows] += 1
+
+        # Acerto do hash: conferir o corpo salvo
+        hits = rows[self.hash[rows] == self.saved_hash[rows]]
+        cycles = hits[np.all(self._ordered_body(hits) == self.saved_body[hits], axis=1)] if len(hits) else hits
+        self.period[cycles] = self.window_steps[cycles] - self.saved_steps[cycles]
+
+        # Renovar o estado de referência nas potências de 2
+        steps = self.window_steps[rows]
+        renew = rows[(steps & (steps - 1)) == 0]
+        self.saved_hash[renew] = self.hash[renew]
+        self.saved_body[renew] = self._ordered_body(renew)
+        self.saved_steps[renew] = self.window_steps[renew]
+        return cycles
@@ -1,95 +1,672 @@
+import sys
+from typing import TYPE_CHECKING
 import numpy as np
-from ..env.snake_env import SnakeEnv
+from ..env.snake_env import SnakeEnv, REASON_CODES, REASON_WALL, REASON_BODY
 from ..env.state_encoding import encode_state
-from ..agents.neural_net import NeuralNetwork
+from ..agents.neural_net import NeuralNetwork, PopulationNetwork
 
-def evaluate_genome(
+# Detecção de ciclos, gravação de trajetórias e profiler são importados onde são
+# usados: um worker que não usa esses recursos carrega só o ambiente, o encode e a rede
+if TYPE_CHECKING:
+    from ..env.trajectory import Trajectory, TrajectoryRecorder
+    from .cycle_detection import CycleDetector
+
+_PROFILER_MODULE = f"{__package__.rsplit('.', 1)[0]}.utils.profiler"
+
+EVAL_BACKENDS = ("serial", "lockstep", "vectorized")
+
+# Stats por genoma devolvidos pela avaliação (somados entre episódios / médios / do episódio 0)
+SUMMED_STATS = ("steps", "steps_saved")
+MEAN_STATS = ("score", "episode_steps")
+GENOME_STATS = SUMMED_STATS + MEAN_STATS + ("reason",)
+
+def _active_profiler():
+    """
+    O módulo `snake_ai.utils.profiler` se ele estiver ligado, senão None. Só quem
+    liga o profiler o importa, então aqui basta olhar se ele já foi carregado.
+    """
+    profiler = sys.modules.get(_PROFILER_MODULE)
+    return profiler if profiler is not None and profiler.enabled() else None
+
+def episode_fitness(score, steps, final_len, reason, size_threshold: float):
+    """
+    Fitness de um episódio com heurística dinâmica.
+    Aceita escalares ou arrays NumPy (um valor por episódio); `reason` é um
+    código REASON_* de `snake_ai.env.snake_env`.
+
+    Fase 1 (Pequena): Foco total em comer (reward alto por maçã).
+    Fase 2 (Grande): Foco em sobreviver (reward alto por passos) e penalidade alta por colisão.
+    """
+    # Recompensa base por passos (incentiva movimento e sobrevivência)
+    base = (score * 100) + (steps * 0.5)
+
+    # FASE DE CRESCIMENTO
+    # Prioridade: Comer.
+    # Maçã vale muito (100). Passo vale pouco (0.5 já adicionado).
+    # Penalidade extra se morreu cedo sem comer nada (-50)
+    # Penalidade aumentada por bater na parede (-500)
+    growth = base - np.where(score == 0, 50, 0) - np.where(reason == REASON_WALL, 500, 0)
+
+    # FASE DE SOBREVIVÊNCIA
+    # Prioridade: Manter-se vivo (evitar auto-colisão).
+    # Passo vale mais (total 2.0 por passo) e bônus extra por tamanho grande.
+    # O score * 200 garante que comer ainda é melhor que só rodar,
+    # mas steps * 2.0 faz com que 100 passos valham tanto quanto 1 maçã.
+    survival = base + steps * 1.5 + score * 200
+    # Penalidade extremamente alta por colisão com parede na fase de sobrevivência
+    survival = survival - np.where(reason == REASON_WALL, 800, 0)
+    # Penalidade extremamente severa por auto-colisão
+    survival = survival - np.where(reason == REASON_BODY, 1000, 0)
+
+    fitness = np.where(final_len < size_threshold, growth, survival)
+    return np.maximum(0, fitness) # Fitness não negativo
+
+def run_episode(
+    env: SnakeEnv,
+    nn: NeuralNetwork,
+    max_steps: int = 2000,
+    detector: "CycleDetector | None" = None,
+    recorder: "TrajectoryRecorder | None" = None
+) -> tuple[int, int, int, int, int]:
+    """
+    Joga um episódio a partir do estado atual de `env`.
+    Com `detector`, o episódio para assim que a cobra entra comprovadamente em um
+    ciclo sem comer, e o resultado é projetado como se ela tivesse morrido de fome.
+    Com `recorder`, as ações e as maçãs do episódio são gravadas (ver `record_episode`).
+    Retorna (score, passos, tamanho final, código do motivo de término, passos jogados).
+    """
+    done = False
+    steps = 0
+    collision_reason = None
+    if detector is not None:
+        from .cycle_detection import project_starvation
+        detector.reset(env)
+    if recorder is not None:
+        recorder.start(env)
+
+    # Cronômetros por fase só com o profiler ligado (acumulados aqui, somados no fim)
+    profiler = _active_profiler()
+    timed = profiler is not None
+    clock = profiler.clock if timed else None
+    t_encode = t_forward = t_step = t_cycles = 0.0
+    cycle_calls = 0
+    result = None
+
+    while not done and steps < max_steps:
+        if timed:
+            t0 = clock()
+        state_vec = encode_state(env)
+        if timed:
+            t1 = clock()
+        output = nn.forward(state_vec)
+        action = np.argmax(output)
+        if timed:
+            t2 = clock()
+
+        _, _, done, info = env.step(action)
+        steps += 1
+        if recorder is not None:
+            recorder.step(env, action)
+        if timed:
+            t3 = clock()
+            t_encode += t1 - t0
+            t_forward += t2 - t1
+            t_step += t3 - t2
+
+        # Capturar motivo da colisão se o jogo terminou
+        if done and "reason" in info:
+            collision_reason = info["reason"]
+
+        if not done and steps < max_steps and detector is not None:
+            cycle = detector.step(env)
+            if timed:
+                t_cycles += clock() - t3
+                cycle_calls += 1
+            if cycle:
+                final_steps, reason = project_starvation(steps, env.energy, max_steps)
+                result = env.score, int(final_steps), len(env.snake), int(reason), steps
+                if recorder is not None:
+                    recorder.end_cycle(detector.period, int(final_steps))
+                break
+
+    if timed:
+        profiler.add("encode", t_encode, steps, steps)
+        profiler.add("forward", t_forward, steps, steps)
+        profiler.add("env_step", t_step, steps, steps)
+        if cycle_calls:
+            profiler.add("cycle_detection", t_cycles, cycle_calls, cycle_calls)
+    if result is not None:
+        return result
+    return env.score, steps, len(env.snake), REASON_CODES[collision_reason], steps
+
+def _evaluate_genome_stats(
     genome: np.ndarray,
     nn: NeuralNetwork,
     env_config: dict,
-    num_episodes: int = 3
-) -> float:
+    num_episodes: int,
+    seeds: list[int] | None,
+    max_steps: int,
+    detect_cycles: bool = True,
+    record: bool = False
+) -> tuple[float, int, int, float, float, int, "Trajectory | None"]:
     """
-    Avalia o fitness com heurística dinâmica.
-    
-    Fase 1 (Pequena): Foco total em comer (reward alto por maçã).
-    Fase 2 (Grande): Foco em sobreviver (reward alto por passos) e penalidade alta por colisão.
+    Retorna (fitness médio, total de passos jogados, passos poupados pela detecção
+    de ciclos, score médio, duração média dos episódios, motivo de término do
+    episódio 0, trajetória do episódio 0 se `record`, senão None).
     """
-    
     nn.set_weights_flat(genome)
-    
-    total_fitness = 0.0
-    
+
     # Criar ambiente
     env = SnakeEnv(**env_config)
-    
+    detector = None
+    if detect_cycles:
+        from .cycle_detection import CycleDetector
+        detector = CycleDetector(env.width, env.height)
+
     # Threshold para considerar "Grande" (ex: 10% do grid)
     # Se grid 10x10 = 100. Grande > 10.
     size_threshold = (env.width * env.height) * 0.1
-    
-    for _ in range(num_episodes):
-        env.reset()
-        done = False
-        steps = 0
-        episode_fitness = 0.0
-        
-        max_steps = 2000 
-        
-        collision_reason = None
-        while not done and steps < max_steps:
-            state_vec = encode_state(env)
-            output = nn.forward(state_vec)
-            action = np.argmax(output)
-            
-            _, _, done, info = env.step(action)
-            steps += 1
-            
-            # Capturar motivo da colisão se o jogo terminou
-            if done and "reason" in info:
-                collision_reason = info["reason"]
-            
-        score = env.score
-        final_len = len(env.snake)
-        
-        # --- HEURÍSTICA DINÂMICA ---
-        
-        # Recompensa base por passos (incentiva movimento e sobrevivência)
-        episode_fitness = (score * 100) + (steps * 0.5)
-        
-        if final_len < size_threshold:
-            # FASE DE CRESCIMENTO
-            # Prioridade: Comer.
-            # Maçã vale muito (100). Passo vale pouco (0.5 já adicionado).
-            
-            # Penalidade extra se morreu cedo sem comer nada
-            if score == 0:
-                episode_fitness -= 50 # Punição forte por incompetência inicial
-            
-            # Penalidade aumentada por bater na parede
-            if collision_reason == "wall_collision":
-                episode_fitness -= 500 # Penalidade alta por colisão com parede
-                
+
+    total_fitness = 0.0
+    total_steps = 0
+    total_saved = 0
+    total_score = 0
+    total_length = 0
+    first_reason = 0
+    recorder = None
+    if record:
+        from ..env.trajectory import TrajectoryRecorder
+        recorder = TrajectoryRecorder(env_config, seeds[0] if seeds is not None else None)
+    for ep in range(num_episodes):
+        env.reset(seed=seeds[ep] if seeds is not None else None)
+        score, steps, final_len, reason, played = run_episode(env, nn, max_steps, detector,
+                                                              recorder if ep == 0 else None)
+        total_fitness += float(episode_fitness(score, steps, final_len, reason, size_threshold))
+        total_steps += played
+        total_saved += steps - played
+        total_score += score
+        total_length += steps
+        if ep == 0:
+            first_reason = reason
+
+    return (total_fitness / num_episodes, total_steps, total_saved,
+            total_score / num_episodes, total_length / num_episodes, first_reason,
+            recorder.trajectory() if recorder is not None else None)
+
+def evaluate_genome(
+    genome: np.ndarray,
+    nn: NeuralNetwork,
+    env_config: dict,
+    num_episodes: int = 3,
+    seeds: list[int] | None = None,
+    max_steps: int = 2000,
+    detect_cycles: bool = True
+) -> float:
+    """
+    Avalia o fitness médio de um genoma em `num_episodes` episódios.
+    Se `seeds` for passado (uma por episódio), o posicionamento das maçãs é reprodutível.
+    `detect_cycles` encerra cedo episódios presos em ciclos (mesmo fitness, menos passos).
+    """
+    fitness = _evaluate_genome_stats(genome, nn, env_config, num_episodes, seeds, max_steps, detect_cycles)[0]
+    return fitness
+
+def record_episode(
+    genome: np.ndarray,
+    nn: NeuralNetwork,
+    env_config: dict,
+    seed: int | None = None,
+    max_steps: int = 2000,
+    detect_cycles: bool = True
+) -> "Trajectory":
+    """
+    Joga um episódio gravando a trajetória (ações e maçãs). Com a seed de um
+    episódio da avaliação é o mesmo jogo que rendeu o fitness daquele episódio;
+    no treinamento, prefira `evaluate_population(..., record=True)`, que grava o
+    episódio 0 enquanto ele é jogado.
+    Com `detect_cycles` a gravação para quando a cobra entra em um ciclo e guarda
+    o período: a reprodução repete a última volta até o fim projetado, então o
+    jogo reproduzido é o jogo inteiro sem que o ciclo seja jogado com a rede.
+    """
+    from ..env.trajectory import TrajectoryRecorder
+    from .cycle_detection import CycleDetector
+    nn.set_weights_flat(genome)
+    env = SnakeEnv(**env_config)
+    env.reset(seed=seed)
+    detector = CycleDetector(env.width, env.height) if detect_cycles else None
+    recorder = TrajectoryRecorder(env_config, seed)
+    run_episode(env, nn, max_steps, detector, recorder)
+    return recorder.trajectory()
+
+def evaluate_population(
+    population: list[np.ndarray] | np.ndarray,
+    nn: NeuralNetwork,
+    env_config: dict,
+    num_episodes: int = 3,
+    backend: str = "serial",
+    seeds: list[int] | None = None,
+    max_steps: int = 2000,
+    detect_cycles: bool = True,
+    record: bool = False
+) -> tuple[np.ndarray, dict]:
+    """
+    Avalia todos os genomas da população (lista de genomas ou matriz (P, genome_size)).
+
+    backend:
+        "serial": um `SnakeEnv` por vez via `evaluate_genome` (referência).
+        "lockstep": um `SnakeEnv` por episódio, todos avançando juntos com um
+                    único forward em lote da `PopulationNetwork` por passo.
+        "vectorized": todos os episódios de todos os genomas em um único `VecSnakeEnv`.
+
+    Com `detect_cycles`, episódios em que a cobra fica presa em um ciclo sem comer
+    terminam assim que o ciclo é comprovado, com o fitness de quem morre de fome
+    (igual ao de jogar até o fim). O backend serial acha a primeira repetição; o
+    vetorizado acha o ciclo um pouco depois (algoritmo de Brent), com o mesmo fitness.
+
+    Com `record`, o episódio 0 de cada genoma é gravado enquanto é jogado (uma
+    ação uint8 por passo e as maçãs sorteadas, ver `snake_ai.env.trajectory`):
+    os visualizadores reproduzem exatamente esse jogo sem simular de novo.
+
+    Returns:
+        (fitness_scores, stats): array com o fitness de cada genoma e um dict de
+        arrays por genoma (`GENOME_STATS`): "steps" (passos jogados), "steps_saved"
+        (passos poupados), "score" (maçãs por episódio, média), "episode_steps"
+        (duração média dos episódios) e "reason" (código do motivo de término do
+        episódio 0, que todos os genomas jogam com a mesma seed); com `record`,
+        também "trajectory" (array de objetos com a `Trajectory` do episódio 0).
+    """
+    if backend == "serial":
+        results = [_evaluate_genome_stats(g, nn, env_config, num_episodes, seeds, max_steps, detect_cycles, record)
+                   for g in population]
+        fitness_scores = np.array([r[0] for r in results])
+        stats = {
+            "steps": np.array([r[1] for r in results], dtype=np.int64),
+            "steps_saved": np.array([r[2] for r in results], dtype=np.int64),
+            "score": np.array([r[3] for r in results], dtype=np.float64),
+            "episode_steps": np.array([r[4] for r in results], dtype=np.float64),
+            "reason": np.array([r[5] for r in results], dtype=np.int8),
+        }
+        if record:
+            stats["trajectory"] = object_array([r[6] for r in results])
+    elif backend == "lockstep":
+        fitness_scores, stats = _evaluate_population_lockstep(population, nn, env_config, num_episodes, seeds, max_steps,
+                                                              detect_cycles, record)
+    elif backend == "vectorized":
+        fitness_scores, stats = _evaluate_population_vectorized(population, nn, env_config, num_episodes, seeds, max_steps,
+                                                                detect_cycles, record)
+    else:
+        raise ValueError(f"Backend de avaliação desconhecido: {backend!r} (opções: {EVAL_BACKENDS})")
+
+    return fitness_scores, stats
+
+def object_array(items) -> np.ndarray:
+    """Array de objetos (ex.: trajetórias, um por genoma) sem o NumPy desmontar os itens."""
+    array = np.empty(len(items), dtype=object)
+    for i, item in enumerate(items):
+        array[i] = item
+    return array
+
+def _finalize_population(final_score, final_steps, final_len, final_reason, played, size_threshold, pop_size, num_episodes):
+    """
+    Fitness médio e stats por genoma (ver `evaluate_population`) a partir dos
+    resultados (pop_size * num_episodes) dos episódios.
+    """
+    fitness = episode_fitness(final_score, final_steps, final_len, final_reason, size_threshold)
+    fitness_scores = fitness.reshape(pop_size, num_episodes).sum(axis=1) / num_episodes
+    steps = played.reshape(pop_size, num_episodes).sum(axis=1)
+    episode_steps = final_steps.reshape(pop_size, num_episodes).sum(axis=1)
+    stats = {
+        "steps": steps,
+        "steps_saved": episode_steps - steps,
+        "score": final_score.reshape(pop_size, num_episodes).sum(axis=1) / num_episodes,
+        "episode_steps": episode_steps / num_episodes,
+        "reason": final_reason.reshape(pop_size, num_episodes)[:, 0].astype(np.int8),
+    }
+    return fitness_scores, stats
+
+def _evaluate_population_lockstep(population, nn, env_config, num_episodes, seeds, max_steps, detect_cycles, record=False):
+    pop_size = len(population)
+    pop_net = PopulationNetwork(nn.layer_sizes, np.asarray(population), dtype=nn.dtype)
+
+    if detect_cycles:
+        from .cycle_detection import CycleDetector, project_starvation
+    if record:
+        from ..env.trajectory import TrajectoryRecorder
+
+    # Episódio i pertence ao genoma i // num_episodes
+    n = pop_size * num_episodes
+    envs = []
+    detectors = []
+    # Gravador do episódio 0 de cada genoma (None nos outros episódios)
+    recorders = [None] * n
+    for i in range(n):
+        env = SnakeEnv(**env_config)
+        env.reset(seed=seeds[i % num_episodes] if seeds is not None else None)
+        envs.append(env)
+        if detect_cycles:
+            detector = CycleDetector(env.width, env.height)
+            detector.reset(env)
+            detectors.append(detector)
+        if record and i % num_episodes == 0:
+            recorders[i] = TrajectoryRecorder(env_config, seeds[0] if seeds is not None else None)
+            recorders[i].start(env)
+
+    final_score = np.zeros(n, dtype=np.int64)
+    final_steps = np.zeros(n, dtype=np.int64)
+    final_len = np.zeros(n, dtype=np.int64)
+    final_reason = np.zeros(n, dtype=np.int8)
+    played = np.zeros(n, dtype=np.int64)
+
+    states = np.zeros((pop_size, num_episodes, nn.layer_sizes[0]), dtype=nn.dtype)
+    flat_states = states.reshape(n, -1)
+
+    profiler = _active_profiler()
+    timed = profiler is not None
+    clock = profiler.clock if timed else None
+    t_encode = t_forward = t_step = 0.0
+    batches = total_played = 0
+
+    live = list(range(n))
+    while live:
+        if timed:
+            t0 = clock()
+        for i in live:
+            flat_states[i] = encode_state(envs[i])
+        if timed:
+            t1 = clock()
+
+        actions = np.argmax(pop_net.forward(states), axis=2).reshape(n)
+        if timed:
+            t2 = clock()
+            t_encode += t1 - t0
+            t_forward += t2 - t1
+            batches += 1
+            total_played += len(live)
+
+        still_live = []
+        for i in live:
+            env = envs[i]
+            _, _, done, info = env.step(actions[i])
+            played[i] += 1
+            recorder = recorders[i]
+            if recorder is not None:
+                recorder.step(env, actions[i])
+
+            if done or played[i] >= max_steps:
+                final_score[i] = env.score
+                final_steps[i] = played[i]
+                final_len[i] = len(env.snake)
+                final_reason[i] = REASON_CODES[info.get("reason")]
+            elif detect_cycles and detectors[i].step(env):
+                # Preso em um ciclo: mesmo resultado de jogar até morrer de fome
+                final_score[i] = env.score
+                final_steps[i], final_reason[i] = project_starvation(played[i], env.energy, max_steps)
+                final_len[i] = len(env.snake)
+                if recorder is not None:
+                    recorder.end_cycle(detectors[i].period, int(final_steps[i]))
+            else:
+                still_live.append(i)
+        live = still_live
+        if timed:
+            # No lockstep o step de cada jogo inclui a detecção de ciclos
+            t_step += clock() - t2
+
+    if timed:
+        profiler.add("encode", t_encode, batches, total_played)
+        profiler.add("forward", t_forward, batches, total_played)
+        profiler.add("env_step", t_step, batches, total_played)
+
+    size_threshold = (envs[0].width * envs[0].height) * 0.1
+    fitness_scores, stats = _finalize_population(final_score, final_steps, final_len, final_reason, played,
+                                                 size_threshold, pop_size, num_episodes)
+    if record:
+        stats["trajectory"] = object_array([recorder.trajectory() for recorder in recorders[::num_episodes]])
+    return fitness_scores, stats
+
+def _evaluate_population_vectorized(population, nn, env_config, num_episodes, seeds, max_steps, detect_cycles, record=False):
+    pop_size = len(population)
+    n = pop_size * num_episodes
+
+    # Jogo i pertence ao genoma i // num_episodes e usa a seed do episódio i % num_episodes
+    env_seeds = None
+    if seeds is not None:
+        env_seeds = [seeds[i % num_episodes] for i in range(n)]
+    # Import local: workers dos backends serial/lockstep não carregam o VecSnakeEnv (nem o Numba)
+    from ..env.vec_env import VecSnakeEnv
+    venv = VecSnakeEnv(n, **env_config, auto_reset=False, seeds=env_seeds)
+    detector = None
+    if detect_cycles:
+        from .cycle_detection import VecCycleDetector, project_starvation
+        detector = VecCycleDetector(venv)
+        detector.start_window(np.arange(n))
+
+    pop_net = PopulationNetwork(nn.layer_sizes, np.asarray(population), dtype=nn.dtype)
+
+    final_score = np.zeros(n, dtype=np.int64)
+    final_steps = np.zeros(n, dtype=np.int64)
+    final_len = np.zeros(n, dtype=np.int64)
+    final_reason = np.zeros(n, dtype=np.int8)
+
+    # Bloco (P, episódios, inputs); jogos já terminados ficam com o último estado
+    states = np.zeros((pop_size, num_episodes, nn.layer_sizes[0]), dtype=nn.dtype)
+    flat_states = states.reshape(n, -1)
+
+    if record:
+        # Episódio 0 do genoma g é o jogo g * num_episodes. A cada passo entram as
+        # ações dos que ainda jogam e as maçãs novas de quem comeu, com o jogo
+        # dono; no fim cada genoma recebe as suas, na ordem dos passos
+        action_owner, recorded_actions = [], []
+        apple_owner = [np.arange(0, n, num_episodes)]
+        apple_cells = [venv.apple_y[::num_episodes] * venv.width + venv.apple_x[::num_episodes]]
+
+    profiler = _active_profiler()
+    timed = profiler is not None
+    clock = profiler.clock if timed else None
+    t_encode = t_forward = t_step = t_cycles = 0.0
+    batches = total_played = 0
+
+    active = np.arange(n)
+    while len(active) > 0:
+        if timed:
+            t0 = clock()
+        flat_states[active] = venv.encode(active)
+        if timed:
+            t1 = clock()
+        actions = np.argmax(pop_net.forward(states), axis=2).reshape(n)
+        if record:
+            recording = active[active % num_episodes == 0] if num_episodes > 1 else active
+            recorded_actions.append(actions[recording].astype(np.uint8))
+            action_owner.append(recording)
+            score_before = venv.score[recording]
+        if timed:
+            t2 = clock()
+
+        if detector is not None:
+            old_tails = detector.tails(active)
+        if timed:
+            t3 = clock()
+        _, dones, info = venv.step(actions)
+        if timed:
+            t4 = clock()
+
+        # Episódios que terminaram (colisão/fome) ou chegaram ao limite de passos
+        ended = dones[active] | (info["steps"][active] >= max_steps)
+        finished = active[ended]
+        final_score[finished] = info["score"][finished]
+        final_steps[finished] = info["steps"][finished]
+        final_len[finished] = info["length"][finished]
+        final_reason[finished] = info["reason"][finished]
+        venv.done[finished] = True
+
+        if detector is not None:
+            # Presos em um ciclo: mesmo resultado de jogar até morrer de fome
+            cycles = detector.step(active[~ended], old_tails[~ended])
+            final_score[cycles] = venv.score[cycles]
+            final_steps[cycles], final_reason[cycles] = project_starvation(venv.steps[cycles], venv.energy[cycles], max_steps)
+            final_len[cycles] = venv.length[cycles]
+            venv.done[cycles] = True
+
+        if timed:
+            # Cronômetro da detecção de ciclos inclui a leitura das caudas antes do step
+            t5 = clock()
+            t_encode += t1 - t0
+            t_forward += t2 - t1
+            t_step += t4 - t3
+            t_cycles += (t3 - t2) + (t5 - t4)
+            batches += 1
+            total_played += len(active)
+        if record:
+            # Comeu e o jogo continua: uma maçã nova foi sorteada (sem sorteio só na vitória)
+            ate = venv.score[recording] != score_before
+            if ate.any():
+                ate = recording[ate & ~dones[recording]]
+                apple_owner.append(ate)
+                apple_cells.append(venv.apple_y[ate] * venv.width + venv.apple_x[ate])
+        active = np.flatnonzero(~venv.done)
+
+    if timed:
+        profiler.add("encode", t_encode, batches, total_played)
+        profiler.add("forward", t_forward, batches, total_played)
+        profiler.add("env_step", t_step, batches, total_played)
+        if detector is not None:
+            profiler.add("cycle_detection", t_cycles, batches, total_played)
+
+    size_threshold = (venv.width * venv.height) * 0.1
+    played = venv.steps.astype(np.int64)
+    fitness_scores, stats = _finalize_population(final_score, final_steps, final_len, final_reason, played,
+                                                 size_threshold, pop_size, num_episodes)
+    if record:
+        # O detector só tem período nos jogos que terminaram em ciclo
+        periods = detector.period[::num_episodes] if detector is not None else np.zeros(pop_size, dtype=np.int64)
+        stats["trajectory"] = _collect_trajectories(
+            env_config, seeds[0] if seeds is not None else None, pop_size, num_episodes, action_owner,
+            recorded_actions, apple_owner, apple_cells, periods, final_steps[::num_episodes])
+    return fitness_scores, stats
+
+def _collect_trajectories(env_config, seed, pop_size, num_episodes, action_owner, actions, apple_owner, apples,
+                          periods, steps):
+    """
+    Uma `Trajectory` por genoma a partir dos blocos gravados passo a passo (ações
+    e maçãs de vários jogos por bloco, cada uma com o jogo dono, o episódio 0 do
+    genoma jogo // num_episodes).
+    """
+    from ..env.trajectory import Trajectory
+    cell_dtype = np.min_scalar_type(env_config["width"] * env_config["height"] - 1)
+
+    def split(owner, values, dtype):
+        owner = np.concatenate(owner) // num_episodes
+        # Ordenação estável: os valores de cada genoma continuam na ordem dos passos
+        values = np.concatenate(values).astype(dtype)[np.argsort(owner, kind="stable")]
+        bounds = np.concatenate(([0], np.cumsum(np.bincount(owner, minlength=pop_size))))
+        return [values[a:b].copy() for a, b in zip(bounds[:-1], bounds[1:])]
+
+    per_actions = split(action_owner, actions, np.uint8)
+    per_apples = split(apple_owner, apples, cell_dtype)
+    return object_array([Trajectory(env_config, seed, per_actions[g], per_apples[g], periods[g], steps[g])
+                         for g in range(pop_size)])
+
+def race_population(
+    evaluate_episode,
+    population_size: int,
+    num_episodes: int,
+    cutoff_ranks: list[int],
+    step_budget: int | None = None,
+    z: float = 1.0,
+    prior_cv: float | None = None
+) -> tuple[np.ndarray, dict]:
+    """
+    Avaliação adaptativa (racing): todo genoma joga o episódio 0 e os episódios
+    seguintes só vão para genomas cujo intervalo de confiança ainda cruza um corte
+    da seleção (ex.: o último elite e o corte do torneio).
+
+    `evaluate_episode(indices, episode)` joga o episódio `episode` (mesma seed para
+    todos) com os genomas `indices` e retorna (fitness, stats) de cada um, com os
+    stats de `evaluate_population`.
+
+    O intervalo é média ± z * desvio / sqrt(n). O ruído entre episódios cresce com
+    o fitness (genomas que batem logo na parede fazem 0 em todo episódio), então o
+    desvio é modelado como cv * média, com o coeficiente de variação cv agrupado dos
+    genomas que já jogaram mais de um episódio (ou `prior_cv`, tipicamente o da
+    geração anterior; sem nenhum dos dois, todos seguem na corrida). Com n >= 2 a
+    variância do próprio genoma entra com peso n - 1 contra 1 do modelo.
+
+    `step_budget` limita os passos da geração: o episódio 0 é sempre jogado e, em
+    cada rodada, os genomas mais próximos de um corte entram primeiro enquanto o
+    custo estimado (média de passos por episódio de cada um) couber no orçamento.
+
+    Returns:
+        (fitness_scores, stats): fitness médio dos episódios jogados e um dict com
+        os stats de `evaluate_population` (somados ou médios nos episódios jogados),
+        "episodes" (episódios por genoma) e "cv" (coeficiente agrupado).
+    """
+    scores = np.full((population_size, num_episodes), np.nan)
+    episodes = np.zeros(population_size, dtype=np.int64)
+
+    everyone = np.arange(population_size)
+    scores[:, 0], stats = evaluate_episode(everyone, 0)
+    stats = {name: np.array(values) for name, values in stats.items()}
+    steps = stats["steps"]
+    episodes[:] = 1
+    used = int(steps.sum())
+
+    cv = prior_cv
+    for episode in range(1, num_episodes):
+        means = np.nanmean(scores, axis=1)
+        cv = _pooled_cv(scores, episodes, prior_cv)
+
+        # Corte entre as posições r-1 e r do ranking atual
+        ranked = np.sort(means)[::-1]
+        cutoffs = [(ranked[r - 1] + ranked[r]) / 2 for r in cutoff_ranks if 0 < r < population_size]
+
+        # Só genomas que jogaram todas as rodadas até aqui continuam na corrida
+        racing = everyone[episodes == episode]
+        if cv is None or not cutoffs:
+            margin = np.zeros(len(racing))
         else:
-            # FASE DE SOBREVIVÊNCIA
-            # Prioridade: Manter-se vivo (evitar auto-colisão).
-            # Passo vale mais na fase de sobrevivência
-            episode_fitness += steps * 1.5 # Total steps reward = 2.0
-            
-            # Bônus extra por tamanho grande
-            episode_fitness += score * 200 
-            
-            # Penalidade aumentada por bater na parede
-            if collision_reason == "wall_collision":
-                episode_fitness -= 800 # Penalidade extremamente alta por colisão com parede na fase de sobrevivência
-            
-            # Penalidade por colisão com corpo (muito alta para evitar esse comportamento)
-            if collision_reason == "body_collision":
-                episode_fitness -= 1000 # Penalidade extremamente severa por auto-colisão
-            
-            # Aqui a morte é natural, mas queremos maximizar steps.
-            # O score * 200 garante que comer ainda é melhor que só rodar,
-            # mas steps * 2.0 faz com que 100 passos valham tanto quanto 1 maçã.
-        
-        total_fitness += max(0, episode_fitness) # Fitness não negativo
-        
-    return total_fitness / num_episodes
+            model_var = (cv * means[racing]) ** 2
+            if episode == 1:
+                var = model_var
+            else:
+                own_var = np.nanvar(scores[racing, :episode], axis=1, ddof=1)
+                var = ((episode - 1) * own_var + model_var) / episode
+            half_width = z * np.sqrt(var / episode)
+            distance = np.min(np.abs(means[racing][:, None] - np.array(cutoffs)[None, :]), axis=1)
+            # O intervalo cruza um corte (margin < 1; quanto menor, mais indefinido)
+            keep = distance < half_width
+            racing = racing[keep]
+            margin = distance[keep] / half_width[keep]
+
+        if step_budget is not None and len(racing) > 0:
+            order = np.argsort(margin, kind="stable")
+            racing = racing[order]
+            cost = np.cumsum(steps[racing] / episodes[racing])
+            racing = racing[cost <= step_budget - used]
+
+        if len(racing) == 0:
+            break
+
+        racing = np.sort(racing)
+        fitness, new_stats = evaluate_episode(racing, episode)
+        scores[racing, episode] = fitness
+        # As médias também são acumuladas como somas e divididas no fim
+        for name in SUMMED_STATS + MEAN_STATS:
+            stats[name][racing] += new_stats[name]
+        episodes[racing] += 1
+        used += int(new_stats["steps"].sum())
+
+    for name in MEAN_STATS:
+        stats[name] = stats[name] / episodes
+    cv = _pooled_cv(scores, episodes, cv)
+    return np.nanmean(scores, axis=1), {**stats, "episodes": episodes, "cv": cv}
+
+def _pooled_cv(scores: np.ndarray, episodes: np.ndarray, default: float | None) -> float | None:
+    """Coeficiente de variação entre episódios agrupado dos genomas com n >= 2 (ou `default`)."""
+    multi = episodes >= 2
+    if not multi.any():
+        return default
+    means = np.nanmean(scores[multi], axis=1)
+    variances = np.nanvar(scores[multi], axis=1, ddof=1)
+    dof = episodes[multi] - 1
+    scale = (dof * means ** 2).sum()
+    if scale == 0:
+        return default
+    return float(np.sqrt((dof * variances).sum() / scale))
@@ -0,0 +1,328 @@
+import numpy as np
+import os
+import threading
+import multiprocessing as mp
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import shared_memory
+from ..agents.neural_net import NeuralNetwork
+from .evaluation import evaluate_population, race_population, object_array, GENOME_STATS
+
+EXECUTOR_MODES = ("serial", "thread", "process")
+
+# Estado de cada processo worker, montado uma única vez em _init_worker
+_worker = {}
+
+def _init_worker(shm_name: str, shape: tuple, dtype: str, env_config: dict, layer_sizes: list[int], backend: str,
+                 max_steps: int, detect_cycles: bool, profile: bool):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    _worker["shm"] = shm
+    _worker["genomes"] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    _worker["nn"] = NeuralNetwork(layer_sizes, dtype)
+    _worker["env_config"] = env_config
+    _worker["backend"] = backend
+    _worker["max_steps"] = max_steps
+    _worker["detect_cycles"] = detect_cycles
+    _worker["profile"] = profile
+    if profile:
+        # Só carregado se usado: o worker sem profiler importa só o necessário para avaliar
+        from ..utils import profiler
+        profiler.enable(True)
+
+def _worker_evaluate(start: int, end: int, num_episodes: int, seeds: list[int] | None,
+                     record: bool = False) -> tuple[np.ndarray, dict, dict | None]:
+    fitness_scores, stats = evaluate_population(
+        _worker["genomes"][start:end], _worker["nn"], _worker["env_config"],
+        num_episodes=num_episodes,
+        backend=_worker["backend"],
+        seeds=seeds,
+        max_steps=_worker["max_steps"],
+        detect_cycles=_worker["detect_cycles"],
+        record=record
+    )
+    if not _worker["profile"]:
+        return fitness_scores, stats, None
+    # Tempos das fases desta tarefa, somados no processo principal
+    from ..utils import profiler
+    return fitness_scores, stats, profiler.collect()
+
+class EvaluationExecutor:
+    """
+    Distribui a avaliação da população entre vários workers.
+
+    Modos:
+        "serial": tudo no processo atual (referência).
+        "thread": pool de threads, uma NeuralNetwork por thread.
+        "process": pool de processos persistentes. A população fica em uma matriz
+                   de `multiprocessing.shared_memory`, então os genomas não são
+                   serializados a cada geração; cada worker monta o env config e a
+                   rede uma única vez e só recebe (início, fim, episódios, seeds)
+                   por tarefa.
+
+    Com as mesmas seeds, o fitness de cada genoma não depende do modo nem do
+    número de workers (todos os genomas jogam os mesmos episódios).
+
+    Com `cache_size > 0` o fitness fica em um `FitnessCache`: genomas já avaliados
+    com as mesmas seeds (elites, clones) não jogam de novo, e só os genomas novos
+    vão para os workers.
+
+    Com `racing=True` (e seeds) a avaliação usa `race_population`: todos jogam um
+    episódio e os seguintes só vão para genomas perto dos cortes de seleção
+    passados em `evaluate(..., cutoff_ranks=...)`, dentro de `step_budget` passos
+    por geração. No racing o cache guarda o fitness de cada episódio.
+
+    `detect_cycles` é repassado a `evaluate_population` (episódios presos em
+    ciclos terminam cedo, com o mesmo fitness).
+
+    Com `record=True`, stats traz também "trajectory": a trajetória do episódio 0
+    de cada genoma, gravada pelos workers enquanto ele é jogado. O cache guarda a
+    trajetória junto com o fitness (só em memória), então genomas em cache também
+    têm a sua, exceto entradas restauradas de um checkpoint (None).
+
+    `dtype` é o tipo dos genomas na matriz compartilhada e das redes dos workers
+    (ver `snake_ai.agents.neural_net.DTYPES`); genomas de outro tipo são
+    convertidos ao serem copiados para a matriz.
+
+    `profile` liga os cronômetros de `snake_ai.utils.profiler` nos workers de
+    processo (threads e o modo serial usam o estado do processo atual); os totais
+    de cada tarefa voltam junto com o fitness.
+    """
+
+    def __init__(
+        self,
+        env_config: dict,
+        layer_sizes: list[int],
+        population_size: int,
+        num_episodes: int = 3,
+        mode: str = "serial",
+        num_workers: int | None = None,
+        backend: str = "serial",
+        max_steps: int = 2000,
+        cache_size: int = 0,
+        racing: bool = False,
+        step_budget: int | None = None,
+        detect_cycles: bool = True,
+        profile: bool = False,
+        dtype="float64",
+        record: bool = False
+    ):
+        if mode not in EXECUTOR_MODES:
+            raise ValueError(f"Modo de execução desconhecido: {mode!r} (opções: {EXECUTOR_MODES})")
+
+        self.env_config = env_config
+        self.layer_sizes = layer_sizes
+        self.population_size = population_size
+        self.num_episodes = num_episodes
+        self.mode = mode
+        self.num_workers = max(1, num_workers or os.cpu_count() or 1)
+        self.backend = backend
+        self.max_steps = max_steps
+        self.cache = None
+        if cache_size > 0:
+            # O cache vive só no processo principal (os workers não o importam)
+            from .fitness_cache import FitnessCache
+            self.cache = FitnessCache(env_config, max_steps, cache_size)
+        self.racing = racing
+        self.step_budget = step_budget
+        self.detect_cycles = detect_cycles
+        self.record = record
+        # Coeficiente de variação entre episódios da geração anterior (ponto de partida do racing)
+        self._cv = None
+        self._hits = self._misses = 0
+
+        self.nn = NeuralNetwork(layer_sizes, dtype)
+        self.dtype = self.nn.dtype
+        genome_size = len(self.nn.get_weights_flat())
+        self.shape = (population_size, genome_size)
+
+        self._shm = None
+        self._pool = None
+        self._threads = None
+        self._local = threading.local()
+
+        if mode == "process":
+            self._shm = shared_memory.SharedMemory(create=True, size=int(np.prod(self.shape)) * self.dtype.itemsize)
+            self.genomes = np.ndarray(self.shape, dtype=self.dtype, buffer=self._shm.buf)
+            self._pool = mp.Pool(
+                self.num_workers,
+                initializer=_init_worker,
+                initargs=(self._shm.name, self.shape, self.dtype.name, env_config, layer_sizes, backend, max_steps,
+                          detect_cycles, profile)
+            )
+        else:
+            self.genomes = np.zeros(self.shape, dtype=self.dtype)
+            if mode == "thread":
+                self._threads = ThreadPoolExecutor(self.num_workers)
+
+    def evaluate(self, population, seeds: list[int] | None = None, cutoff_ranks: list[int] | None = None) -> tuple[np.ndarray, dict]:
+        """
+        Avalia a população (lista de genomas ou matriz (P, genome_size)).
+        Retorna (fitness_scores, stats) como `evaluate_population`, mais
+        "episodes" (episódios jogados por genoma). Com cache, stats também traz
+        "cache_hits" (avaliações que não jogaram) e "cache_misses" (avaliações
+        jogadas) desta chamada; avaliações em cache contam 0 passos.
+
+        `cutoff_ranks` são as posições do ranking que decidem a seleção (ver
+        `GeneticAlgorithm.selection_cutoffs`), usadas só no racing.
+        """
+        if len(population) != self.population_size:
+            raise ValueError(f"Esperado {self.population_size} genomas, recebido {len(population)}")
+
+        self._hits = self._misses = 0
+        if self.racing and seeds is not None:
+            def evaluate_episode(indices, episode):
+                # Só o episódio 0 (que todos jogam) é gravado
+                return self._evaluate_cached([population[i] for i in indices], seeds[episode:episode + 1],
+                                             self.record and episode == 0)
+
+            fitness_scores, stats = race_population(
+                evaluate_episode, self.population_size, self.num_episodes, cutoff_ranks or [],
+                step_budget=self.step_budget, prior_cv=self._cv
+            )
+            self._cv = stats.pop("cv")
+        else:
+            fitness_scores, stats = self._evaluate_cached(population, seeds, self.record)
+            stats["episodes"] = np.full(self.population_size, self.num_episodes)
+
+        if self.cache is not None and seeds is not None:
+            stats["cache_hits"] = self._hits
+            stats["cache_misses"] = self._misses
+        return fitness_scores, stats
+
+    def _evaluate_cached(self, genomes, seeds: list[int] | None, record: bool = False) -> tuple[np.ndarray, dict]:
+        """
+        Avalia `genomes` nas `seeds` (todas), consultando o cache se houver.
+        Retorna (fitness, stats) de cada genoma como `evaluate_population`; o cache
+        guarda também score, duração, motivo de término e, com `record`, a
+        trajetória, e genomas em cache contam 0 passos jogados.
+        """
+        num_genomes = len(genomes)
+        if self.cache is None or seeds is None:
+            # Copiar os genomas para a matriz compartilhada (sem pickle)
+            np.copyto(self.genomes[:num_genomes], np.asarray(genomes))
+            return self._evaluate_rows(num_genomes, seeds, record)
+
+        fitness_scores = np.zeros(num_genomes)
+        stats = {
+            "steps": np.zeros(num_genomes, dtype=np.int64),
+            "steps_saved": np.zeros(num_genomes, dtype=np.int64),
+            "score": np.zeros(num_genomes),
+            "episode_steps": np.zeros(num_genomes),
+            "reason": np.zeros(num_genomes, dtype=np.int8),
+        }
+        if record:
+            stats["trajectory"] = object_array([None] * num_genomes)
+        # Genomas fora do cache, sem repetição (clones da mesma geração jogam uma vez)
+        pending = {}
+        for i, genome in enumerate(genomes):
+            key = self.cache.key(genome, seeds)
+            if key in pending:
+                pending[key].append(i)
+                continue
+            cached = self.cache.get(key)
+            if cached is None:
+                pending[key] = [i]
+            else:
+                fitness_scores[i], stats["score"][i], stats["episode_steps"][i], stats["reason"][i] = cached
+                if record:
+                    stats["trajectory"][i] = self.cache.trajectories.get(key)
+
+        if pending:
+            rows = [indices[0] for indices in pending.values()]
+            for row, i in enumerate(rows):
+                self.genomes[row] = genomes[i]
+            new_fitness, new_stats = self._evaluate_rows(len(rows), seeds, record)
+            for row, (key, indices) in enumerate(pending.items()):
+                trajectory = new_stats["trajectory"][row] if record else None
+                self.cache.put(key, (float(new_fitness[row]), float(new_stats["score"][row]),
+                                     float(new_stats["episode_steps"][row]), int(new_stats["reason"][row])),
+                               trajectory)
+                fitness_scores[indices] = new_fitness[row]
+                for name in ("score", "episode_steps", "reason"):
+                    stats[name][indices] = new_stats[name][row]
+                if record:
+                    for i in indices:
+                        stats["trajectory"][i] = trajectory
+                # Passos jogados só contam para o primeiro clone
+                stats["steps"][indices[0]] = new_stats["steps"][row]
+                stats["steps_saved"][indices[0]] = new_stats["steps_saved"][row]
+
+        self._hits += num_genomes - len(pending)
+        self._misses += len(pending)
+        return fitness_scores, stats
+
+    def _evaluate_rows(self, num_rows: int, seeds: list[int] | None, record: bool = False) -> tuple[np.ndarray, dict]:
+        """Avalia as primeiras `num_rows` linhas de `self.genomes` (um episódio por seed)."""
+        num_episodes = len(seeds) if seeds is not None else self.num_episodes
+        if self.mode == "serial":
+            return evaluate_population(
+                self.genomes[:num_rows], self.nn, self.env_config,
+                num_episodes=num_episodes, backend=self.backend,
+                seeds=seeds, max_steps=self.max_steps, detect_cycles=self.detect_cycles, record=record
+            )
+
+        # Blocos menores que o número de workers para balancear carga
+        bounds = np.linspace(0, num_rows, min(num_rows, self.num_workers * 4) + 1).astype(int)
+        tasks = [(int(a), int(b), num_episodes, seeds, record) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+        if self.mode == "process":
+            results = self._pool.starmap(_worker_evaluate, tasks)
+            if any(result[2] is not None for result in results):
+                from ..utils import profiler
+                for result in results:
+                    profiler.merge(result[2])
+        else:
+            results = list(self._threads.map(lambda task: self._thread_evaluate(*task), tasks))
+
+        fitness_scores = np.concatenate([r[0] for r in results])
+        names = GENOME_STATS + ("trajectory",) if record else GENOME_STATS
+        stats = {name: np.concatenate([r[1][name] for r in results]) for name in names}
+        return fitness_scores, stats
+
+    def _thread_evaluate(self, start: int, end: int, num_episodes: int, seeds: list[int] | None,
+                         record: bool = False) -> tuple[np.ndarray, dict]:
+        # Uma rede por thread (set_weights_flat altera a instância)
+        nn = getattr(self._local, "nn", None)
+        if nn is None:
+            nn = self._local.nn = NeuralNetwork(self.layer_sizes, self.dtype)
+        return evaluate_population(
+            self.genomes[start:end], nn, self.env_config,
+            num_episodes=num_episodes, backend=self.backend,
+            seeds=seeds, max_steps=self.max_steps, detect_cycles=self.detect_cycles, record=record
+        )
+
+    def get_state(self) -> dict:
+        """
+        Estado que influencia as próximas avaliações (para checkpoints): o
+        coeficiente de variação do racing e as entradas do cache.
+        """
+        state = {"racing_cv": self._cv}
+        if self.cache is not None:
+            cache_state = self.cache.get_state()
+            state["cache_keys"] = cache_state["keys"]
+            state["cache_values"] = cache_state["values"]
+        return state
+
+    def set_state(self, state: dict) -> None:
+        self._cv = state["racing_cv"]
+        if self.cache is not None and "cache_keys" in state:
+            self.cache.set_state({"keys": state["cache_keys"], "values": state["cache_values"]})
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+        if self._threads is not None:
+            self._threads.shutdown()
+            self._threads = None
+        if self._shm is not None:
+            self.genomes = None
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
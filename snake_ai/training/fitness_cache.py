@@ -0,0 +1,67 @@
+import hashlib
+import json
+from collections import OrderedDict
+import numpy as np
+
+class FitnessCache:
+    """
+    Cache LRU de fitness endereçado pelo conteúdo do genoma.
+
+    A chave é um hash dos bytes do genoma, da configuração de avaliação (env config,
+    limite de passos) e das seeds dos episódios jogados. Elites copiados sem mudança
+    e filhos idênticos aos pais caem na mesma chave enquanto as seeds não mudam,
+    então não precisam jogar de novo. Sem seeds (episódios aleatórios) não há cache.
+
+    Uma entrada pode levar também a trajetória gravada do episódio 0
+    (`trajectories`), que sai junto com ela do LRU. As trajetórias ficam só em
+    memória: `get_state` guarda apenas os números.
+    """
+
+    def __init__(self, env_config: dict, max_steps: int, max_entries: int = 1000):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.trajectories = {}
+        self.hits = 0
+        self.misses = 0
+        # Parte fixa da chave (mesma para todos os genomas deste executor)
+        context = json.dumps([env_config, max_steps], sort_keys=True)
+        self._context = hashlib.blake2b(context.encode(), digest_size=16).digest()
+
+    def key(self, genome: np.ndarray, seeds: list[int]) -> bytes:
+        h = hashlib.blake2b(self._context, digest_size=16)
+        # Bytes do genoma no tipo em que veio (sem conversão; o executor usa um tipo só)
+        h.update(np.ascontiguousarray(genome).tobytes())
+        h.update(np.asarray(seeds, dtype=np.int64).tobytes())
+        return h.digest()
+
+    def get(self, key: bytes) -> tuple | None:
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return value
+
+    def put(self, key: bytes, value: tuple, trajectory=None) -> None:
+        """`value`: fitness e os demais resultados da avaliação (tupla de números)."""
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if trajectory is not None:
+            self.trajectories[key] = trajectory
+        while len(self.entries) > self.max_entries:
+            evicted, _ = self.entries.popitem(last=False)
+            self.trajectories.pop(evicted, None)
+
+    def get_state(self) -> dict:
+        """Entradas em ordem LRU como arrays (chaves como linhas de bytes), para checkpoints."""
+        keys = np.frombuffer(b"".join(self.entries.keys()), dtype=np.uint8).reshape(-1, 16)
+        values = np.array(list(self.entries.values()), dtype=np.float64).reshape(len(keys), -1) if self.entries else np.zeros((0, 0))
+        return {"keys": keys, "values": values}
+
+    def set_state(self, state: dict) -> None:
+        self.entries = OrderedDict((key.tobytes(), tuple(v.tolist())) for key, v in zip(state["keys"], state["values"]))
+        self.trajectories = {}
+
+    def __len__(self) -> int:
+        return len(self.entries)
@@ -0,0 +1,458 @@
+"""
+Laço de treinamento sem interface gráfica.
+
+Toda a configuração vem de um dict (as mesmas chaves da tela de configuração,
+mais os parâmetros que antes eram fixos no main_train). O `Trainer` não importa
+Tk, pygame nem matplotlib: a visualização, quando existe, fica no callback
+`on_generation` de quem chama (main_train com o dashboard, o CLI
+`python -m snake_ai.train` com progresso em JSON lines).
+
+Com `profile` ligado, cada geração registra o tempo, as chamadas e os passos por
+fase (`snake_ai.utils.profiler`), somando os workers de processo. O intervalo de
+uma geração vai do fim da anterior (callback e evolução incluídos) até o fim da
+sua avaliação e registro, então o dashboard da geração g aparece na g + 1.
+`profile_generation` grava ainda um cProfile desse mesmo intervalo (só o
+processo principal) em logs_dir/profile_<run_name>_gen<g>.pstats.
+"""
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+from ..agents.neural_net import NeuralNetwork
+from ..agents.genetic_algorithm import GeneticAlgorithm
+from ..utils import profiler
+from ..utils.history import HistoryStore
+from ..utils.paths import MODELS_DIR, LOGS_DIR
+from ..utils.genome_archive import GenomeArchive, config_hash
+from .executor import EvaluationExecutor
+from .evaluation import record_episode
+from .checkpoint import save_checkpoint, load_checkpoint, rng_state, set_rng_state
+
+DEFAULT_CONFIG = {
+    # Ambiente
+    "width": 10,
+    "height": 10,
+    "initial_energy": None,  # None = width * height
+    "grow_on_eat": True,
+    # Algoritmo genético
+    "generations": 1000,
+    "population_size": 150,
+    "mutation_rate": 0.1,
+    "mutation_std": 0.2,
+    "elitism": None,  # None = 5% da população (mínimo 2)
+    "crossover_type": "uniform",
+    # Arquitetura da MLP: Input=8 (Danger=3, Angle=1, Size=1, TailPath=3), Hidden=[16, 12], Output=3
+    "layer_sizes": [8, 16, 12, 3],
+    "dtype": "float32",  # Genomas, população, pesos e ativações: "float32" ou "float64"
+    # Avaliação
+    "episodes_per_eval": 3,
+    "max_steps": 2000,
+    "eval_backend": "vectorized",  # "serial", "lockstep" ou "vectorized"
+    "executor_mode": "serial",  # "serial", "thread" ou "process"
+    "num_workers": None,  # None = os.cpu_count()
+    # Gerações com as mesmas seeds de episódio. Com 1 as seeds mudam toda geração e
+    # o cache só poupa clones da mesma geração; valores maiores (ex.: 5) poupam
+    # também os elites, mas congelam o fitness deles até a troca (um elite de
+    # sorte fica no topo por todo o intervalo)
+    "seed_interval": 1,
+    "fitness_cache_size": None,  # None = 4x a população; 0 desliga o cache
+    "racing": False,
+    "step_budget": 0,  # Passos por geração no racing (0 = sem limite)
+    "detect_cycles": True,
+    # Execução
+    "seed": None,  # Semente do np.random (None = não reinicia o gerador)
+    "run_name": None,  # None = timestamp
+    "models_dir": None,  # None = models/
+    "logs_dir": None,  # None = logs/
+    "genome_archive": True,  # Melhor genoma de cada geração em models_dir/genomes_<run_name>.gar
+    "archive_dtype": None,  # Tipo dos genomas no arquivo (None = dtype; float16/float32 reduzem de propósito)
+    "checkpoint_interval": 10,  # Gerações entre checkpoints (0 = sem checkpoints)
+    "checkpoint_path": None,  # None = models_dir/checkpoint_<run_name>.npz
+    "snapshot_interval": 50,  # Usado só por quem gera snapshots (main_train)
+    "snapshot_animation": True,  # Snapshot também do episódio inteiro em PNG animado
+    "profile": False,  # Tempo por fase de cada geração no registro e no histórico
+    "profile_generation": None,  # Geração com dump do cProfile (None = nenhuma)
+}
+
+# Tabelas do histórico: uma linha por geração, uma por indivíduo de cada geração e
+# uma por fase medida de cada geração
+HISTORY_SCHEMA = {
+    "generations": {
+        "generation": "<i4", "best_fitness": "<f8", "mean_fitness": "<f8", "min_fitness": "<f8",
+        "cache_hits": "<i4", "cache_misses": "<i4", "total_steps": "<i8", "steps_saved": "<i8",
+        "mean_episodes": "<f4",
+    },
+    "individuals": {
+        # steps = duração média dos episódios; reason = motivo de término do episódio 0
+        "generation": "<i4", "fitness": "<f8", "score": "<f4", "steps": "<f4", "reason": "<i1", "episodes": "<i2",
+    },
+    "phases": {
+        # Só com profile ligado; phase = índice em profiler.PHASES
+        "generation": "<i4", "phase": "<i1", "seconds": "<f8", "calls": "<i8", "steps": "<i8",
+    },
+}
+
+def resolve_config(overrides: dict | None = None) -> dict:
+    """
+    DEFAULT_CONFIG atualizado com `overrides`, com os valores derivados preenchidos.
+    Chaves desconhecidas geram ValueError (em geral são erros de digitação).
+    """
+    overrides = overrides or {}
+    unknown = sorted(set(overrides) - set(DEFAULT_CONFIG))
+    if unknown:
+        raise ValueError(f"Chaves de configuração desconhecidas: {', '.join(unknown)}")
+
+    config = dict(DEFAULT_CONFIG)
+    config.update(overrides)
+    if config["initial_energy"] is None:
+        config["initial_energy"] = config["width"] * config["height"]
+    if config["elitism"] is None:
+        config["elitism"] = max(2, int(config["population_size"] * 0.05))
+    if config["num_workers"] is None:
+        config["num_workers"] = os.cpu_count() or 1
+    if config["fitness_cache_size"] is None:
+        config["fitness_cache_size"] = config["population_size"] * 4
+    if config["archive_dtype"] is None:
+        config["archive_dtype"] = config["dtype"]
+    if config["run_name"] is None:
+        config["run_name"] = time.strftime("%Y%m%d-%H%M%S")
+    config["layer_sizes"] = list(config["layer_sizes"])
+    config["seed_interval"] = max(1, int(config["seed_interval"]))
+    return config
+
+def env_config_of(config: dict) -> dict:
+    """Parte da configuração repassada ao SnakeEnv/VecSnakeEnv."""
+    return {key: config[key] for key in ("width", "height", "initial_energy", "grow_on_eat")}
+
+class Trainer:
+    """
+    Um treinamento completo: algoritmo genético, executor da avaliação, histórico e
+    modelos salvos. Uso:
+
+        with Trainer(config) as trainer:
+            summary = trainer.run(on_generation)
+
+    `on_generation(record, population, fitness)` é chamado após a avaliação de cada
+    geração (antes da evolução); se retornar True o treinamento para ali.
+
+    A cada `checkpoint_interval` gerações (e na última) o estado completo é gravado
+    logo após a avaliação: população, fitness, geradores aleatórios, estado do
+    executor e tamanho do histórico. `Trainer.resume(path)` refaz a evolução daquela
+    geração e continua exatamente como o treinamento original continuaria. A cópia
+    do estado é feita na hora; a escrita em disco roda em uma thread à parte,
+    enquanto a próxima geração é avaliada.
+
+    A avaliação grava o episódio 0 (mesma seed para todos) de cada genoma enquanto
+    o joga; `trajectories(indices)` devolve as trajetórias da geração atual para os
+    visualizadores reproduzirem sem simular de novo, e o melhor global também tem
+    a sua em models_dir/best_overall.traj.npz.
+    """
+
+    def __init__(self, config: dict | None = None):
+        self.config = resolve_config(config)
+        config = self.config
+        self.env_config = env_config_of(config)
+        self.models_dir = config["models_dir"] or MODELS_DIR
+        self.logs_dir = config["logs_dir"] or LOGS_DIR
+        os.makedirs(self.models_dir, exist_ok=True)
+        os.makedirs(self.logs_dir, exist_ok=True)
+
+        if config["seed"] is not None:
+            np.random.seed(config["seed"])
+
+        # Instância de Rede Neural usada para avaliação (pesos serão injetados)
+        self.nn = NeuralNetwork(config["layer_sizes"], config["dtype"])
+        self.genome_size = len(self.nn.get_weights_flat())
+
+        self.ga = GeneticAlgorithm(
+            population_size=config["population_size"],
+            genome_size=self.genome_size,
+            elitism=config["elitism"],
+            mutation_rate=config["mutation_rate"],
+            mutation_std=config["mutation_std"],
+            crossover_type=config["crossover_type"],
+            dtype=config["dtype"]
+        )
+
+        # Executor da avaliação (workers persistentes durante todo o treino)
+        self.executor = EvaluationExecutor(
+            self.env_config, config["layer_sizes"], config["population_size"],
+            num_episodes=config["episodes_per_eval"],
+            mode=config["executor_mode"],
+            num_workers=config["num_workers"],
+            backend=config["eval_backend"],
+            max_steps=config["max_steps"],
+            cache_size=config["fitness_cache_size"],
+            racing=config["racing"],
+            step_budget=config["step_budget"] or None,
+            detect_cycles=config["detect_cycles"],
+            profile=config["profile"],
+            dtype=config["dtype"],
+            record=True
+        )
+
+        self.history_path = os.path.join(self.logs_dir, f"history_{config['run_name']}")
+        self.history = HistoryStore.open_or_create(self.history_path, HISTORY_SCHEMA)
+        self.archive = None
+        if config["genome_archive"]:
+            archive_meta = {"layer_sizes": config["layer_sizes"], "env_config": self.env_config,
+                            "run_name": config["run_name"]}
+            self.archive = GenomeArchive.open_or_create(
+                os.path.join(self.models_dir, f"genomes_{config['run_name']}.gar"), self.genome_size,
+                archive_meta, capacity=config["generations"], genome_dtype=config["archive_dtype"])
+            self._config_hash = config_hash(archive_meta)
+        self.checkpoint_path = config["checkpoint_path"] or os.path.join(
+            self.models_dir, f"checkpoint_{config['run_name']}.npz")
+
+        self.generation = 0
+        self.best_overall_fitness = -float("inf")
+        self.best_overall_genome = None
+        self.eval_seeds = None
+        self.eval_trajectories = None
+        self._checkpointed = -1  # Última geração gravada em checkpoint
+        self._checkpoint_writer = ThreadPoolExecutor(1)
+        self._pending_checkpoint = None
+        self._cprofile = None
+        profiler.enable(config["profile"])
+
+    @classmethod
+    def resume(cls, path: str, overrides: dict | None = None) -> "Trainer":
+        """
+        Recria o treinamento a partir de um checkpoint. `overrides` permite mudar a
+        configuração salva (ex.: mais `generations`); mudar o que afeta a avaliação
+        ou a evolução quebra a continuação exata.
+        """
+        state = load_checkpoint(path)
+        config = dict(state["config"])
+        # Checkpoints anteriores à opção foram gravados com tudo em float64
+        config.setdefault("dtype", "float64")
+        config.update(overrides or {})
+        trainer = cls(config)
+        trainer._restore(state)
+        return trainer
+
+    def run(self, on_generation=None) -> dict:
+        """Roda as gerações restantes e retorna um resumo do treinamento."""
+        config = self.config
+        start = time.perf_counter()
+        while self.generation < config["generations"]:
+            record, population, fitness_scores = self.step()
+            stop = on_generation is not None and on_generation(record, population, fitness_scores)
+            if stop and config["checkpoint_interval"] and self._checkpointed != self.generation:
+                self.save_checkpoint(fitness_scores)
+            # Evolução
+            with profiler.phase("evolve"):
+                self.ga.evolve(fitness_scores)
+            self.generation += 1
+            if stop:
+                break
+        return {
+            "run_name": config["run_name"],
+            "generations": self.generation,
+            "best_fitness": float(self.best_overall_fitness),
+            "history_path": self.history_path,
+            "checkpoint_path": self.checkpoint_path if self.config["checkpoint_interval"] else None,
+            "elapsed_s": time.perf_counter() - start,
+        }
+
+    def step(self) -> tuple[dict, np.ndarray, np.ndarray]:
+        """Avalia a geração atual, registra no histórico e salva os modelos (sem evoluir)."""
+        config = self.config
+        gen = self.generation
+        if gen == config["profile_generation"] and self._cprofile is None:
+            self._start_cprofile()
+        population = self.ga.get_population()
+
+        # Todos os genomas jogam os mesmos episódios (mesmas seeds de maçã) nesta geração;
+        # a cada seed_interval gerações as seeds mudam e os elites são reavaliados
+        if gen % config["seed_interval"] == 0 or self.eval_seeds is None:
+            self.eval_seeds = np.random.randint(0, 2**31 - 1, size=config["episodes_per_eval"]).tolist()
+
+        eval_start = time.perf_counter()
+        with profiler.phase("evaluate"):
+            fitness_scores, eval_stats = self.executor.evaluate(population, seeds=self.eval_seeds,
+                                                                cutoff_ranks=self.ga.selection_cutoffs())
+        eval_time = time.perf_counter() - eval_start
+        self.eval_trajectories = eval_stats["trajectory"]
+
+        # Passos jogados e passos que a detecção de ciclos evitou jogar (mesmo fitness)
+        total_steps = int(eval_stats["steps"].sum())
+        steps_saved = int(eval_stats["steps_saved"].sum())
+
+        best_idx = int(np.argmax(fitness_scores))
+        best_fit = float(fitness_scores[best_idx])
+        best_gen_genome = population[best_idx]
+
+        # Salvar melhor global
+        with profiler.phase("archive"):
+            if best_fit > self.best_overall_fitness:
+                self.best_overall_fitness = best_fit
+                self.best_overall_genome = best_gen_genome.copy()
+                np.save(os.path.join(self.models_dir, "best_overall.npy"), self.best_overall_genome)
+                self.trajectories([best_idx])[0].save(os.path.join(self.models_dir, "best_overall.traj.npz"))
+            if self.archive is not None:
+                self.archive.append(gen, best_gen_genome, best_fit, self._config_hash)
+
+        record = {
+            "generation": gen,
+            "best_fitness": best_fit,
+            "mean_fitness": float(np.mean(fitness_scores)),
+            "min_fitness": float(np.min(fitness_scores)),
+            "cache_hits": int(eval_stats.get("cache_hits", 0)),
+            "cache_misses": int(eval_stats.get("cache_misses", config["population_size"])),
+            "total_steps": total_steps,
+            "steps_saved": steps_saved,
+            "mean_episodes": float(eval_stats["episodes"].mean()),
+        }
+        with profiler.phase("history"):
+            self.history.append("generations", **{name: record[name] for name in HISTORY_SCHEMA["generations"]})
+            self.history.append(
+                "individuals",
+                generation=np.full(len(fitness_scores), gen),
+                fitness=fitness_scores,
+                score=eval_stats["score"],
+                steps=eval_stats["episode_steps"],
+                reason=eval_stats["reason"],
+                episodes=eval_stats["episodes"]
+            )
+
+        record["eval_s"] = eval_time
+        record["steps_per_s"] = total_steps / max(eval_time, 1e-9)
+
+        interval = config["checkpoint_interval"]
+        if interval and ((gen + 1) % interval == 0 or gen + 1 == config["generations"]):
+            checkpoint_start = time.perf_counter()
+            with profiler.phase("checkpoint"):
+                self.save_checkpoint(fitness_scores)
+            record["checkpoint_s"] = time.perf_counter() - checkpoint_start
+
+        if profiler.enabled():
+            record["profile"] = self._record_phases(gen)
+        if self._cprofile is not None and gen == config["profile_generation"]:
+            record["pstats_path"] = self._dump_cprofile(gen)
+        if gen + 1 == config["profile_generation"]:
+            # O intervalo da próxima geração começa aqui (callback e evolução incluídos)
+            self._start_cprofile()
+        return record, population, fitness_scores
+
+    def trajectories(self, indices, replay: bool = True) -> list:
+        """
+        Trajetórias do episódio 0 da geração atual (o que todos os genomas jogam,
+        também no racing) dos genomas nas posições `indices` da população, gravadas
+        durante a avaliação. Só genomas vindos de um cache restaurado de checkpoint
+        não têm a sua: esses jogam o episódio de novo, ou ficam None com
+        `replay=False` (o dashboard, que não pode custar nada ao treinamento).
+        """
+        population = self.ga.get_population()
+        trajectories = [self.eval_trajectories[int(i)] for i in indices]
+        if replay:
+            trajectories = [
+                trajectory if trajectory is not None else
+                record_episode(population[int(i)], self.nn, self.env_config, self.eval_seeds[0], self.config["max_steps"])
+                for i, trajectory in zip(indices, trajectories)
+            ]
+        return trajectories
+
+    def _record_phases(self, gen: int) -> dict:
+        """Recolhe os tempos por fase desde a geração anterior e grava no histórico."""
+        data = profiler.collect()
+        names = [name for name in profiler.PHASES if name in data]
+        self.history.append(
+            "phases",
+            generation=np.full(len(names), gen),
+            phase=[profiler.PHASES.index(name) for name in names],
+            seconds=[data[name][0] for name in names],
+            calls=[data[name][1] for name in names],
+            steps=[data[name][2] for name in names]
+        )
+        return profiler.breakdown(data)
+
+    def _start_cprofile(self) -> None:
+        import cProfile
+        self._cprofile = cProfile.Profile()
+        self._cprofile.enable()
+
+    def _dump_cprofile(self, gen: int) -> str:
+        """Para o cProfile e grava as estatísticas (abrir com pstats ou snakeviz)."""
+        self._cprofile.disable()
+        path = os.path.join(self.logs_dir, f"profile_{self.config['run_name']}_gen{gen:04d}.pstats")
+        self._cprofile.dump_stats(path)
+        self._cprofile = None
+        return path
+
+    def save_checkpoint(self, fitness_scores: np.ndarray) -> None:
+        """Grava o estado da geração atual já avaliada (antes da evolução)."""
+        ga = self.ga
+        state = {
+            "config": self.config,
+            "generation": self.generation,
+            "population": ga.get_population().copy(),
+            "fitness": np.array(fitness_scores, dtype=np.float64),
+            "ga_generation": ga.generation,
+            "ga_best_genome": ga.best_genome,
+            "best_fitness_history": np.array(ga.best_fitness_history, dtype=np.float64),
+            "best_overall_fitness": self.best_overall_fitness,
+            "best_overall_genome": self.best_overall_genome,
+            "eval_seeds": self.eval_seeds,
+            "history_rows": self.history.row_counts(),
+            "archive_count": len(self.archive) if self.archive is not None else 0,
+            **rng_state(),
+            **{f"executor_{name}": value for name, value in self.executor.get_state().items()},
+        }
+        # O estado só tem cópias ou objetos que não são alterados depois (a evolução
+        # troca o best_genome em vez de alterá-lo), então pode ser escrito em paralelo
+        self.wait_checkpoint()
+        self._pending_checkpoint = self._checkpoint_writer.submit(save_checkpoint, self.checkpoint_path, state)
+        self._checkpointed = self.generation
+
+    def wait_checkpoint(self) -> None:
+        """Espera a escrita do último checkpoint terminar (e propaga erros dela)."""
+        if self._pending_checkpoint is not None:
+            pending, self._pending_checkpoint = self._pending_checkpoint, None
+            pending.result()
+
+    def _restore(self, state: dict) -> None:
+        """Carrega o estado de `save_checkpoint` e aplica a evolução pendente daquela geração."""
+        ga = self.ga
+        ga.population = np.array(state["population"])
+        ga.generation = state["ga_generation"]
+        ga.best_genome = state["ga_best_genome"]
+        ga.best_fitness_history = list(state["best_fitness_history"])
+
+        self.generation = state["generation"]
+        self.best_overall_fitness = state["best_overall_fitness"]
+        self.best_overall_genome = state["best_overall_genome"]
+        self.eval_seeds = state["eval_seeds"]
+        self.executor.set_state({name[len("executor_"):]: value for name, value in state.items()
+                                 if name.startswith("executor_")})
+        self.history.truncate(state["history_rows"])
+        if self.archive is not None:
+            self.archive.truncate(state["archive_count"])
+        self._checkpointed = self.generation
+        set_rng_state(state)
+
+        # A geração do checkpoint já foi avaliada: falta só evoluir
+        self.ga.evolve(state["fitness"])
+        self.generation += 1
+
+    def close(self) -> None:
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            self._cprofile = None
+        if self.config["profile"]:
+            profiler.enable(False)
+        try:
+            self.wait_checkpoint()
+        finally:
+            self._checkpoint_writer.shutdown()
+            self.executor.close()
+            self.history.close()
+            if self.archive is not None:
+                self.archive.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
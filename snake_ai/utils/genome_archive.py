@@ -0,0 +1,235 @@
+"""
+Arquivo único de genomas (um por geração), mapeado em memória.
+
+Formato (little-endian):
+    [0, 4096)  cabeçalho: magic (8 bytes), count (int64), capacity (int64),
+               tamanho do JSON (int64) e o JSON de metadados (genome_size,
+               genome_dtype, layer_sizes, env_config, ...).
+    [4096, …)  `capacity` linhas fixas: generation (int64), fitness (float64),
+               config_hash (uint64) e o genoma (genome_dtype x genome_size;
+               o tipo do treinamento, float32 ou float64, ou float16 para
+               ocupar menos).
+
+O arquivo é pré-alocado e cresce dobrando a capacidade; as linhas são acessadas
+direto do mmap. Um append escreve a linha depois das `count` já confirmadas,
+sincroniza em disco e só então incrementa `count` no cabeçalho: se o processo
+morrer no meio, a linha incompleta fica fora do arquivo e o resto está intacto.
+
+Importar uma pasta de best_gen_XXXX.npy:
+    python -m snake_ai.utils.genome_archive import models/ models/genomes.gar
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import numpy as np
+
+MAGIC = b"SNAKEGA1"
+HEADER_SIZE = 4096
+_FIELDS_SIZE = 32  # magic + count + capacity + tamanho do JSON
+
+def config_hash(config: dict) -> int:
+    """Hash de 64 bits de uma configuração (o que é preciso para jogar o genoma)."""
+    digest = hashlib.blake2b(json.dumps(config, sort_keys=True).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+# Tipos em que os genomas podem ser guardados (float16 é lido como float32)
+GENOME_DTYPES = ("float16", "float32", "float64")
+
+def _row_dtype(genome_size: int, genome_dtype: str = "float32") -> np.dtype:
+    if genome_dtype not in GENOME_DTYPES:
+        raise ValueError(f"Tipo de genoma não suportado: {genome_dtype} (opções: {GENOME_DTYPES})")
+    return np.dtype([("generation", "<i8"), ("fitness", "<f8"), ("config_hash", "<u8"),
+                     ("genome", np.dtype(genome_dtype).newbyteorder("<"), (genome_size,))])
+
+class GenomeArchive:
+    """
+    Genomas de um treinamento em um único arquivo. Uso:
+
+        archive = GenomeArchive.create(path, genome_size, {"layer_sizes": [...], "env_config": {...}})
+        archive.append(gen, genome, fitness, config_hash)
+        GenomeArchive(path).get(gen)  # O(1); float64 se guardado assim, senão float32
+    """
+
+    def __init__(self, path: str, mode: str = "r"):
+        if mode not in ("r", "r+"):
+            raise ValueError(f"Modo inválido: {mode!r} (use 'r' ou 'r+')")
+        self.path = path
+        self.mode = mode
+        with open(path, "rb") as f:
+            fields = f.read(_FIELDS_SIZE)
+            if fields[:8] != MAGIC:
+                raise ValueError(f"{path} não é um arquivo de genomas")
+            meta_len = int(np.frombuffer(fields, dtype="<i8", count=1, offset=24)[0])
+            self.meta = json.loads(f.read(meta_len).decode())
+        self.genome_size = self.meta["genome_size"]
+        # Arquivos anteriores ao genome_dtype guardam float32
+        self.genome_dtype = self.meta.get("genome_dtype", "float32")
+        self.row_dtype = _row_dtype(self.genome_size, self.genome_dtype)
+        self.read_dtype = np.float64 if self.genome_dtype == "float64" else np.float32
+        self._map()
+        # Geração -> linha (acesso O(1); uma geração repetida fica com a última linha)
+        self._by_generation = {int(g): row for row, g in enumerate(self.rows["generation"][:len(self)])}
+
+    @classmethod
+    def create(cls, path: str, genome_size: int, meta: dict | None = None, capacity: int = 1024,
+               genome_dtype: str = "float32") -> "GenomeArchive":
+        """Cria (ou substitui) um arquivo vazio com espaço para `capacity` genomas."""
+        row_dtype = _row_dtype(genome_size, genome_dtype)
+        meta = dict(meta or {}, genome_size=genome_size, genome_dtype=genome_dtype)
+        meta_bytes = json.dumps(meta, sort_keys=True).encode()
+        if _FIELDS_SIZE + len(meta_bytes) > HEADER_SIZE:
+            raise ValueError("Metadados grandes demais para o cabeçalho")
+        capacity = max(1, capacity)
+        header = bytearray(HEADER_SIZE)
+        header[:8] = MAGIC
+        header[8:_FIELDS_SIZE] = np.array([0, capacity, len(meta_bytes)], dtype="<i8").tobytes()
+        header[_FIELDS_SIZE:_FIELDS_SIZE + len(meta_bytes)] = meta_bytes
+        with open(path, "wb") as f:
+            f.write(header)
+            f.truncate(HEADER_SIZE + capacity * row_dtype.itemsize)
+        return cls(path, mode="r+")
+
+    @classmethod
+    def open_or_create(cls, path: str, genome_size: int, meta: dict | None = None, capacity: int = 1024,
+                       genome_dtype: str = "float32") -> "GenomeArchive":
+        """
+        Abre `path` para append se já existir (mesmo genome_size, no tipo em que foi
+        criado), senão cria.
+        """
+        if not os.path.exists(path):
+            return cls.create(path, genome_size, meta, capacity, genome_dtype)
+        archive = cls(path, mode="r+")
+        if archive.genome_size != genome_size:
+            archive.close()
+            raise ValueError(f"{path} guarda genomas de tamanho {archive.genome_size}, esperado {genome_size}")
+        return archive
+
+    def _map(self) -> None:
+        # count e capacity ficam em um mmap próprio para atualizar o cabeçalho sem regravá-lo
+        self._header = np.memmap(self.path, dtype="<i8", mode=self.mode, offset=8, shape=(2,))
+        self.capacity = int(self._header[1])
+        self.rows = np.memmap(self.path, dtype=self.row_dtype, mode=self.mode,
+                              offset=HEADER_SIZE, shape=(self.capacity,))
+
+    def __len__(self) -> int:
+        return int(self._header[0])
+
+    def __contains__(self, generation: int) -> bool:
+        return generation in self._by_generation
+
+    @property
+    def generations(self) -> np.ndarray:
+        return np.array(self.rows["generation"][:len(self)])
+
+    @property
+    def fitness(self) -> np.ndarray:
+        return np.array(self.rows["fitness"][:len(self)])
+
+    def get(self, generation: int) -> np.ndarray:
+        """Genoma da geração `generation` (float32, ou float64 se guardado assim)."""
+        row = self._by_generation.get(generation)
+        if row is None:
+            raise KeyError(f"Geração {generation} não está no arquivo")
+        return self.rows["genome"][row].astype(self.read_dtype)
+
+    def best(self) -> tuple[int, float, np.ndarray]:
+        """(geração, fitness, genoma) da linha de maior fitness (a última se nenhuma tem fitness)."""
+        count = len(self)
+        if count == 0:
+            raise KeyError("Arquivo de genomas vazio")
+        fitness = self.rows["fitness"][:count]
+        row = count - 1 if np.all(np.isnan(fitness)) else int(np.nanargmax(fitness))
+        generation = int(self.rows["generation"][row])
+        return generation, float(fitness[row]), self.rows["genome"][row].astype(self.read_dtype)
+
+    def append(self, generation: int, genome: np.ndarray, fitness: float = np.nan, config_hash: int = 0) -> None:
+        count = len(self)
+        if count == self.capacity:
+            self._grow(2 * self.capacity)
+        row = self.rows[count]
+        row["generation"] = generation
+        row["fitness"] = fitness
+        row["config_hash"] = config_hash
+        row["genome"] = genome
+        # A linha vai para o disco antes de entrar no count
+        self.rows.flush()
+        self._header[0] = count + 1
+        self._header.flush()
+        self._by_generation[int(generation)] = count
+
+    def truncate(self, count: int) -> None:
+        """Descarta as linhas a partir de `count` (retomada a partir de um checkpoint)."""
+        self._header[0] = min(count, len(self))
+        self._header.flush()
+        self._by_generation = {int(g): row for row, g in enumerate(self.rows["generation"][:len(self)])}
+
+    def _grow(self, capacity: int) -> None:
+        self.flush()
+        del self.rows
+        with open(self.path, "r+b") as f:
+            f.truncate(HEADER_SIZE + capacity * self.row_dtype.itemsize)
+        self._header[1] = capacity
+        self._header.flush()
+        self._map()
+
+    def flush(self) -> None:
+        if self.mode == "r+":
+            self.rows.flush()
+            self._header.flush()
+
+    def close(self) -> None:
+        self.flush()
+        self.rows = self._header = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def import_npy_dir(directory: str, path: str, layer_sizes: list[int] | None = None,
+                   env_config: dict | None = None, genome_dtype: str = "float32") -> GenomeArchive:
+    """Cria um arquivo com os best_gen_XXXX.npy de `directory`, em ordem de geração (fitness desconhecido)."""
+    pattern = re.compile(r"best_gen_(\d+)\.npy$")
+    files = sorted((int(m.group(1)), name) for name in os.listdir(directory) if (m := pattern.match(name)))
+    if not files:
+        raise FileNotFoundError(f"Nenhum best_gen_XXXX.npy em {directory}")
+    first = np.load(os.path.join(directory, files[0][1]))
+    meta = {"imported_from": os.path.abspath(directory)}
+    if layer_sizes is not None:
+        meta["layer_sizes"] = list(layer_sizes)
+    if env_config is not None:
+        meta["env_config"] = env_config
+    archive = GenomeArchive.create(path, len(first), meta, capacity=len(files), genome_dtype=genome_dtype)
+    for generation, name in files:
+        archive.append(generation, np.load(os.path.join(directory, name)))
+    return archive
+
+def main():
+    parser = argparse.ArgumentParser(description="Arquivo de genomas do Snake AI.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    imp = commands.add_parser("import", help="Importa uma pasta de best_gen_XXXX.npy")
+    imp.add_argument("directory")
+    imp.add_argument("archive")
+    imp.add_argument("--layer-sizes", type=int, nargs="+", default=[8, 16, 12, 3])
+    imp.add_argument("--dtype", choices=GENOME_DTYPES, default="float32", help="Tipo em que os genomas são guardados")
+    info = commands.add_parser("info", help="Resumo de um arquivo")
+    info.add_argument("archive")
+    args = parser.parse_args()
+
+    if args.command == "import":
+        with import_npy_dir(args.directory, args.archive, args.layer_sizes, genome_dtype=args.dtype) as archive:
+            print(f"{len(archive)} genomas importados para {args.archive}")
+    else:
+        with GenomeArchive(args.archive) as archive:
+            print(json.dumps(archive.meta, indent=2))
+            if len(archive):
+                generation, fitness, _ = archive.best()
+                gens = archive.generations
+                print(f"{len(archive)} genomas (gerações {gens.min()}-{gens.max()}), "
+                      f"melhor: geração {generation} (fitness {fitness:.2f})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""
+Histórico do treinamento em colunas (substitui o CSV do antigo TrainingLogger).
+
+Uma pasta com um `meta.json` (tabelas, colunas e dtypes) e um arquivo binário
+por coluna (`<tabela>/<coluna>.bin`, valores crus little-endian). As linhas são
+acumuladas em memória e escritas em lote a cada `flush_every` appends; a leitura
+mapeia só as colunas pedidas (np.memmap), então o custo de um gráfico não
+depende de quantas colunas ou linhas existem além das usadas.
+
+Toda tabela tem a coluna "generation" em ordem não decrescente, usada para
+recortar intervalos de gerações por busca binária.
+
+Exportar uma tabela para CSV:
+    python -m snake_ai.utils.history csv logs/history_<run> --table generations
+"""
+import argparse
+import json
+import os
+import sys
+import numpy as np
+
+class HistoryStore:
+    """
+    Tabelas colunares append-only. Uso:
+
+        store = HistoryStore.open_or_create(path, {"individuals": {"generation": "<i4", "fitness": "<f8"}})
+        store.append("individuals", generation=np.full(P, gen), fitness=fitness)
+        store.column("individuals", "fitness", start=100, stop=200)
+        store.percentiles("individuals", "fitness", [5, 50, 95])
+    """
+
+    def __init__(self, path: str, mode: str = "r", flush_every: int = 10):
+        if mode not in ("r", "a"):
+            raise ValueError(f"Modo inválido: {mode!r} (use 'r' ou 'a')")
+        self.path = path
+        self.mode = mode
+        self.flush_every = flush_every
+        with open(os.path.join(path, "meta.json")) as f:
+            self.schema = {table: {name: np.dtype(dtype) for name, dtype in columns.items()}
+                           for table, columns in json.load(f)["tables"].items()}
+        self._buffers = {table: [] for table in self.schema}
+        self._pending = 0
+
+    @classmethod
+    def create(cls, path: str, schema: dict, flush_every: int = 10) -> "HistoryStore":
+        """Cria uma pasta vazia (ou reaproveita uma existente com o mesmo schema)."""
+        for table, columns in schema.items():
+            if "generation" not in columns:
+                raise ValueError(f"Tabela {table!r} precisa da coluna 'generation'")
+            os.makedirs(os.path.join(path, table), exist_ok=True)
+        meta = {"tables": {table: {name: np.dtype(dtype).str for name, dtype in columns.items()}
+                           for table, columns in schema.items()}}
+        with open(os.path.join(path, "meta.json"), "w") as f:
+            json.dump(meta, f, indent=2)
+        return cls(path, mode="a", flush_every=flush_every)
+
+    @classmethod
+    def open_or_create(cls, path: str, schema: dict, flush_every: int = 10) -> "HistoryStore":
+        """Abre `path` para append se já existir (mesmo schema), senão cria."""
+        if not os.path.exists(os.path.join(path, "meta.json")):
+            return cls.create(path, schema, flush_every)
+        store = cls(path, mode="a", flush_every=flush_every)
+        expected = {table: {name: np.dtype(dtype) for name, dtype in columns.items()} for table, columns in schema.items()}
+        if store.schema != expected:
+            raise ValueError(f"{path} tem outro schema de histórico")
+        return store
+
+    def _column_path(self, table: str, name: str) -> str:
+        return os.path.join(self.path, table, f"{name}.bin")
+
+    def append(self, table: str, **columns) -> None:
+        """Adiciona linhas (arrays do mesmo tamanho ou escalares para uma linha) ao buffer."""
+        if self.mode != "a":
+            raise ValueError("Histórico aberto só para leitura")
+        dtypes = self.schema[table]
+        if set(columns) != set(dtypes):
+            raise ValueError(f"Colunas de {table!r}: esperado {sorted(dtypes)}, recebido {sorted(columns)}")
+        self._buffers[table].append({name: np.atleast_1d(np.asarray(value, dtype=dtypes[name]))
+                                     for name, value in columns.items()})
+        self._pending += 1
+        if self._pending >= self.flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        """Escreve as linhas em buffer no fim dos arquivos das colunas."""
+        if self.mode != "a":
+            return
+        for table, chunks in self._buffers.items():
+            if not chunks:
+                continue
+            for name in self.schema[table]:
+                with open(self._column_path(table, name), "ab") as f:
+                    for chunk in chunks:
+                        f.write(chunk[name].tobytes())
+            chunks.clear()
+        self._pending = 0
+
+    def num_rows(self, table: str) -> int:
+        """Linhas completas já escritas (a coluna mais curta, se uma escrita foi interrompida)."""
+        sizes = []
+        for name, dtype in self.schema[table].items():
+            path = self._column_path(table, name)
+            sizes.append(os.path.getsize(path) // dtype.itemsize if os.path.exists(path) else 0)
+        return min(sizes)
+
+    def row_counts(self) -> dict:
+        """Linhas por tabela após escrever o buffer (posição para retomar o histórico)."""
+        self.flush()
+        return {table: self.num_rows(table) for table in self.schema}
+
+    def truncate(self, counts: dict) -> None:
+        """Descarta as linhas além de `counts[tabela]` (retomada a partir de um checkpoint)."""
+        self._buffers = {table: [] for table in self.schema}
+        self._pending = 0
+        for table, count in counts.items():
+            for name, dtype in self.schema[table].items():
+                path = self._column_path(table, name)
+                if os.path.exists(path):
+                    with open(path, "r+b") as f:
+                        f.truncate(count * dtype.itemsize)
+
+    def column(self, table: str, name: str, start: int | None = None, stop: int | None = None) -> np.ndarray:
+        """
+        Valores de uma coluna nas gerações [start, stop) (None = sem limite), mapeados
+        do disco: só as páginas do intervalo pedido são lidas.
+        """
+        self.flush()
+        lo, hi = self._row_range(table, start, stop)
+        return self._memmap(table, name)[lo:hi]
+
+    def percentiles(self, table: str, name: str, q, start: int | None = None, stop: int | None = None,
+                    per_generation: bool = True) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Percentis `q` (0-100) de uma coluna nas gerações [start, stop).
+
+        Com `per_generation`, retorna (gerações, matriz (gerações, len(q))); senão os
+        percentis de todas as linhas do intervalo juntas, como (gerações, array len(q)).
+        """
+        q = np.atleast_1d(np.asarray(q, dtype=np.float64))
+        generations = self.column(table, "generation", start, stop)
+        values = np.asarray(self.column(table, name, start, stop), dtype=np.float64)
+        unique, first = np.unique(generations, return_index=True)
+        if not per_generation:
+            return unique, np.percentile(values, q) if len(values) else np.full(len(q), np.nan)
+        counts = np.diff(np.append(first, len(values)))
+        if len(counts) and np.all(counts == counts[0]):
+            # Mesmo número de linhas por geração (população fixa): um único percentile em lote
+            result = np.percentile(values.reshape(len(unique), counts[0]), q, axis=1).T
+        else:
+            result = np.array([np.percentile(chunk, q) for chunk in np.split(values, first[1:])]).reshape(len(unique), len(q))
+        return unique, result
+
+    def _memmap(self, table: str, name: str) -> np.ndarray:
+        rows = self.num_rows(table)
+        dtype = self.schema[table][name]
+        if rows == 0:
+            return np.zeros(0, dtype=dtype)
+        return np.memmap(self._column_path(table, name), dtype=dtype, mode="r", shape=(rows,))
+
+    def _row_range(self, table: str, start: int | None, stop: int | None) -> tuple[int, int]:
+        generations = self._memmap(table, "generation")
+        lo = 0 if start is None else int(np.searchsorted(generations, start, side="left"))
+        hi = len(generations) if stop is None else int(np.searchsorted(generations, stop, side="left"))
+        return lo, hi
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Histórico colunar do treinamento.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    csv = commands.add_parser("csv", help="Exporta uma tabela para CSV (stdout)")
+    csv.add_argument("path")
+    csv.add_argument("--table", default="generations")
+    args = parser.parse_args()
+
+    store = HistoryStore(args.path)
+    columns = list(store.schema[args.table])
+    data = [store.column(args.table, name) for name in columns]
+    sys.stdout.write(",".join(columns) + "\n")
+    for row in zip(*data):
+        sys.stdout.write(",".join(str(v) for v in row) + "\n")
+
+if __name__ == "__main__":
+    main()
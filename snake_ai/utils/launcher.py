@@ -1,3 +1,4 @@
+import os
 import tkinter as tk
 from tkinter import ttk
 import tkinter.messagebox
@@ -7,7 +8,7 @@ class ConfigScreen:
         self.config = {}
         self.root = tk.Tk()
         self.root.title("Snake AI Training Config")
-        self.root.geometry("400x600")
+        self.root.geometry("420x930")
         
         # Style
         style = ttk.Style()
@@ -65,6 +66,41 @@ class ConfigScreen:
         ttk.Radiobutton(games_options_frame, text="1 (Apenas Melhor)", variable=self.num_games_var, value=1).pack(side=tk.LEFT, padx=10)
         ttk.Radiobutton(games_options_frame, text="9 (Grid 3x3)", variable=self.num_games_var, value=9).pack(side=tk.LEFT, padx=10)
         
+        # Backend de Avaliação
+        backend_frame = ttk.Frame(main_frame)
+        backend_frame.pack(fill=tk.X, pady=10)
+        ttk.Label(backend_frame, text="Backend de Avaliação:").pack(anchor="w")
+        
+        self.eval_backend_var = tk.StringVar(value="vectorized")
+        backend_options_frame = ttk.Frame(backend_frame)
+        backend_options_frame.pack(fill=tk.X, pady=5)
+        
+        ttk.Radiobutton(backend_options_frame, text="Serial", variable=self.eval_backend_var, value="serial").pack(side=tk.LEFT, padx=10)
+        ttk.Radiobutton(backend_options_frame, text="Vetorizado", variable=self.eval_backend_var, value="vectorized").pack(side=tk.LEFT, padx=10)
+        
+        # Execução Paralela
+        exec_frame = ttk.Frame(main_frame)
+        exec_frame.pack(fill=tk.X, pady=5)
+        ttk.Label(exec_frame, text="Execução da Avaliação:").pack(anchor="w")
+        
+        self.executor_mode_var = tk.StringVar(value="process")
+        exec_options_frame = ttk.Frame(exec_frame)
+        exec_options_frame.pack(fill=tk.X, pady=5)
+        
+        ttk.Radiobutton(exec_options_frame, text="Serial", variable=self.executor_mode_var, value="serial").pack(side=tk.LEFT, padx=10)
+        ttk.Radiobutton(exec_options_frame, text="Threads", variable=self.executor_mode_var, value="thread").pack(side=tk.LEFT, padx=10)
+        ttk.Radiobutton(exec_options_frame, text="Processos", variable=self.executor_mode_var, value="process").pack(side=tk.LEFT, padx=10)
+        
+        self.create_entry(main_frame, "Número de Workers:", "num_workers", str(os.cpu_count() or 1))
+        
+        # Seeds dos episódios fixas por N gerações (elites em cache só jogam de novo na troca)
+        self.create_entry(main_frame, "Renovar Seeds a Cada (Gerações):", "seed_interval", "1")
+        
+        # Racing: episódios extras só para genomas perto dos cortes de seleção
+        self.racing_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(main_frame, text="Avaliação Adaptativa (Racing)?", variable=self.racing_var).pack(pady=5, anchor="w")
+        self.create_entry(main_frame, "Orçamento de Passos/Geração (0 = livre):", "step_budget", "0")
+        
         # Start Button
         ttk.Button(main_frame, text="Iniciar Treinamento", command=self.on_start).pack(pady=20, fill=tk.X)
         
@@ -106,7 +142,13 @@ class ConfigScreen:
                 "grow_on_eat": self.grow_var.get(),
                 "live_dashboard": self.live_dash_var.get(),
                 "fps": int(self.fps_scale.get()),
-                "num_games": self.num_games_var.get()
+                "num_games": self.num_games_var.get(),
+                "eval_backend": self.eval_backend_var.get(),
+                "executor_mode": self.executor_mode_var.get(),
+                "num_workers": int(self.entry_num_workers.get()),
+                "seed_interval": max(1, int(self.entry_seed_interval.get())),
+                "racing": self.racing_var.get(),
+                "step_budget": int(self.entry_step_budget.get())
             }
             self.root.quit() # Para o mainloop mas mantém a janela até destroy
         except ValueError:
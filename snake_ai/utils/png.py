@@ -0,0 +1,74 @@
+"""
+Escrita de PNG e PNG animado (APNG) só com a biblioteca padrão (zlib + struct).
+
+As imagens são arrays uint8 (altura, largura, 3) em RGB. Cada linha vai com o
+filtro 0 (sem predição): as imagens daqui são blocos de cor chapada, que o zlib
+já comprime bem. O APNG tem todos os quadros do mesmo tamanho, cada um com a
+imagem inteira; visualizadores sem suporte a APNG mostram o primeiro quadro.
+"""
+import struct
+import zlib
+import numpy as np
+
+SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+def _chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+def _header(width: int, height: int) -> bytes:
+    # Profundidade 8, cor RGB (2), compressão/filtro/entrelaçamento padrão
+    return _chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+
+def _compress(image: np.ndarray, level: int) -> bytes:
+    """Linhas com o byte de filtro 0 na frente, comprimidas."""
+    height, width = image.shape[:2]
+    raw = np.zeros((height, width * 3 + 1), dtype=np.uint8)
+    raw[:, 1:] = image.reshape(height, width * 3)
+    return zlib.compress(raw.tobytes(), level)
+
+def _check(image: np.ndarray) -> np.ndarray:
+    image = np.ascontiguousarray(image, dtype=np.uint8)
+    if image.ndim != 3 or image.shape[2] != 3:
+        raise ValueError(f"Esperado array (altura, largura, 3), recebido {image.shape}")
+    return image
+
+def encode_png(image: np.ndarray, level: int = 6) -> bytes:
+    image = _check(image)
+    height, width = image.shape[:2]
+    return (SIGNATURE + _header(width, height) + _chunk(b"IDAT", _compress(image, level))
+            + _chunk(b"IEND", b""))
+
+def write_png(path: str, image: np.ndarray, level: int = 6) -> None:
+    with open(path, "wb") as f:
+        f.write(encode_png(image, level))
+
+def encode_apng(frames, fps: float = 10, loops: int = 0, level: int = 6) -> bytes:
+    """`frames`: sequência de imagens (mesmo tamanho); `loops` = 0 repete para sempre."""
+    frames = [_check(frame) for frame in frames]
+    if not frames:
+        raise ValueError("Animação sem quadros")
+    height, width = frames[0].shape[:2]
+    # Atraso de cada quadro = delay_num / delay_den segundos = 1 / fps
+    delay_num = 100
+    delay_den = max(1, min(int(round(fps * 100)), 65535))
+    parts = [SIGNATURE, _header(width, height), _chunk(b"acTL", struct.pack(">II", len(frames), loops))]
+    sequence = 0
+    for index, frame in enumerate(frames):
+        if frame.shape != frames[0].shape:
+            raise ValueError(f"Quadro {index} com tamanho {frame.shape}, esperado {frames[0].shape}")
+        # Quadro inteiro na origem; dispose 0 (nada) e blend 0 (substitui)
+        control = struct.pack(">IIIIIHHBB", sequence, width, height, 0, 0, delay_num, delay_den, 0, 0)
+        parts.append(_chunk(b"fcTL", control))
+        sequence += 1
+        data = _compress(frame, level)
+        if index == 0:
+            parts.append(_chunk(b"IDAT", data))
+        else:
+            parts.append(_chunk(b"fdAT", struct.pack(">I", sequence) + data))
+            sequence += 1
+    parts.append(_chunk(b"IEND", b""))
+    return b"".join(parts)
+
+def write_apng(path: str, frames, fps: float = 10, loops: int = 0, level: int = 6) -> None:
+    with open(path, "wb") as f:
+        f.write(encode_apng(frames, fps, loops, level))
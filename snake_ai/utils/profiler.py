@@ -0,0 +1,101 @@
+"""
+Cronômetros por fase do treinamento (encode, forward, step do ambiente, evolução,
+dashboard, ...), com contadores de chamadas e de passos.
+
+O estado é global do processo e começa desligado. Os laços quentes leem
+`enabled()` uma vez por episódio ou lote e só então medem com `clock()`, acumulando
+em variáveis locais e chamando `add` no fim; trechos maiores usam
+`with phase("nome"):`, que desligado devolve um contexto vazio compartilhado.
+
+Cada worker de processo tem os próprios totais: o executor os recolhe com
+`collect()` no fim de cada tarefa e junta no processo principal com `merge()`.
+Com vários workers, o tempo das fases da avaliação é a soma entre eles (pode
+passar do tempo de parede de "evaluate").
+"""
+import threading
+import time
+from contextlib import nullcontext
+
+# Ordem fixa das fases (o índice identifica a fase no histórico)
+PHASES = (
+    "evaluate",         # executor.evaluate inteiro (tempo de parede, processo principal)
+    "encode",           # encode_state / VecSnakeEnv.encode
+    "forward",          # NeuralNetwork.forward / PopulationNetwork.forward
+    "env_step",         # SnakeEnv.step / VecSnakeEnv.step
+    "cycle_detection",  # CycleDetector / VecCycleDetector
+    "evolve",           # GeneticAlgorithm.evolve
+    "archive",          # best_overall.npy e arquivo de genomas
+    "history",          # append no histórico
+    "checkpoint",       # cópia do estado e envio para a escrita em segundo plano
+    "dashboard",        # DashboardRenderer (main_train)
+    "snapshot",         # gravar e enfileirar o snapshot (main_train)
+)
+
+clock = time.perf_counter
+
+_enabled = False
+_lock = threading.Lock()
+_totals = {}  # fase -> [segundos, chamadas, passos]
+_NULL = nullcontext()
+
+def enable(on: bool = True) -> None:
+    """Liga (ou desliga) a medição neste processo e zera os totais."""
+    global _enabled
+    _enabled = bool(on)
+    collect()
+
+def enabled() -> bool:
+    return _enabled
+
+def add(name: str, seconds: float, calls: int = 1, steps: int = 0) -> None:
+    """Soma uma medição à fase `name` (quem chama já conferiu `enabled()`)."""
+    with _lock:
+        totals = _totals.get(name)
+        if totals is None:
+            _totals[name] = [seconds, calls, steps]
+        else:
+            totals[0] += seconds
+            totals[1] += calls
+            totals[2] += steps
+
+class _Phase:
+    __slots__ = ("name", "steps", "start")
+
+    def __init__(self, name: str, steps: int):
+        self.name = name
+        self.steps = steps
+
+    def __enter__(self):
+        self.start = clock()
+        return self
+
+    def __exit__(self, *exc):
+        add(self.name, clock() - self.start, 1, self.steps)
+
+def phase(name: str, steps: int = 0):
+    """Contexto que mede a fase `name` (uma chamada); desligado, não faz nada."""
+    return _Phase(name, steps) if _enabled else _NULL
+
+def collect() -> dict:
+    """Totais acumulados desde a última coleta ({fase: (segundos, chamadas, passos)}), zerando-os."""
+    with _lock:
+        data = {name: tuple(totals) for name, totals in _totals.items()}
+        _totals.clear()
+    return data
+
+def merge(data: dict | None) -> None:
+    """Soma os totais de `collect()` de outro processo aos deste."""
+    for name, (seconds, calls, steps) in (data or {}).items():
+        add(name, seconds, calls, steps)
+
+def breakdown(data: dict) -> dict:
+    """Totais de `collect()` na ordem de PHASES, com passos por segundo das fases que têm passos."""
+    result = {}
+    for name in sorted(data, key=lambda n: PHASES.index(n) if n in PHASES else len(PHASES)):
+        seconds, calls, steps = data[name]
+        entry = {"seconds": seconds, "calls": calls}
+        if steps:
+            entry["steps"] = steps
+            entry["steps_per_s"] = steps / max(seconds, 1e-9)
+        result[name] = entry
+    return result
@@ -0,0 +1,131 @@
+"""
+Séries de gerações em memória limitada, para gráficos ao vivo (dashboard e
+LivePlotter) que não ficam mais lentos com o tamanho do treinamento.
+
+Os pontos (geração, valores por canal) vão para vários níveis. O nível k guarda
+baldes de `factor ** k` pontos consecutivos, cada um com a primeira e a última
+geração e o mínimo e o máximo de cada canal, em um anel de `capacity` baldes (o
+nível 0 são os pontos crus). Os baldes em formação de cada nível também entram
+nas consultas, então o último ponto aparece sempre.
+
+`view(max_points)` escolhe o nível mais fino que ainda tem a janela pedida
+inteira e cabe em `max_points` baldes: desenhar custa O(pixels), não O(gerações).
+Como cada balde guarda o mínimo e o máximo, picos não somem na redução (o
+máximo de uma curva reduzida é o da curva inteira).
+"""
+import numpy as np
+
+class DownsampledSeries:
+    """
+    Uso:
+
+        series = DownsampledSeries(("best", "mean"))
+        series.append(gen, best, mean)
+        x, lo, hi = series.view(max_points=400)              # curva inteira
+        x, lo, hi = series.view(max_points=400, window=1000)  # últimas 1000 gerações
+        xs, ys = envelope(x, lo[:, 0], hi[:, 0])              # polilinha do canal "best"
+    """
+
+    def __init__(self, channels=("best", "mean"), capacity: int = 2048, factor: int = 4, levels: int = 10):
+        if capacity < 1 or factor < 2 or levels < 1:
+            raise ValueError(f"Parâmetros inválidos: capacity={capacity}, factor={factor}, levels={levels}")
+        self.channels = tuple(channels)
+        self.capacity = capacity
+        self.factor = factor
+        self.levels = levels
+        width = len(self.channels)
+        # Por nível: anel de baldes completos e quantos já foram completados
+        self._first = np.zeros((levels, capacity), dtype=np.int64)
+        self._last = np.zeros((levels, capacity), dtype=np.int64)
+        self._lo = np.zeros((levels, capacity, width))
+        self._hi = np.zeros((levels, capacity, width))
+        self._count = [0] * levels
+        # Balde em formação de cada nível (listas: o append é um laço Python curto)
+        self._size = [factor ** k for k in range(levels)]
+        self._acc_n = [0] * levels
+        self._acc_first = [0] * levels
+        self._acc_lo = [None] * levels
+        self._acc_hi = [None] * levels
+        self.total = 0
+        self.last = None  # (geração, valores) do último ponto
+
+    def __len__(self) -> int:
+        return self.total
+
+    def index(self, name: str) -> int:
+        return self.channels.index(name)
+
+    def append(self, generation: int, *values: float) -> None:
+        if len(values) != len(self.channels):
+            raise ValueError(f"Esperados {len(self.channels)} valores ({', '.join(self.channels)}), recebidos {len(values)}")
+        generation = int(generation)
+        values = [float(v) for v in values]
+        self.total += 1
+        self.last = (generation, tuple(values))
+        for k in range(self.levels):
+            n = self._acc_n[k]
+            if n == 0:
+                self._acc_first[k] = generation
+                self._acc_lo[k] = list(values)
+                self._acc_hi[k] = list(values)
+            else:
+                lo, hi = self._acc_lo[k], self._acc_hi[k]
+                for c, v in enumerate(values):
+                    if v < lo[c]:
+                        lo[c] = v
+                    elif v > hi[c]:
+                        hi[c] = v
+            n += 1
+            if n == self._size[k]:
+                pos = self._count[k] % self.capacity
+                self._first[k, pos] = self._acc_first[k]
+                self._last[k, pos] = generation
+                self._lo[k, pos] = self._acc_lo[k]
+                self._hi[k, pos] = self._acc_hi[k]
+                self._count[k] += 1
+                n = 0
+            self._acc_n[k] = n
+
+    def extend(self, points) -> None:
+        """`points`: iterável de (geração, valor, ...)."""
+        for point in points:
+            self.append(*point)
+
+    def _level_for(self, max_points: int, start: int) -> tuple[int, int]:
+        """(nível, primeiro balde) do nível mais fino com os pontos desde `start` em até `max_points` baldes."""
+        for k in range(self.levels):
+            first = start // self._size[k]
+            count = self._count[k]
+            stored = first >= count - self.capacity
+            buckets = count - first + (self._acc_n[k] > 0)
+            if stored and buckets <= max_points:
+                return k, first
+        # Nem o nível mais grosso cabe: os baldes mais recentes que cabem
+        k = self.levels - 1
+        return k, max(start // self._size[k], self._count[k] - self.capacity,
+                      self._count[k] + (self._acc_n[k] > 0) - max_points)
+
+    def view(self, max_points: int = 1000, window: int | None = None) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        (x, lo, hi) em ordem cronológica: x é o meio do intervalo de gerações de cada
+        balde, lo/hi (baldes, canais) o mínimo e o máximo de cada canal no balde.
+        `window` limita aos últimos `window` pontos.
+        """
+        width = len(self.channels)
+        if self.total == 0:
+            return np.zeros(0), np.zeros((0, width)), np.zeros((0, width))
+        start = 0 if window is None else max(0, self.total - window)
+        k, first = self._level_for(max(1, max_points), start)
+        positions = np.arange(first, self._count[k]) % self.capacity
+        x = (self._first[k, positions] + self._last[k, positions]) / 2
+        lo = self._lo[k, positions]
+        hi = self._hi[k, positions]
+        if self._acc_n[k]:
+            x = np.append(x, (self._acc_first[k] + self.last[0]) / 2)
+            lo = np.vstack((lo, self._acc_lo[k]))
+            hi = np.vstack((hi, self._acc_hi[k]))
+        return x, lo, hi
+
+def envelope(x: np.ndarray, lo: np.ndarray, hi: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Polilinha que passa pelo mínimo e pelo máximo de cada balde (um traço vertical por balde)."""
+    return np.repeat(x, 2), np.column_stack((lo, hi)).ravel()
@@ -1,8 +1,85 @@
+"""
+Snapshots do tabuleiro sem matplotlib.
+
+Cada estado de uma trajetória vira uma matriz de códigos (0: vazio, 1: corpo,
+2: cabeça, 3: maçã) copiada direto da ocupação do ambiente; a imagem sai de uma
+tabela de cores indexada pelos códigos, ampliada (cada célula vira um bloco de
+`cell` x `cell` pixels) e montada em um grid, e é gravada como PNG (ou APNG, para
+ver o episódio inteiro) por `snake_ai.utils.png`.
+
+O `SnapshotWriter` faz tudo isso em uma thread: o loop de treinamento só paga o
+enfileiramento.
+"""
+import math
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
-import matplotlib.pyplot as plt
-from ..env.snake_env import SnakeEnv
-from ..env.state_encoding import encode_state
+from ..env.trajectory import Trajectory, replay
 from ..agents.neural_net import NeuralNetwork
+from ..training.evaluation import record_episode
+from ..utils.png import write_png, write_apng
+
+# Cores por código: fundo preto, corpo verde, cabeça verde claro, maçã vermelha
+# e o branco das margens entre os quadros do grid
+PALETTE = np.array([
+    (0, 0, 0),
+    (0, 128, 0),
+    (0, 255, 0),
+    (255, 0, 0),
+    (255, 255, 255),
+], dtype=np.uint8)
+GAP = 4             # Código (e cor) da margem
+TILE_SIZE = 240     # Lado aproximado, em pixels, de cada quadro do grid
+GAP_PIXELS = 8
+
+def rasterize(trajectory: Trajectory, frames: int | None = None, stride: int = 1) -> np.ndarray:
+    """
+    Códigos (quadros, altura, largura) dos estados da trajetória até o fim do jogo
+    (o estado terminal não entra), um a cada `stride`, no máximo `frames` quadros.
+    """
+    states = []
+    for index, env in enumerate(replay(trajectory)):
+        if env.done or (frames is not None and len(states) >= frames):
+            break
+        if index % stride:
+            continue
+        codes = np.frombuffer(env.occupancy, dtype=np.uint8).reshape(env.height, env.width).copy()
+        hx, hy = env.snake[0]
+        codes[hy, hx] = 2
+        ax, ay = env.apple
+        codes[ay, ax] = 3
+        states.append(codes)
+    if not states:
+        width, height = trajectory.env_config["width"], trajectory.env_config["height"]
+        return np.zeros((0, height, width), dtype=np.uint8)
+    return np.stack(states)
+
+def _cell_size(codes: np.ndarray) -> int:
+    return max(1, TILE_SIZE // max(codes.shape[1:]))
+
+def colorize(codes: np.ndarray, cell: int) -> np.ndarray:
+    """
+    Imagens RGB (..., altura * cell, largura * cell, 3) dos códigos: a tabela de
+    cores é aplicada antes de ampliar (no tabuleiro pequeno) e cada célula vira um
+    bloco de `cell` x `cell` pixels.
+    """
+    return PALETTE[codes].repeat(cell, axis=-3).repeat(cell, axis=-2)
+
+def montage(codes: np.ndarray, cell: int | None = None) -> np.ndarray:
+    """Grid quadrado (RGB uint8) com os quadros em ordem, separados por margens brancas."""
+    count, height, width = codes.shape
+    cell = cell or _cell_size(codes)
+    side = math.ceil(math.sqrt(count))
+    rows = math.ceil(count / side)
+    tile_h, tile_w = height * cell, width * cell
+    canvas = np.empty((rows * (tile_h + GAP_PIXELS) + GAP_PIXELS, side * (tile_w + GAP_PIXELS) + GAP_PIXELS, 3),
+                      dtype=np.uint8)
+    canvas[:] = PALETTE[GAP]
+    tiles = colorize(codes, cell)
+    for i, tile in enumerate(tiles):
+        top = GAP_PIXELS + (i // side) * (tile_h + GAP_PIXELS)
+        left = GAP_PIXELS + (i % side) * (tile_w + GAP_PIXELS)
+        canvas[top:top + tile_h, left:left + tile_w] = tile
+    return canvas
 
 def save_generation_snapshot(
     genome: np.ndarray,
@@ -14,68 +91,71 @@ def save_generation_snapshot(
 ) -> None:
     """
     Roda um episódio curto e salva um grid de imagens do jogo.
+    Prefira `save_trajectory_snapshot` com a trajetória da avaliação.
     """
-    nn.set_weights_flat(genome)
-    env = SnakeEnv(**env_config)
-    
-    # Rodar episódio e capturar estados
-    states_to_plot = []
-    
-    steps = 0
-    done = False
-    
-    # Captura inicial
-    # Vamos capturar frames distribuídos ou os primeiros N?
-    # Vamos capturar os primeiros 'frames' passos
-    
-    while not done and steps < frames:
-        # Renderizar estado atual em matriz numérica
-        # 0: Vazio, 1: Corpo, 2: Cabeça, 3: Maçã
-        grid = np.zeros((env.height, env.width))
-        
-        # Corpo
-        for (x, y) in env.snake:
-            if 0 <= x < env.width and 0 <= y < env.height:
-                grid[y, x] = 1
-        
-        # Cabeça (sobrescreve corpo)
-        hx, hy = env.snake[0]
-        if 0 <= hx < env.width and 0 <= hy < env.height:
-            grid[hy, hx] = 2
-            
-        # Maçã
-        ax, ay = env.apple
-        grid[ay, ax] = 3
-        
-        states_to_plot.append(grid.copy())
-        
-        # Step
-        state_vec = encode_state(env)
-        output = nn.forward(state_vec)
-        action = np.argmax(output)
-        _, _, done, _ = env.step(action)
-        steps += 1
-        
-    # Plotar
-    # Definir tamanho do grid (ex: 4x4 para 16 frames)
-    side = int(np.ceil(np.sqrt(len(states_to_plot))))
-    if side == 0: return
-
-    fig, axes = plt.subplots(side, side, figsize=(10, 10))
-    
-    # Cores: 0=Preto (Fundo), 1=VerdeEscuro (Corpo), 2=VerdeClaro (Cabeça), 3=Vermelho (Maçã)
-    # Custom cmap
-    from matplotlib.colors import ListedColormap
-    cmap = ListedColormap(['black', 'green', '#00FF00', 'red'])
-    
-    for i, ax in enumerate(axes.flat):
-        if i < len(states_to_plot):
-            ax.imshow(states_to_plot[i], cmap=cmap, vmin=0, vmax=3)
-            ax.axis('off')
-        else:
-            ax.axis('off')
-            
-    plt.tight_layout()
-    plt.savefig(output_path)
-    plt.close()
+    trajectory = record_episode(genome, nn, env_config, max_steps=frames)
+    save_trajectory_snapshot(trajectory, output_path, frames)
+
+def save_trajectory_snapshot(trajectory: Trajectory, output_path: str, frames: int = 16,
+                             cell: int | None = None) -> None:
+    """
+    Salva um grid de imagens com os primeiros `frames` estados de uma trajetória
+    gravada (reproduzida sem a rede).
+    """
+    codes = rasterize(trajectory, frames)
+    if len(codes) == 0:
+        return
+    write_png(output_path, montage(codes, cell))
+
+def save_trajectory_animation(trajectory: Trajectory, output_path: str, fps: float = 15,
+                              max_frames: int = 600, cell: int | None = None) -> None:
+    """
+    Salva o episódio inteiro como PNG animado. Episódios longos são amostrados
+    (um estado a cada `ceil(duração / max_frames)`) para caber em `max_frames` quadros.
+    """
+    stride = max(1, math.ceil(len(trajectory) / max_frames))
+    codes = rasterize(trajectory, stride=stride)
+    if len(codes) == 0:
+        return
+    write_apng(output_path, colorize(codes, cell or _cell_size(codes)), fps=fps)
+
+class SnapshotWriter:
+    """
+    Grava snapshots em uma thread. As trajetórias não mudam depois de gravadas,
+    então a thread pode reproduzi-las enquanto o treinamento continua. Erros da
+    escrita aparecem no próximo `submit` ou no `close`.
+    """
+
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(1, thread_name_prefix="snapshots")
+        self._pending = []
+
+    def _check(self) -> None:
+        pending = []
+        for future in self._pending:
+            if future.done():
+                future.result()
+            else:
+                pending.append(future)
+        self._pending = pending
+
+    def submit(self, trajectory: Trajectory, output_path: str, frames: int = 16):
+        self._check()
+        future = self._executor.submit(save_trajectory_snapshot, trajectory, output_path, frames)
+        self._pending.append(future)
+        return future
+
+    def submit_animation(self, trajectory: Trajectory, output_path: str, fps: float = 15, max_frames: int = 600):
+        self._check()
+        future = self._executor.submit(save_trajectory_animation, trajectory, output_path, fps, max_frames)
+        self._pending.append(future)
+        return future
 
+    def close(self) -> None:
+        """Espera os snapshots pendentes (e propaga erros deles)."""
+        try:
+            for future in self._pending:
+                future.result()
+        finally:
+            self._pending = []
+            self._executor.shutdown()
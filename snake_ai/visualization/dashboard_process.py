@@ -0,0 +1,202 @@
+"""
+Dashboard de treinamento em um processo separado.
+
+O laço de treinamento só chama `DashboardProcess.submit(...)`, que coloca o
+resumo da geração (pontos do gráfico e as trajetórias dos melhores genomas,
+gravadas pela própria avaliação, ver `Trainer.trajectories`) em uma fila
+limitada sem esperar: se a fila estiver cheia, as trajetórias daquela geração
+são descartadas e os pontos do gráfico seguem na próxima mensagem que couber.
+Nenhum episódio é jogado para o dashboard, então o treinamento só paga o
+`put_nowait`, com o dashboard aberto ou não. O processo do dashboard esvazia a fila a cada quadro, atualiza o gráfico na hora e, ao terminar
+de mostrar uma geração, passa direto para a mais recente; gerações intermediárias
+não são mostradas. Assim a velocidade do treinamento não depende do dashboard
+(nem da velocidade escolhida para os jogos).
+
+Este módulo não importa o pygame: só o processo filho o carrega. O dashboard
+pode ser aberto (`attach`) e fechado (`detach`) a qualquer momento; fechar a
+janela só desliga o dashboard, o treinamento continua.
+"""
+import copy
+import multiprocessing as mp
+import os
+import queue
+import numpy as np
+from ..utils.series import DownsampledSeries
+
+def _run_dashboard(messages, stop, env_config: dict, layer_sizes: list[int], caption: str, num_games: int, speed: int):
+    """Laço do processo do dashboard: mostra sempre a geração mais recente recebida."""
+    try:
+        # Prioridade baixa: o dashboard nunca disputa CPU com o treinamento
+        os.nice(10)
+    except (AttributeError, OSError):
+        pass
+    from .dashboard import DashboardRenderer
+    from ..agents.neural_net import NeuralNetwork
+
+    renderer = DashboardRenderer(env_config, layer_sizes, caption=caption, num_games=num_games)
+    nn = None
+    latest = {"games": None}
+
+    def receive(message) -> None:
+        if message is None:
+            stop.set()
+            return
+        if message["history"] is not None:
+            renderer.set_graph_history(message["history"])
+        for generation, best, mean in message["points"]:
+            renderer.update_graph_data(generation, best, mean)
+        if message["trajectories"] is not None:
+            latest["games"] = message["trajectories"], message["genome"]
+
+    def drain() -> bool:
+        """Consome tudo o que está na fila; retorna True se é hora de parar."""
+        while True:
+            try:
+                receive(messages.get_nowait())
+            except queue.Empty:
+                return stop.is_set()
+
+    try:
+        while not stop.is_set():
+            if drain():
+                break
+            games, latest["games"] = latest["games"], None
+            if games is None:
+                if renderer.idle():
+                    break
+                try:
+                    receive(messages.get(timeout=0.1))
+                except queue.Empty:
+                    pass
+                continue
+            trajectories, genome = games
+            if genome is not None:
+                # No tipo do treinamento, para as ativações serem as da avaliação
+                if nn is None or nn.dtype != genome.dtype:
+                    nn = NeuralNetwork(layer_sizes, genome.dtype.name)
+                nn.set_weights_flat(genome)
+            if renderer.render_trajectories(trajectories, nn if genome is not None else None, speed=speed, on_frame=drain):
+                break
+    finally:
+        renderer.close()
+
+class DashboardProcess:
+    """
+    Dashboard ao vivo fora do laço de treinamento. Uso:
+
+        dashboard = DashboardProcess(env_config, layer_sizes, num_games=9, speed=30)
+        dashboard.attach()                      # abre a janela (processo novo)
+        dashboard.submit(gen, best, mean,       # a cada geração, nunca bloqueia
+                         trainer.trajectories(top, replay=False), population[top[0]])
+        dashboard.detach()                      # fecha (pode reabrir depois)
+
+    A curva de todas as gerações fica guardada aqui (reduzida, em memória
+    limitada), então um dashboard aberto no meio do treinamento recebe a curva
+    completa; depois disso cada mensagem leva só os pontos novos.
+    """
+
+    def __init__(self, env_config: dict, layer_sizes: list[int], caption: str = "Snake AI Training Dashboard",
+                 num_games: int = 9, speed: int = 30, queue_size: int = 2):
+        self.env_config = env_config
+        self.layer_sizes = layer_sizes
+        self.caption = caption
+        self.num_games = num_games
+        self.speed = speed
+        self.queue_size = queue_size
+        self.history = DownsampledSeries(("best", "mean"))  # Curva de todas as gerações
+        self.dropped = 0  # Gerações cujas trajetórias não couberam na fila
+        self._unsent = []  # (geração, melhor, média) ainda não entregues ao processo atual
+        self._resync = True  # A próxima mensagem leva a curva inteira
+        self._process = None
+        self._queue = None
+        self._stop = None
+
+    @property
+    def attached(self) -> bool:
+        return self._process is not None and self._process.is_alive()
+
+    def attach(self) -> None:
+        """Abre o dashboard (se ainda não estiver aberto)."""
+        if self.attached:
+            return
+        self._cleanup()
+        # spawn: o filho não herda pools, threads nem memória compartilhada do treinamento
+        ctx = mp.get_context("spawn")
+        self._queue = ctx.Queue(self.queue_size)
+        self._stop = ctx.Event()
+        self._process = ctx.Process(
+            target=_run_dashboard, daemon=True,
+            args=(self._queue, self._stop, self.env_config, self.layer_sizes, self.caption, self.num_games, self.speed)
+        )
+        self._process.start()
+        self._unsent = []
+        self._resync = True
+
+    def detach(self, timeout: float = 2.0) -> None:
+        """Fecha o dashboard; o treinamento não é afetado."""
+        if self._process is None:
+            return
+        self._stop.set()
+        self._process.join(timeout)
+        if self._process.is_alive():
+            self._process.terminate()
+            self._process.join()
+        self._cleanup()
+
+    def toggle(self) -> None:
+        if self.attached:
+            self.detach()
+        else:
+            self.attach()
+
+    def closed_by_user(self) -> bool:
+        """True (uma vez) se a janela foi fechada pelo usuário desde a última chamada."""
+        if self._process is None or self._process.is_alive():
+            return False
+        self._cleanup()
+        return True
+
+    def submit(self, generation: int, best_fitness: float, mean_fitness: float,
+               trajectories: list | None = None, genome=None) -> bool:
+        """
+        Envia a geração ao dashboard sem bloquear: os pontos do gráfico e, se houver,
+        as trajetórias para reproduzir (`genome`, o do primeiro jogo, alimenta o
+        painel da rede; entradas None são puladas). Retorna False se o dashboard está fechado ou ficou para trás
+        (fila cheia); nesse caso as trajetórias são descartadas e os pontos do
+        gráfico vão com a próxima mensagem enviada.
+        """
+        point = (int(generation), float(best_fitness), float(mean_fitness))
+        self.history.append(*point)
+        if not self.attached:
+            return False
+        if not self._resync:
+            self._unsent.append(point)
+            # Muito tempo sem entregar: mais barato mandar a curva reduzida de novo
+            if len(self._unsent) > self.history.capacity:
+                self._unsent = []
+                self._resync = True
+        if trajectories is not None:
+            trajectories = [t for t in trajectories if t is not None][:self.num_games] or None
+            genome = np.array(genome) if genome is not None else None
+        # A fila serializa em outra thread: vai uma cópia da curva, que continua mudando aqui
+        history = copy.deepcopy(self.history) if self._resync else None
+        message = {"history": history, "points": self._unsent, "trajectories": trajectories, "genome": genome}
+        try:
+            self._queue.put_nowait(message)
+        except queue.Full:
+            if trajectories is not None:
+                self.dropped += 1
+            return False
+        self._unsent = []
+        self._resync = False
+        return True
+
+    def _cleanup(self) -> None:
+        if self._queue is not None:
+            # Não esperar a entrega do que ficou no buffer se o filho já saiu
+            self._queue.cancel_join_thread()
+            self._queue.close()
+        self._process = self._queue = self._stop = None
+
+    def close(self) -> None:
+        self.detach()
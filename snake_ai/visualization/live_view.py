@@ -1,9 +1,12 @@
 import pygame
 import numpy as np
-import time
 from ..env.snake_env import SnakeEnv
-from ..env.state_encoding import encode_state
+from ..env.trajectory import Trajectory, replay
 from ..agents.neural_net import NeuralNetwork
+from ..training.evaluation import record_episode
+
+# Limite de passos de um episódio assistido (a energia já encerra quem só anda em círculos)
+PLAY_MAX_STEPS = 1_000_000
 
 class PygameRenderer:
     """
@@ -27,28 +30,23 @@ class PygameRenderer:
         
     def render_episode(self, genome: np.ndarray, nn: NeuralNetwork, speed: int = 20) -> None:
         """
-        Roda e renderiza um episódio completo com o genoma fornecido.
+        Roda e renderiza um episódio completo com o genoma fornecido
+        (gravado primeiro, depois reproduzido).
         """
-        # Configurar rede e ambiente
-        nn.set_weights_flat(genome)
-        env = SnakeEnv(**self.env_config)
-        
-        done = False
-        
-        while not done:
+        trajectory = record_episode(genome, nn, self.env_config, max_steps=PLAY_MAX_STEPS)
+        self.render_trajectory(trajectory, speed)
+
+    def render_trajectory(self, trajectory: Trajectory, speed: int = 20) -> None:
+        """
+        Reproduz uma trajetória gravada (sem rodar a rede).
+        """
+        for env in replay(trajectory):
             # Processar eventos (permite fechar a janela ou mover)
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     pygame.quit()
                     return
 
-            # IA decide ação
-            state_vec = encode_state(env)
-            output = nn.forward(state_vec)
-            action = np.argmax(output)
-            
-            _, _, done, info = env.step(action)
-            
             # Desenhar
             self._draw_frame(env)
             
@@ -102,3 +100,9 @@ def play_episode(genome: np.ndarray, env_config: dict, nn: NeuralNetwork, speed:
     # mas o PygameRenderer não tem loop infinito.
     # Se play_best espera loop único, ok.
     renderer.close()
+
+def play_trajectory(trajectory: Trajectory, speed: int = 10):
+    """Reproduz uma trajetória gravada (ex.: models/best_overall.traj.npz)."""
+    renderer = PygameRenderer(trajectory.env_config, caption="Snake AI - Replay")
+    renderer.render_trajectory(trajectory, speed)
+    renderer.close()
@@ -1,17 +1,24 @@
 import matplotlib.pyplot as plt
-import pandas as pd
 import numpy as np
+from ..utils.history import HistoryStore
+from ..utils.series import DownsampledSeries, envelope
 
-def plot_training_curves(csv_path: str, output_path: str) -> None:
+def plot_training_curves(history_path: str, output_path: str) -> None:
     """
-    Gera gráfico de evolução do fitness a partir do log CSV (Estático).
+    Gera gráfico de evolução do fitness a partir do histórico do treinamento (Estático).
+    Lê só as colunas usadas: melhor/média por geração e a faixa 25-75% do fitness
+    dos indivíduos.
     """
     try:
-        df = pd.read_csv(csv_path)
+        history = HistoryStore(history_path)
+        generations = history.column("generations", "generation")
         
         plt.figure(figsize=(10, 6))
-        plt.plot(df['generation'], df['best_fitness'], label='Best Fitness')
-        plt.plot(df['generation'], df['mean_fitness'], label='Mean Fitness')
+        band_gens, band = history.percentiles("individuals", "fitness", [25, 75])
+        if len(band_gens):
+            plt.fill_between(band_gens, band[:, 0], band[:, 1], alpha=0.2, label='Fitness 25-75%')
+        plt.plot(generations, history.column("generations", "best_fitness"), label='Best Fitness')
+        plt.plot(generations, history.column("generations", "mean_fitness"), label='Mean Fitness')
         
         plt.xlabel('Generation')
         plt.ylabel('Fitness')
@@ -27,8 +34,10 @@ def plot_training_curves(csv_path: str, output_path: str) -> None:
 class LivePlotter:
     """
     Gerencia um gráfico Matplotlib atualizado em tempo real.
+    A curva fica em um `DownsampledSeries`: cada atualização desenha no máximo
+    `max_points` baldes (mínimo e máximo de cada um), seja qual for o número de gerações.
     """
-    def __init__(self):
+    def __init__(self, max_points: int = 1000):
         plt.ion() # Interactive mode
         self.fig, self.ax = plt.subplots(figsize=(8, 5))
         self.ax.set_title("Training Progress (Live)")
@@ -40,17 +49,15 @@ class LivePlotter:
         self.line_mean, = self.ax.plot([], [], 'b-', label="Mean Fitness")
         self.ax.legend()
         
-        self.generations = []
-        self.best_fits = []
-        self.mean_fits = []
+        self.max_points = max_points
+        self.history = DownsampledSeries(("best", "mean"))
         
     def update(self, generation: int, best_fit: float, mean_fit: float):
-        self.generations.append(generation)
-        self.best_fits.append(best_fit)
-        self.mean_fits.append(mean_fit)
+        self.history.append(generation, best_fit, mean_fit)
         
-        self.line_best.set_data(self.generations, self.best_fits)
-        self.line_mean.set_data(self.generations, self.mean_fits)
+        x, lo, hi = self.history.view(self.max_points)
+        self.line_best.set_data(*envelope(x, lo[:, 0], hi[:, 0]))
+        self.line_mean.set_data(*envelope(x, lo[:, 1], hi[:, 1]))
         
         self.ax.relim()
         self.ax.autoscale_view()
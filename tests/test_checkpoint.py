@@ -0,0 +1,61 @@
+"""
+Retomada exata do Trainer: um treinamento que morre no meio e é retomado do
+último checkpoint periódico termina com o mesmo fitness por geração, a mesma
+população final e o mesmo histórico que um treinamento sem interrupção.
+
+Uso: python -m pytest tests/test_checkpoint.py (custo do checkpoint: python -m benchmarks.bench_checkpoint)
+"""
+import numpy as np
+import pytest
+
+from snake_ai.training.trainer import Trainer
+from snake_ai.utils.history import HistoryStore
+
+GENERATIONS, INTERVAL, CRASH_AT = 8, 3, 4
+# O checkpoint sai ao fim da avaliação das gerações 2, 5, ...; a retomada refaz a evolução da 2
+RESUME_AT = 3
+
+class Crash(Exception):
+    pass
+
+def read_history(path: str) -> dict:
+    store = HistoryStore(path)
+    return {(table, name): np.array(store.column(table, name))
+            for table, columns in store.schema.items() for name in columns}
+
+@pytest.mark.parametrize("racing", [False, True], ids=["uniform", "racing"])
+def test_resume_matches_uninterrupted_run(tmp_path, racing):
+    def config(name: str) -> dict:
+        return {"width": 8, "height": 8, "population_size": 30, "generations": GENERATIONS, "seed": 0,
+                "racing": racing, "executor_mode": "serial", "checkpoint_interval": INTERVAL, "run_name": "run",
+                "genome_archive": False, "models_dir": str(tmp_path / name), "logs_dir": str(tmp_path / name)}
+
+    reference = {}
+    with Trainer(config("a")) as trainer:
+        trainer.run(lambda record, population, fitness: reference.__setitem__(record["generation"], fitness.copy()))
+        final_a = np.stack(trainer.ga.get_population())
+        history_a = read_history(trainer.history_path)
+
+    def crash(record, population, fitness):
+        if record["generation"] == CRASH_AT:
+            raise Crash()
+
+    with Trainer(config("b")) as trainer:
+        with pytest.raises(Crash):
+            trainer.run(crash)
+        checkpoint_path = trainer.checkpoint_path
+
+    resumed = {}
+    with Trainer.resume(checkpoint_path) as trainer:
+        assert trainer.generation == RESUME_AT
+        trainer.run(lambda record, population, fitness: resumed.__setitem__(record["generation"], fitness.copy()))
+        final_b = np.stack(trainer.ga.get_population())
+        history_b = read_history(trainer.history_path)
+
+    assert sorted(resumed) == list(range(RESUME_AT, GENERATIONS))
+    for gen, fitness in resumed.items():
+        np.testing.assert_array_equal(fitness, reference[gen], err_msg=f"fitness da geração {gen}")
+    np.testing.assert_array_equal(final_b, final_a)
+    assert history_b.keys() == history_a.keys()
+    for key in history_a:
+        np.testing.assert_array_equal(history_b[key], history_a[key], err_msg=f"histórico {key}")
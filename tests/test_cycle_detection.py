@@ -0,0 +1,38 @@
+"""
+A detecção de ciclos (ligada por padrão) só encurta a simulação: com e sem ela,
+cada backend da avaliação devolve o mesmo fitness, score, duração dos episódios
+e motivo de término, e os passos poupados somam os que deixaram de ser jogados.
+
+Uso: python -m pytest tests/test_cycle_detection.py (tempos: python -m benchmarks.bench_cycles)
+"""
+import numpy as np
+import pytest
+
+from snake_ai.agents.neural_net import NeuralNetwork
+from snake_ai.training.evaluation import evaluate_population, EVAL_BACKENDS
+
+LAYER_SIZES = [8, 16, 12, 3]
+
+@pytest.mark.parametrize("backend", EVAL_BACKENDS)
+@pytest.mark.parametrize("grow_on_eat", [True, False], ids=["grow", "no_grow"])
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_cycle_exit_keeps_results(backend, grow_on_eat, seed):
+    # Energia sobrando e max_steps curto: ciclos longos e episódios cortados por max_steps
+    env_config = {"width": 8, "height": 8, "initial_energy": 8 * 8 * 3, "grow_on_eat": grow_on_eat}
+    nn = NeuralNetwork(LAYER_SIZES)
+    rng = np.random.default_rng(seed)
+    population = rng.normal(0, 1, size=(60, len(nn.get_weights_flat())))
+    seeds = rng.integers(2**31 - 1, size=3).tolist()
+
+    fitness, stats = evaluate_population(population, nn, env_config, 3, backend=backend, seeds=seeds,
+                                         max_steps=150, detect_cycles=True)
+    plain, plain_stats = evaluate_population(population, nn, env_config, 3, backend=backend, seeds=seeds,
+                                             max_steps=150, detect_cycles=False)
+
+    np.testing.assert_array_equal(fitness, plain)
+    for name in ("score", "episode_steps", "reason"):
+        np.testing.assert_array_equal(stats[name], plain_stats[name], err_msg=name)
+    np.testing.assert_array_equal(stats["steps"] + stats["steps_saved"], plain_stats["steps"])
+    assert plain_stats["steps_saved"].sum() == 0
+    # Sem ciclos cortados o teste não estaria testando nada
+    assert stats["steps_saved"].sum() > 0
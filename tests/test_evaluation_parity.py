@@ -0,0 +1,39 @@
+"""
+Paridade da avaliação: cada backend (serial, lockstep, vectorized) em cada modo
+do EvaluationExecutor (serial, threads e processos com a população em memória
+compartilhada) dá o mesmo fitness e as mesmas estatísticas por genoma que o
+backend serial de referência, com as mesmas seeds.
+
+Uso: python -m pytest tests/test_evaluation_parity.py (tempos: python -m benchmarks.bench_evaluation)
+"""
+import numpy as np
+import pytest
+
+from snake_ai.agents.neural_net import NeuralNetwork
+from snake_ai.training.evaluation import evaluate_population, EVAL_BACKENDS
+from snake_ai.training.executor import EvaluationExecutor, EXECUTOR_MODES
+
+LAYER_SIZES = [8, 16, 12, 3]
+ENV_CONFIG = {"width": 8, "height": 8, "initial_energy": 64, "grow_on_eat": True}
+SEEDS = [11, 12, 13]
+
+@pytest.fixture(scope="module")
+def reference():
+    nn = NeuralNetwork(LAYER_SIZES)
+    population = np.random.default_rng(0).normal(0, 1, size=(40, len(nn.get_weights_flat())))
+    fitness, stats = evaluate_population(population, nn, ENV_CONFIG, len(SEEDS), backend="serial", seeds=SEEDS)
+    return population, fitness, stats
+
+@pytest.mark.parametrize("mode", EXECUTOR_MODES)
+@pytest.mark.parametrize("backend", EVAL_BACKENDS)
+def test_backend_and_mode_match_reference(reference, backend, mode):
+    population, expected, expected_stats = reference
+    with EvaluationExecutor(ENV_CONFIG, LAYER_SIZES, len(population), len(SEEDS), mode=mode,
+                            num_workers=2, backend=backend) as executor:
+        fitness, stats = executor.evaluate(population, seeds=SEEDS)
+    np.testing.assert_array_equal(fitness, expected)
+    for name in ("score", "episode_steps", "reason"):
+        np.testing.assert_array_equal(stats[name], expected_stats[name], err_msg=name)
+    # O vetorizado comprova os ciclos um pouco depois: divide os passos de outro jeito, com o mesmo total
+    np.testing.assert_array_equal(stats["steps"] + stats["steps_saved"],
+                                  expected_stats["steps"] + expected_stats["steps_saved"])
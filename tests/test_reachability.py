@@ -0,0 +1,62 @@
+"""
+O estado incremental de alcançabilidade (`SnakeEnv(track_reachability=True)`)
+contra a BFS completa a partir da cauda: em episódios jogados por uma política
+gulosa com ruído (cobras longas, que fecham e abrem bolsões), a cada passo as
+distâncias até a cauda são as de `get_tail_distances` e o `encode_state` é o
+mesmo com e sem o estado incremental.
+
+Uso: python -m pytest tests/test_reachability.py (tempos: python -m benchmarks.bench_reachability)
+"""
+import random
+
+import numpy as np
+import pytest
+
+from snake_ai.env.snake_env import SnakeEnv
+from snake_ai.env.state_encoding import encode_state, get_tail_distances
+
+MOVES = [(0, -1), (1, 0), (0, 1), (-1, 0)]
+
+def choose_action(env: SnakeEnv, state: np.ndarray, rng: random.Random) -> int:
+    """Vai na direção da maçã preferindo ações com caminho até a cauda, às vezes ao acaso."""
+    if rng.random() < 0.05:
+        return rng.randrange(3)
+    hx, hy = env.snake[0]
+    ax, ay = env.apple
+    best, best_key = 1, None
+    for j, action in enumerate((1, 2, 0)):
+        dx, dy = MOVES[(env.direction.value + (action == 2) - (action == 0)) % 4]
+        key = (state[5 + j] == 0.0, abs(hx + dx - ax) + abs(hy + dy - ay) + rng.random() * 2)
+        if best_key is None or key < best_key:
+            best, best_key = action, key
+    return best
+
+@pytest.mark.parametrize("width, height", [(5, 5), (8, 6), (12, 12)])
+@pytest.mark.parametrize("grow_on_eat", [True, False], ids=["grow", "no_grow"])
+@pytest.mark.parametrize("seed", [0, 1])
+def test_incremental_matches_bfs(width, height, grow_on_eat, seed):
+    rng = random.Random(seed)
+    config = {"width": width, "height": height, "grow_on_eat": grow_on_eat}
+    tracked = SnakeEnv(**config, seed=seed, track_reachability=True)
+    plain = SnakeEnv(**config, seed=seed)
+    cells = [(x, y) for y in range(-1, height + 1) for x in range(-1, width + 1)]
+    max_len = 0
+    for t in range(1500):
+        # Vizinhos da cabeça (os pontos do encode) e mais algumas células, dentro e fora do tabuleiro
+        hx, hy = tracked.snake[0]
+        starts = [(hx + dx, hy + dy) for dx, dy in MOVES] + rng.sample(cells, 6)
+        expected = get_tail_distances(starts, tracked.snake[-1], tracked.occupancy, width, height)
+        assert tracked.reachability.tail_distances(starts) == expected, f"distâncias (passo {t})"
+        state = encode_state(tracked)
+        np.testing.assert_array_equal(state, encode_state(plain), err_msg=f"encode (passo {t})")
+
+        action = choose_action(tracked, state, rng)
+        _, _, done, _ = tracked.step(action)
+        _, _, plain_done, _ = plain.step(action)
+        assert done == plain_done
+        max_len = max(max_len, len(tracked.snake))
+        if done:
+            tracked.reset()
+            plain.reset()
+    # A política tem que produzir cobras longas o bastante para haver bolsões
+    assert max_len >= min(width * height // 4, 20) or not grow_on_eat
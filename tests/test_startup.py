@@ -0,0 +1,91 @@
+"""
+Imports dos pontos de entrada e dos workers da avaliação.
+
+Cada ponto de entrada é importado em um interpretador novo sem carregar
+bibliotecas pesadas ou gráficas (pygame, matplotlib, pandas, tkinter, tqdm,
+numba). Um EvaluationExecutor em modo de
+processos, também em um interpretador novo, avalia uma população e lista os
+módulos do snake_ai que o worker carregou: só o ambiente, o encode, a rede e a
+avaliação (mais o próprio executor, de onde vem a função do worker). Recursos
+opcionais (detecção de ciclos, cache, profiler, gravação) carregam os seus
+módulos só quando ligados.
+
+Só o que é determinístico é verificado aqui; o tempo dos imports depende da
+máquina e o orçamento fica em benchmarks/bench_startup.py.
+
+Uso: python -m pytest tests/test_startup.py (tempos: python -m benchmarks.bench_startup)
+"""
+import json
+import os
+import subprocess
+import sys
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENTRY_POINTS = [
+    "main_train",
+    "play_best",
+    "snake_ai.train",
+    "snake_ai.training.trainer",
+    "snake_ai.training.executor",
+]
+
+FORBIDDEN = ("pygame", "matplotlib", "pandas", "tkinter", "tqdm", "numba")
+
+# Módulos do snake_ai que um worker do backend serial carrega
+WORKER_MODULES = {
+    "snake_ai", "snake_ai.env", "snake_ai.env.snake_env", "snake_ai.env.state_encoding",
+    "snake_ai.agents", "snake_ai.agents.neural_net",
+    "snake_ai.training", "snake_ai.training.evaluation", "snake_ai.training.executor",
+}
+
+_IMPORT_PROBE = """
+import json, sys
+import {module}
+print(json.dumps(sorted(sys.modules)))
+"""
+
+_WORKER_PROBE = """
+import json, sys
+import numpy as np
+from snake_ai.agents.neural_net import NeuralNetwork
+from snake_ai.training.executor import EvaluationExecutor
+
+def loaded_modules():
+    return sorted(sys.modules)
+
+if __name__ == "__main__":
+    layer_sizes = [8, 16, 12, 3]
+    genome_size = len(NeuralNetwork(layer_sizes).get_weights_flat())
+    population = np.zeros((4, genome_size))
+    env_config = {{"width": 6, "height": 6, "initial_energy": 36, "grow_on_eat": True}}
+    with EvaluationExecutor(env_config, layer_sizes, len(population), num_episodes=1, mode="process",
+                            num_workers=1, backend="serial", detect_cycles={detect_cycles}) as executor:
+        executor.evaluate(population, seeds=[0])
+        print(json.dumps(executor._pool.apply(loaded_modules)))
+"""
+
+def run_python(args: list[str]) -> str:
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    return subprocess.run([sys.executable, *args], capture_output=True, text=True, check=True,
+                          cwd=ROOT, env=env).stdout.strip().splitlines()[-1]
+
+def heavy_modules(modules: list[str]) -> list[str]:
+    return sorted({m.split(".")[0] for m in modules if m.split(".")[0] in FORBIDDEN})
+
+@pytest.mark.parametrize("module", ENTRY_POINTS)
+def test_entry_point_import_is_light(module):
+    modules = json.loads(run_python(["-c", _IMPORT_PROBE.format(module=module)]))
+    assert heavy_modules(modules) == []
+
+@pytest.mark.parametrize("detect_cycles, extra", [
+    (False, set()),
+    (True, {"snake_ai.training.cycle_detection"}),
+], ids=["plain", "detect_cycles"])
+def test_worker_imports_only_evaluation_modules(tmp_path, detect_cycles, extra):
+    probe = tmp_path / "worker_probe.py"
+    probe.write_text(_WORKER_PROBE.format(detect_cycles=detect_cycles))
+    modules = json.loads(run_python([str(probe)]))
+    assert {m for m in modules if m.startswith("snake_ai")} == WORKER_MODULES | extra
+    assert heavy_modules(modules) == []
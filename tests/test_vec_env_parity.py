@@ -0,0 +1,61 @@
+"""
+Paridade do VecSnakeEnv (caminhos NumPy e Numba) com o `SnakeEnv` e o
+`encode_state` de referência: jogos com as mesmas seeds e as mesmas ações
+aleatórias produzem, passo a passo, os mesmos vetores de estado, corpos, maçãs,
+recompensas, términos, scores, passos, motivos e energia.
+
+Uso: python -m pytest tests/test_vec_env_parity.py
+"""
+import numpy as np
+import pytest
+
+from snake_ai.env.snake_env import SnakeEnv
+from snake_ai.env.state_encoding import encode_state
+from snake_ai.env.vec_env import VecSnakeEnv, HAS_NUMBA, REASON_CODES
+
+USE_JIT = [
+    pytest.param(False, id="numpy"),
+    pytest.param(True, id="numba", marks=pytest.mark.skipif(not HAS_NUMBA, reason="Numba não instalado")),
+]
+
+@pytest.mark.parametrize("use_jit", USE_JIT)
+@pytest.mark.parametrize("grow_on_eat", [True, False], ids=["grow", "no_grow"])
+@pytest.mark.parametrize("seed", [0, 1])
+def test_step_and_encode_match_reference(use_jit, grow_on_eat, seed):
+    """VecSnakeEnv com auto-reset contra N SnakeEnv de referência, passo a passo."""
+    num_envs, num_steps, width, height = 64, 400, 8, 8
+    rng = np.random.default_rng(seed)
+    seeds = [seed * 1000 + i for i in range(num_envs)]
+    config = {"width": width, "height": height, "initial_energy": width * height // 2, "grow_on_eat": grow_on_eat}
+
+    refs = [SnakeEnv(**config, seed=s) for s in seeds]
+    venv = VecSnakeEnv(num_envs, **config, auto_reset=True, seeds=seeds, use_jit=use_jit)
+
+    for t in range(num_steps):
+        states = venv.encode()
+        for i, env in enumerate(refs):
+            np.testing.assert_array_equal(states[i], encode_state(env), err_msg=f"encode (jogo {i}, passo {t})")
+            assert venv.snake(i) == list(env.snake), f"corpo (jogo {i}, passo {t})"
+            assert (venv.apple_x[i], venv.apple_y[i]) == env.apple, f"maçã (jogo {i}, passo {t})"
+
+        actions = rng.integers(0, 3, num_envs)
+        rewards, dones, info = venv.step(actions)
+        for i, env in enumerate(refs):
+            _, reward, done, ref_info = env.step(int(actions[i]))
+            assert (rewards[i], dones[i]) == (reward, done), f"recompensa/término (jogo {i}, passo {t})"
+            assert (info["score"][i], info["steps"][i]) == (env.score, env.steps), f"score/passos (jogo {i}, passo {t})"
+            assert info["reason"][i] == REASON_CODES[ref_info.get("reason")], f"motivo (jogo {i}, passo {t})"
+            assert done or venv.energy[i] == env.energy, f"energia (jogo {i}, passo {t})"
+            if done:
+                env.reset()
+
+@pytest.mark.parametrize("use_jit", USE_JIT)
+@pytest.mark.parametrize("grow_on_eat", [True, False], ids=["grow", "no_grow"])
+def test_full_board_is_a_win(use_jit, grow_on_eat):
+    """Tabuleiro 4x1: a cobra inicial come a única maçã possível e enche o tabuleiro."""
+    ref = SnakeEnv(4, 1, grow_on_eat=grow_on_eat, seed=0)
+    venv = VecSnakeEnv(1, 4, 1, grow_on_eat=grow_on_eat, auto_reset=False, seeds=[0], use_jit=use_jit)
+    _, reward, done, info = ref.step(1)
+    rewards, dones, vinfo = venv.step(np.array([1]))
+    assert done and info["reason"] == "win"
+    assert rewards[0] == reward and dones[0] and vinfo["reason"][0] == REASON_CODES["win"]